@@ -0,0 +1,220 @@
+import asyncio
+import itertools
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+# -- Adaptive concurrency, AIMD as in TCP congestion control: https://www.rfc-editor.org/rfc/rfc5681
+# The site tells us when we are going too fast: HTTP 429, 5xx "unavailable" answers, timeouts,
+# or a CAPTCHA / "too many requests" interstitial instead of the listing. AimdController turns
+# those signals into a concurrency limit:
+#   slow start          the limit grows by one per success (doubling per round) up to ssthresh
+#   additive increase   past ssthresh it grows by about one per round of `limit` successes
+#   multiplicative cut  a slow-down signal halves it, once per `cooldown`, however many
+#                       in-flight requests report the same trouble
+# A Retry-After header pauses every worker for that long.
+#
+# call_with_retries runs one request and retries slow-down failures after a full-jitter
+# exponential backoff (https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/),
+# never sooner than Retry-After. Anything else (404, parse errors, a crashed browser) is
+# raised right away; retrying won't fix it.
+
+T = TypeVar("T")
+
+RATE_LIMITED = "rate_limited"
+UNAVAILABLE = "unavailable"
+TIMEOUT = "timeout"
+CAPTCHA = "captcha"
+
+THROTTLE_STATUS: dict[int, str] = {408: TIMEOUT, 429: RATE_LIMITED, 502: UNAVAILABLE, 503: UNAVAILABLE, 504: TIMEOUT}
+MAX_RETRIES = 4
+BASE_DELAY = 1.0  # seconds; the first retry waits up to this long
+MAX_DELAY = 60.0
+
+_TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_BLOCK_TITLES: dict[str, str] = {
+    "too many requests": RATE_LIMITED,
+    "captcha": CAPTCHA,
+    "are you a robot": CAPTCHA,
+    "attention required": CAPTCHA,  # Cloudflare
+    "just a moment": CAPTCHA,  # Cloudflare
+    "access denied": CAPTCHA,
+}
+# Only markers of the interstitial itself: Cloudflare also adds a /cdn-cgi/challenge-platform/
+# script to ordinary pages, so that path alone says nothing
+_CHALLENGE_MARKERS = ("cf-challenge", "cf-chl-", "captcha-delivery", "px-captcha")
+
+class Throttled(Exception):
+    """The site asked us to slow down; `reason` is RATE_LIMITED, UNAVAILABLE, TIMEOUT or CAPTCHA"""
+
+    def __init__(self, reason: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(reason if retry_after is None else f"{reason}, retry after {retry_after:g}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header: delay-seconds or an HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def block_reason(html: str) -> Optional[str]:
+    """CAPTCHA or RATE_LIMITED if `html` is an interstitial rather than the requested page"""
+    head = html[:20_000]  # interstitials are small; don't scan whole listings
+    title = _TITLE.search(head)
+    if title:
+        text = title.group(1).lower()
+        for marker, reason in _BLOCK_TITLES.items():
+            if marker in text:
+                return reason
+    lowered = head.lower()
+    return CAPTCHA if any(marker in lowered for marker in _CHALLENGE_MARKERS) else None
+
+def check_html(html: str) -> None:
+    """Raise Throttled for a CAPTCHA or rate-limit page"""
+    reason = block_reason(html)
+    if reason:
+        raise Throttled(reason)
+
+def check_response(response: Any) -> None:
+    """Raise Throttled for a slow-down status (with its Retry-After) or an interstitial body"""
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int) and status in THROTTLE_STATUS:
+        headers = getattr(response, "headers", None) or {}
+        raise Throttled(THROTTLE_STATUS[status], parse_retry_after(headers.get("Retry-After")))
+    text = getattr(response, "text", "")
+    if isinstance(text, str):
+        check_html(text)
+
+def classify(exc: BaseException) -> Optional[Throttled]:
+    """The slow-down signal behind `exc`, None when retrying won't help"""
+    if isinstance(exc, Throttled):
+        return exc
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int) and status in THROTTLE_STATUS:
+        headers = getattr(exc.response, "headers", None) or {}  # type: ignore
+        return Throttled(THROTTLE_STATUS[status], parse_retry_after(headers.get("Retry-After")))
+    # httpx.TimeoutException, requests.Timeout, selenium's TimeoutException, TimeoutError
+    if any("Timeout" in cls.__name__ for cls in type(exc).__mro__):
+        return Throttled(TIMEOUT)
+    return None
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None, base: float = BASE_DELAY, cap: float = MAX_DELAY) -> float:
+    """Full jitter: uniform(0, min(cap, base * 2**attempt)), but never less than Retry-After"""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, retry_after or 0.0)
+
+class AimdController:
+    """Concurrency limit that grows while responses are healthy and halves on slow-down signals"""
+
+    def __init__(self, initial: int = 1, minimum: int = 1, maximum: int = 8, decrease: float = 0.5, cooldown: float = 1.0) -> None:
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError(f"need 1 <= minimum <= initial <= maximum, got {minimum}, {initial}, {maximum}")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.successes = 0
+        self.throttles = 0
+        self._limit = float(initial)
+        self._ssthresh = float(maximum)  # slow start until the first cut
+        self._hold_until = 0.0
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Requests allowed in flight right now"""
+        return max(self.minimum, int(self._limit))
+
+    def on_success(self) -> None:
+        with self._cond:
+            self.successes += 1
+            step = 1.0 if self._limit < self._ssthresh else 1.0 / self._limit
+            self._limit = min(float(self.maximum), self._limit + step)
+            self._cond.notify_all()
+
+    def on_throttle(self, signal: Optional[Throttled] = None) -> None:
+        now = time.monotonic()
+        with self._cond:
+            self.throttles += 1
+            if now >= self._hold_until:
+                self._limit = max(float(self.minimum), self._limit * self.decrease)
+                self._ssthresh = self._limit
+                self._hold_until = now + self.cooldown
+            if signal is not None and signal.retry_after:
+                self._paused_until = max(self._paused_until, now + signal.retry_after)
+
+    def pause_remaining(self) -> float:
+        """Seconds left of a Retry-After pause"""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of `limit` in-flight slots (threads) for the duration of the block"""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+def _retry_delay(error: Exception, attempt: int, retries: int, controller: Optional[AimdController]) -> float:
+    """Backoff before the next attempt; re-raises `error` when it isn't worth retrying"""
+    signal = classify(error)
+    if signal is None or attempt >= retries:
+        raise error
+    if controller is not None:
+        controller.on_throttle(signal)
+    delay = backoff_delay(attempt, signal.retry_after)
+    print(f"[!] {signal}; retry {attempt + 1}/{retries} in {delay:.1f}s")
+    return delay
+
+def call_with_retries(fn: Callable[[], T], controller: Optional[AimdController] = None, retries: int = MAX_RETRIES) -> T:
+    """fn(), retrying slow-down failures with jittered backoff and reporting each outcome to `controller`"""
+    for attempt in itertools.count():
+        if controller is not None and (pause := controller.pause_remaining()):
+            time.sleep(pause)
+        try:
+            result = fn()
+        except Exception as error:
+            time.sleep(_retry_delay(error, attempt, retries, controller))
+            continue
+        if controller is not None:
+            controller.on_success()
+        return result
+    raise AssertionError("unreachable")
+
+async def call_with_retries_async(fn: Callable[[], Awaitable[T]], controller: Optional[AimdController] = None, retries: int = MAX_RETRIES) -> T:
+    """Async twin of call_with_retries"""
+    for attempt in itertools.count():
+        if controller is not None and (pause := controller.pause_remaining()):
+            await asyncio.sleep(pause)
+        try:
+            result = await fn()
+        except Exception as error:
+            await asyncio.sleep(_retry_delay(error, attempt, retries, controller))
+            continue
+        if controller is not None:
+            controller.on_success()
+        return result
+    raise AssertionError("unreachable")
@@ -0,0 +1,115 @@
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+# -- Stable product IDs and a cross-run dedupe index
+# A product ID is a 64-bit BLAKE2b hash of what identifies the product (its URL, or its
+# title when the card has no link), written as 16 hex characters. The same product gets
+# the same ID on every run. Among a million products the chance that any two IDs collide
+# is about 1 in 37 million, compared with certain collisions for 4 random hex characters
+# (65,536 values).
+# https://docs.python.org/3/library/hashlib.html#blake2
+#
+# SeenIndex remembers every ID already stored, in a plain text file with one ID per line
+# that is only ever appended to. On startup it is read into a set of ints, so each lookup
+# is O(1) and a million IDs take roughly 60 MB.
+
+ID_BYTES = 8
+
+def product_id(*key: str) -> str:
+    """Deterministic 16-character ID for the product identified by `key`, e.g. its URL"""
+    digest = hashlib.blake2b("\x1f".join(key).encode("utf-8"), digest_size=ID_BYTES)
+    return digest.hexdigest().upper()
+
+class SeenIndex:
+    """Set of product IDs that persists across runs in an append-only file"""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._seen: set[int] = set()
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self._seen.update(int(line, 16) for line in f if line.strip())
+        self._file = open(self.path, mode="a", encoding="utf-8")
+
+    def __contains__(self, pid: str) -> bool:
+        return int(pid, 16) in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, pid: str) -> bool:
+        """Record `pid`; returns False if it was already known"""
+        key = int(pid, 16)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self._file.write(pid + "\n")
+        return True
+
+    def unseen(self, rows: Iterable[Any], key: Callable[[Any], str] = lambda row: row[0]) -> list[Any]:
+        """Rows whose ID isn't in the index, first occurrence only; nothing is recorded"""
+        batch: set[int] = set()
+        new_rows = []
+        for row in rows:
+            pid = int(key(row), 16)
+            if pid not in self._seen and pid not in batch:
+                batch.add(pid)
+                new_rows.append(row)
+        return new_rows
+
+    def add_all(self, pids: Iterable[str]) -> None:
+        """Record several IDs and flush them to disk"""
+        for pid in pids:
+            self.add(pid)
+        self._file.flush()
+
+    def filter_new(self, rows: Iterable[Any], key: Callable[[Any], str] = lambda row: row[0]) -> list[Any]:
+        """Rows whose ID hasn't been seen before, recording them as seen"""
+        new_rows = self.unseen(rows, key)
+        self.add_all(key(row) for row in new_rows)
+        return new_rows
+
+    def __iter__(self) -> Iterator[str]:
+        return (f"{key:0{ID_BYTES * 2}X}" for key in self._seen)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "SeenIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class DedupeSink:
+    """Wraps a sink (see sinks.py) and drops rows whose ID is already in `index`"""
+
+    def __init__(self, sink: Any, index: SeenIndex) -> None:
+        self.sink = sink
+        self.index = index
+        self.skipped = 0
+
+    @property
+    def rows_written(self) -> int:
+        return self.sink.rows_written
+
+    def write_rows(self, rows: Iterable[Any]) -> int:
+        rows = list(rows)
+        new_rows = self.index.unseen(rows)
+        self.skipped += len(rows) - len(new_rows)
+        written = self.sink.write_rows(new_rows)
+        self.index.add_all(row[0] for row in new_rows)  # only once the rows are safely written
+        return written
+
+    def close(self) -> None:
+        self.sink.close()
+        self.index.close()
+
+    def __enter__(self) -> "DedupeSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,37 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+# -- Cached chromedriver path: https://github.com/SergeyPirogov/webdriver_manager
+# ChromeDriverManager().install() works out the installed Chrome's version and checks for a
+# matching driver every time a browser starts, before a single page loads. For short cron
+# scrapes that is a good part of the run. cached_driver_path resolves the driver once and
+# keeps its path in a small JSON file next to the outputs:
+#   - pinned (version="126.0.6478.126" or $CHROMEDRIVER_VERSION): reused for as long as the
+#     binary exists; a different pin resolves again
+#   - unpinned: reused for MAX_AGE, then resolved again, since Chrome updates itself
+
+CACHE_FILE = "chromedriver.json"
+PIN_ENV = "CHROMEDRIVER_VERSION"
+MAX_AGE = 7 * 24 * 3600  # seconds an unpinned path is trusted
+
+def cached_driver_path(install: Callable[[Optional[str]], str], cache_file: Path, version: Optional[str] = None,
+                       max_age: float = MAX_AGE) -> str:
+    """chromedriver path for `version` from `cache_file`, calling install(version) only when it is missing or stale"""
+    version = version or os.environ.get(PIN_ENV) or None
+    try:
+        entry = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        entry = {}
+    fresh = version is not None or time.time() - entry.get("resolved_at", 0) < max_age
+    if entry.get("version") == version and fresh and Path(entry.get("path", "")).is_file():
+        return entry["path"]
+
+    path = install(version)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(cache_file.suffix + ".tmp")
+    tmp.write_text(json.dumps({"version": version, "path": path, "resolved_at": time.time()}), encoding="utf-8")
+    tmp.replace(cache_file)
+    return path
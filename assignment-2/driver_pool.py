@@ -0,0 +1,189 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Iterator, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from adaptive import AimdController, call_with_retries, check_html
+from fast_path import SCRAPER
+from lean_browser import record_page_weight
+from metrics import METRICS
+
+# -- Explicit waits: https://www.selenium.dev/documentation/webdriver/waits/#explicit-waits
+# Instead of sleeping a fixed 3 seconds after every driver.get(), poll the page until the
+# product cards are in the DOM and return right away. The listings render their cards with
+# JavaScript, often after readyState is "complete", so a loaded document alone doesn't end
+# the wait: a page without cards gets RENDER_GRACE more seconds after it finished loading.
+# A "no results" page (past the last listing page) then ends the wait after the grace period
+# instead of the full PAGE_LOAD_TIMEOUT, without relying on any particular empty-page markup.
+
+PRODUCT_CARD_SELECTOR = "article.prd"
+PAGE_LOAD_TIMEOUT = 15  # seconds; upper bound, most pages are ready much sooner
+POLL_FREQUENCY = 0.1  # seconds between checks
+RENDER_GRACE = 2.0  # seconds a loaded page may take to render its cards
+
+def _document_complete(driver: WebDriver) -> bool:
+    return driver.execute_script("return document.readyState") == "complete"
+
+class _LoadedFor:
+    """Wait condition: the document has been complete for `grace` seconds"""
+
+    def __init__(self, grace: float) -> None:
+        self.grace = grace
+        self._since: Optional[float] = None
+
+    def __call__(self, driver: WebDriver) -> bool:
+        if not _document_complete(driver):
+            self._since = None
+            return False
+        if self._since is None:
+            self._since = time.monotonic()
+        return time.monotonic() - self._since >= self.grace
+
+def wait_for_cards(driver: WebDriver, timeout: float = PAGE_LOAD_TIMEOUT, selector: str = PRODUCT_CARD_SELECTOR,
+                   grace: float = RENDER_GRACE) -> bool:
+    """Wait until product cards are present (True) or the page has been loaded for `grace` seconds without any (False)"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+            EC.any_of(EC.presence_of_element_located((By.CSS_SELECTOR, selector)), _LoadedFor(grace))
+        )
+    except TimeoutException:
+        print(f"[!] Timed out after {timeout}s waiting for {selector}")
+        return False
+    return bool(driver.find_elements(By.CSS_SELECTOR, selector))
+
+def load_listing(driver: WebDriver, url: str, timeout: float = PAGE_LOAD_TIMEOUT, page_weight: bool = False) -> str:
+    """Open `url`, wait for the product cards and return the rendered HTML.
+
+    With `page_weight` the bytes and load time are recorded too (see lean_browser.py), at the cost of one more script call.
+    """
+    start = time.perf_counter()
+    driver.get(url)
+    wait_for_cards(driver, timeout)
+    html = driver.page_source
+    METRICS.record_load(SCRAPER, html, time.perf_counter() - start)
+    if page_weight:
+        record_page_weight(SCRAPER, driver)
+    return html
+
+class PoolExhausted(RuntimeError):
+    """Every driver in the pool crashed and none could be restarted"""
+
+class DriverPool:
+    """N reusable Chrome instances that load listing pages in parallel.
+
+    `factory` builds one driver, e.g. `lambda: setup_driver(page_load_strategy="eager")`,
+    so driver.get() returns at DOMContentLoaded and the explicit wait decides when
+    the page is ready. Drivers are started in parallel and reused for every page;
+    a driver that crashes is replaced by a fresh one. If the replacement fails to start
+    the pool carries on one driver short, and raises PoolExhausted once none are left.
+    """
+
+    def __init__(self, size: int, factory: Callable[[], WebDriver], timeout: float = PAGE_LOAD_TIMEOUT, page_weight: bool = False) -> None:
+        if size < 1:
+            raise ValueError(f"pool size must be at least 1, got {size}")
+        self.size = size
+        self.factory = factory
+        self.timeout = timeout
+        self.page_weight = page_weight  # see load_listing
+        self._idle: queue.Queue[Optional[WebDriver]] = queue.Queue()  # None: no drivers left
+        self._live = size
+        self._lock = threading.Lock()
+        with ThreadPoolExecutor(max_workers=size) as executor:  # Chrome startup is slow; start them together
+            starts = [executor.submit(factory) for _ in range(size)]
+        failed = next((start.exception() for start in starts if start.exception() is not None), None)
+        if failed is not None:  # quit the drivers that did start, so no Chrome is left behind
+            for start in starts:
+                if start.exception() is None:
+                    self._quit(start.result())
+            raise failed
+        for start in starts:
+            self._idle.put(start.result())
+
+    @contextmanager
+    def driver(self) -> Iterator[WebDriver]:
+        """Borrow an idle driver for the duration of the block"""
+        driver = self._idle.get()
+        if driver is None:
+            self._idle.put(None)  # wake the next borrower too
+            raise PoolExhausted("every driver in the pool crashed and none could be restarted")
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self._idle.put(driver)
+            else:
+                self._replace(driver)
+
+    def _replace(self, driver: WebDriver) -> None:
+        """Quit a crashed driver and start a fresh one in its place, or give up its slot"""
+        self._quit(driver)
+        try:
+            self._idle.put(self.factory())
+            return
+        except Exception as e:
+            print(f"[!] Failed to restart a crashed driver: {e}")
+        with self._lock:
+            self._live -= 1
+            if self._live == 0:
+                self._idle.put(None)
+
+    def load(self, url: str, scheduler: Any = None, controller: Optional[AimdController] = None) -> str:
+        """Load one listing page on any idle driver; `scheduler` is asked for a request slot first.
+
+        With a `controller` (adaptive.py) at most its current limit of drivers load at once,
+        and CAPTCHA pages and timeouts are retried after a backoff. The slot is held per
+        attempt, so a page sleeping through its backoff doesn't keep another from loading.
+        """
+        def attempt() -> str:
+            with controller.slot() if controller is not None else nullcontext(), self.driver() as driver:
+                if scheduler is not None:
+                    scheduler.acquire(url)
+                html = load_listing(driver, url, self.timeout, self.page_weight)
+            if controller is not None:
+                check_html(html)
+            return html
+
+        if controller is None:
+            return attempt()
+        return call_with_retries(attempt, controller)
+
+    def iter_load(self, urls: list[str], scheduler: Optional[Any] = None, controller: Optional[AimdController] = None) -> Iterator[str]:
+        """Load `urls` in parallel across the pool, yielding each page's HTML in URL order as soon as it is ready"""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            yield from executor.map(lambda url: self.load(url, scheduler, controller), urls)
+
+    def load_all(self, urls: list[str], scheduler: Optional[Any] = None, controller: Optional[AimdController] = None) -> list[str]:
+        """Load `urls` in parallel across the pool; HTML comes back in the same order as `urls`"""
+        return list(self.iter_load(urls, scheduler, controller))
+
+    @staticmethod
+    def _quit(driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"[!] Failed to quit driver: {e}")
+
+    def close(self) -> None:
+        """Quit every driver in the pool"""
+        while not self._idle.empty():
+            driver = self._idle.get_nowait()
+            if driver is not None:
+                self._quit(driver)
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
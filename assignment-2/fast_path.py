@@ -0,0 +1,73 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
+
+import httpx
+
+from adaptive import AimdController, call_with_retries, check_response
+from metrics import METRICS, PAGES
+
+# -- HTTP fast path with a browser fallback
+# parse_appliance_page only reads static `article.prd` markup, and Jumia renders the listing on
+# the server, so most pages don't need Chrome at all. fetch_listing_http asks for the page with
+# a plain keep-alive httpx.Client and keeps the HTML only if it already holds product cards.
+# Otherwise (cards built by JavaScript, an unexpected status, a network error) it returns None
+# and the caller loads the page in the browser as before. An HTTP page costs milliseconds and a
+# few MB; a headless Chrome page costs seconds and hundreds of MB.
+# Every page is counted in scrape_pages_total{fetch="http"|"browser"} (see metrics.py).
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"  # the browser's, see setup_driver
+HTTP_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-KE,en;q=0.9",
+}
+HTTP_TIMEOUT = 15  # seconds, as PAGE_LOAD_TIMEOUT
+SCRAPER = "jumia"  # label of every Jumia series in metrics.py; driver_pool and jumia_scraper import it
+
+_PRODUCT_CARD = re.compile(r"""<article\b[^>]*\bclass=["'](?:[^"']*\s)?prd[\s"']""", re.IGNORECASE)
+
+def make_http_client(connections: int = 4) -> httpx.Client:
+    """Keep-alive client shared by the whole crawl; only the first request per connection pays for TLS"""
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections, keepalive_expiry=30)
+    return httpx.Client(headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT, follow_redirects=True, limits=limits)
+
+def has_product_cards(html: str) -> bool:
+    """True if `html` holds at least one `article.prd`, without building a tree"""
+    return _PRODUCT_CARD.search(html) is not None
+
+def fetch_listing_http(client: httpx.Client, url: str, scheduler: Any = None, controller: Optional[AimdController] = None) -> Optional[str]:
+    """Listing HTML over plain HTTP when it already holds product cards; None means "use the browser".
+
+    Slow-down answers (429, CAPTCHA pages, timeouts) are retried with backoff, as in the browser.
+    """
+    def attempt() -> httpx.Response:
+        if scheduler is not None:
+            scheduler.acquire(url)
+        start = time.perf_counter()
+        response = client.get(url)
+        METRICS.record_response(SCRAPER, response, time.perf_counter() - start)
+        check_response(response)
+        return response
+
+    try:
+        response = call_with_retries(attempt, controller)
+    except Exception as e:
+        print(f"[!] HTTP fetch failed for {url} ({e}), falling back to the browser")
+        response = None
+    if response is None or response.status_code != 200 or not has_product_cards(response.text):
+        METRICS.inc(PAGES, scraper=SCRAPER, fetch="browser")
+        return None
+    METRICS.inc(PAGES, scraper=SCRAPER, fetch="http")
+    return response.text
+
+def iter_load_hybrid(urls: list[str], client: httpx.Client, browser_load: Callable[[str], str], workers: int = 1,
+                     scheduler: Any = None, controller: Optional[AimdController] = None) -> Iterator[str]:
+    """HTML of `urls` in URL order, `workers` at a time: over HTTP where possible, else `browser_load(url)`"""
+    def load(url: str) -> str:
+        html = fetch_listing_http(client, url, scheduler, controller)
+        return html if html is not None else browser_load(url)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(load, urls)
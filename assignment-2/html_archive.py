@@ -0,0 +1,237 @@
+import argparse
+import gzip
+import importlib
+import json
+import os
+import threading
+import zlib
+from collections import deque
+from functools import partial
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, NamedTuple, Optional
+
+from pipeline import parse_ordered
+
+# -- Raw HTML archive, in the spirit of WARC: https://iipc.github.io/warc-specifications/
+# Every fetched page is appended to one file as its own gzip member: a JSON header line
+# (url, scraper, status, fetched_at), the HTML and a newline. Concatenated gzip members are
+# still a valid .gz file (`zcat pages.warc.gz` works), each record can be decompressed on
+# its own, and nothing already written is ever rewritten.
+# A sidecar index (`<archive>.idx`, JSON Lines of url / offset / length) gives random access
+# by URL: seek to the offset, read `length` bytes, gunzip. The index is appended right after
+# each record; on open, records missing from it are re-indexed and a half-written last
+# record (a crash mid-write) is cut off.
+#
+# When a selector changes, re-run the parser over the archive instead of re-crawling:
+#   with HtmlArchive(OUTPUT_DIR / "jumia_pages.warc.gz") as archive:
+#       for url, rows in reparse(archive, parse_appliance_page):
+#           ...
+# or `python html_archive.py output/jumia_pages.warc.gz --parser jumia`. No network, no browser;
+# pages are parsed on every core (see pipeline.py).
+
+CHUNK_SIZE = 64 * 1024
+COMPRESS_LEVEL = 6
+
+# --parser choices: (module, parse function, CSV headers), imported only when picked
+PARSERS: dict[str, tuple[str, str, str]] = {
+    "jumia": ("jumia_scraper", "parse_appliance_page", "HEADERS"),
+    "webscraper_io": ("webscraper_io", "parse_page", "HEADERS"),
+}
+
+class ArchivedPage(NamedTuple):
+    url: str
+    html: str
+    scraper: str
+    status: Optional[int]
+    fetched_at: str
+    offset: int  # of its gzip member in the archive
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def _encode(url: str, html: str, scraper: str, status: Optional[int], fetched_at: str) -> bytes:
+    header = json.dumps({"url": url, "scraper": scraper, "status": status, "fetched_at": fetched_at}, ensure_ascii=False)
+    return gzip.compress(header.encode("utf-8") + b"\n" + html.encode("utf-8") + b"\n", COMPRESS_LEVEL, mtime=0)
+
+def _decode(data: bytes, offset: int) -> ArchivedPage:
+    header, _, body = data.partition(b"\n")
+    meta = json.loads(header)
+    return ArchivedPage(meta["url"], body[:-1].decode("utf-8"), meta["scraper"], meta["status"], meta["fetched_at"], offset)
+
+def _members(f: BinaryIO, offset: int = 0) -> Iterator[tuple[int, int, bytes]]:
+    """(offset, compressed length, data) of each complete gzip member from `offset` on"""
+    f.seek(offset)
+    pending = b""
+    while True:
+        inflater = zlib.decompressobj(wbits=31)
+        parts: list[bytes] = []
+        length = 0
+        while not inflater.eof:
+            chunk = pending or f.read(CHUNK_SIZE)
+            pending = b""
+            if not chunk:
+                return  # end of file, or a record cut short by a crash
+            try:
+                parts.append(inflater.decompress(chunk))
+            except zlib.error:
+                return
+            length += len(chunk)
+        pending = inflater.unused_data
+        length -= len(pending)
+        yield offset, length, b"".join(parts)
+        offset += length
+
+class HtmlArchive:
+    """Append-only gzip archive of fetched pages with a URL index; safe to add to from several threads"""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._index: dict[str, tuple[int, int]] = {}  # url -> (offset, length) of its latest record
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a+b")
+        self._index_file = open(self.index_path, "a+", encoding="utf-8")
+        self._recover(self._load_index())
+
+    def _load_index(self) -> int:
+        """Read the index; returns where the last indexed record ends"""
+        end = 0
+        good = 0  # characters of complete index lines (the index is ASCII, so also bytes)
+        for line in self.index_path.read_text(encoding="utf-8").splitlines(keepends=True):
+            try:
+                entry = json.loads(line) if line.endswith("\n") else None
+            except json.JSONDecodeError:
+                entry = None
+            if entry is None:
+                break  # a torn last line; _recover re-indexes its record
+            self._index[entry["url"]] = (entry["offset"], entry["length"])
+            end = max(end, entry["offset"] + entry["length"])
+            good += len(line)
+        self._index_file.truncate(good)
+        return end
+
+    def _recover(self, end: int) -> None:
+        """Index records written after `end` and drop a partial record at the end of the file"""
+        size = self.path.stat().st_size
+        if end >= size:
+            return
+        for offset, length, data in _members(self._file, end):
+            self._add_to_index(_decode(data, offset).url, offset, length)
+            end = offset + length
+        if end < size:
+            print(f"[!] Dropping {size - end} bytes of a partial record at the end of {self.path}")
+            self._file.truncate(end)
+
+    def _add_to_index(self, url: str, offset: int, length: int) -> None:
+        self._index[url] = (offset, length)
+        self._index_file.write(json.dumps({"url": url, "offset": offset, "length": length}) + "\n")
+        self._index_file.flush()
+
+    def add(self, url: str, html: str, scraper: str = "", status: Optional[int] = None, fetched_at: Optional[str] = None) -> int:
+        """Append one page; returns its offset. A URL added again is looked up as its latest copy."""
+        record = _encode(url, html, scraper, status, fetched_at or _now())
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(record)
+            self._file.flush()
+            self._add_to_index(url, offset, len(record))
+        return offset
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        """Latest archived copy of `url`, or None"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+            offset, length = entry
+            self._file.seek(offset)
+            data = self._file.read(length)
+        return _decode(gzip.decompress(data), offset)
+
+    def pages(self, scraper: Optional[str] = None, latest: bool = True) -> Iterator[ArchivedPage]:
+        """Every page in the order it was archived, read sequentially (no seeks per page).
+
+        With `latest` only the newest copy of each URL; `scraper` keeps one scraper's pages.
+        """
+        with open(self.path, "rb") as f:  # own handle: add() may run meanwhile
+            for offset, _, data in _members(f):
+                page = _decode(data, offset)
+                if scraper is not None and page.scraper != scraper:
+                    continue
+                if latest and self._index.get(page.url, (None,))[0] != offset:
+                    continue
+                yield page
+
+    def urls(self) -> list[str]:
+        return list(self._index)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._file.close()
+        self._index_file.close()
+
+    def __enter__(self) -> "HtmlArchive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def archived(archive: HtmlArchive, urls: Iterable[str], htmls: Iterable[str], scraper: str = "") -> Iterator[str]:
+    """Pass `htmls` through, adding each to `archive` under the matching URL"""
+    for url, html in zip(urls, htmls):
+        archive.add(url, html, scraper)
+        yield html
+
+def reparse(archive: HtmlArchive, parse: Callable[[str], list[Any]], scraper: Optional[str] = None,
+            workers: Optional[int] = None) -> Iterator[tuple[str, list[Any]]]:
+    """(url, rows) for every archived page, parsed with `parse` on `workers` processes (0: in this process).
+
+    `parse` must be picklable for workers, e.g. jumia_scraper.parse_appliance_page (see pipeline.py).
+    """
+    pages = archive.pages(scraper)
+    if workers == 0:
+        for page in pages:
+            yield page.url, parse(page.html)
+        return
+    urls: deque[str] = deque()
+
+    def htmls() -> Iterator[str]:
+        for page in pages:
+            urls.append(page.url)
+            yield page.html
+
+    for rows in parse_ordered(htmls(), parse, workers):
+        yield urls.popleft(), rows
+
+if __name__ == "__main__":
+    from sinks import CsvSink
+
+    arg_parser = argparse.ArgumentParser(description="Re-run a scraper's parser over an HTML archive, offline")
+    arg_parser.add_argument("archive", type=Path)
+    arg_parser.add_argument("--parser", choices=sorted(PARSERS), required=True)
+    arg_parser.add_argument("--scraper", help="only pages archived by this scraper (default: the --parser name)")
+    arg_parser.add_argument("--workers", type=int, help="parse processes (default: one per core, 0: this process)")
+    arg_parser.add_argument("--output", type=Path, help="CSV to write (default: output/<parser>_reparsed.csv)")
+    arg_parser.add_argument("--backend", help="HTML parser backend, e.g. lxml (see parsers.py; default: the parser's own)")
+    args = arg_parser.parse_args()
+
+    module_name, function_name, headers_name = PARSERS[args.parser]
+    module = importlib.import_module(module_name)
+    parse = getattr(module, function_name)
+    if args.backend:
+        parse = partial(parse, backend=args.backend)  # picklable, so the workers parse with it too
+    output = args.output or Path(__file__).parent / "output" / f"{args.parser}_reparsed.csv"
+    with HtmlArchive(args.archive) as archive, CsvSink(output, getattr(module, headers_name)) as sink:
+        pages = 0
+        for _, rows in reparse(archive, parse, args.scraper or args.parser, args.workers):
+            sink.write_rows(rows)
+            pages += 1
+    print(f"✅ Re-parsed {pages} pages into {sink.rows_written} rows in {output}")
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+# -- HTTP caching with conditional requests: https://developer.mozilla.org/en-US/docs/Web/HTTP/Caching
+# Every 200 response is stored on disk together with its ETag / Last-Modified headers.
+# The next time the URL is fetched, the stored validators are sent back as If-None-Match /
+# If-Modified-Since. When the page hasn't changed the server answers "304 Not Modified"
+# with an empty body, and the stored copy is used. A repeat crawl of an unchanged
+# catalog then downloads headers only.
+#   - ttl: entries younger than this many seconds are served without any request at all
+#   - max_bytes: once the stored bodies exceed this, least recently used entries are deleted
+# Works with any client whose get(url, headers=...) returns an object with .status_code,
+# .headers and .text, e.g. requests.get or httpx.get. One cache can be shared by fetch threads
+# (webscraper_io's pipeline): the size bookkeeping and eviction run under a lock.
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+@dataclass
+class CachedResponse:
+    """Response served from the cache; quacks like requests/httpx responses for the parts the scrapers use"""
+    url: str
+    text: str
+    headers: dict[str, str] = field(default_factory=dict)
+    status_code: int = 200
+    revalidated: bool = False  # True when the server confirmed it with a 304
+
+    def raise_for_status(self) -> None:
+        pass
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # served from disk without a request (within ttl)
+    revalidated: int = 0  # 304 Not Modified
+    misses: int = 0  # full download
+    evictions: int = 0
+
+class HttpCache:
+    """On-disk HTTP cache with ETag / Last-Modified revalidation, TTL and LRU size bound"""
+
+    def __init__(self, directory: Path | str, ttl: Optional[float] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.RLock()  # guards _size and eviction
+        self._size = sum(path.stat().st_size for path in self.directory.glob("*.body"))
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def load(self, url: str) -> Optional[tuple[dict[str, Any], str]]:
+        """Stored (metadata, body) for `url`, or None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_text(encoding="utf-8")
+        except (OSError, ValueError):  # missing, or half-deleted by another process
+            return None
+        return meta, body
+
+    def store(self, url: str, text: str, headers: Any) -> None:
+        """Save a 200 response body with its validators"""
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        with self._lock:  # old size, write and new size together, or two threads storing one URL count it twice
+            old_size = body_path.stat().st_size if body_path.exists() else 0
+            _write_atomic(body_path, text)
+            _write_atomic(meta_path, json.dumps(meta))
+            self._size += body_path.stat().st_size - old_size
+            if self._size > self.max_bytes:
+                self.evict()
+
+    def _touch(self, url: str, meta: dict[str, Any], revalidated: bool = False) -> None:
+        meta_path, body_path = self._paths(url)
+        os.utime(body_path)  # mtime doubles as the last-used time for LRU eviction
+        if revalidated:
+            meta["stored_at"] = time.time()  # a 304 restarts the ttl
+            _write_atomic(meta_path, json.dumps(meta))
+
+    def evict(self, target: Optional[int] = None) -> None:
+        """Delete least recently used entries until the cache holds at most `target` bytes (default 90% of max_bytes)"""
+        target = int(self.max_bytes * 0.9) if target is None else target
+        with self._lock:
+            bodies = sorted(self.directory.glob("*.body"), key=lambda path: path.stat().st_mtime)
+            for body_path in bodies:
+                if self._size <= target:
+                    break
+                size = body_path.stat().st_size
+                body_path.unlink(missing_ok=True)
+                body_path.with_suffix(".json").unlink(missing_ok=True)
+                self._size -= size
+                self.stats.evictions += 1
+
+    def fetch(self, url: str, get: Callable[..., Any], scheduler: Any = None, **kwargs: Any) -> Any:
+        """GET `url` through the cache using `get` (e.g. requests.get); extra kwargs are passed on.
+
+        `scheduler` (anything with `acquire(url)`) is only asked for a slot when a request
+        is actually sent, so fresh entries cost nothing. Non-2xx responses are returned
+        as they are and never stored.
+        """
+        cached = self.load(url)
+        fresh = self._fresh(url, cached)
+        if fresh is not None:
+            return fresh
+        headers = self._validators(cached, kwargs.pop("headers", None))
+        if scheduler is not None:
+            scheduler.acquire(url)
+        return self._settle(url, cached, get(url, headers=headers, **kwargs))
+
+    async def fetch_async(self, url: str, get: Callable[..., Awaitable[Any]], scheduler: Any = None, **kwargs: Any) -> Any:
+        """fetch for an async `get`, e.g. httpx.AsyncClient.get; `scheduler` needs `acquire_async(url)`"""
+        cached = self.load(url)
+        fresh = self._fresh(url, cached)
+        if fresh is not None:
+            return fresh
+        headers = self._validators(cached, kwargs.pop("headers", None))
+        if scheduler is not None:
+            await scheduler.acquire_async(url)
+        return self._settle(url, cached, await get(url, headers=headers, **kwargs))
+
+    def _fresh(self, url: str, cached: Optional[tuple[dict[str, Any], str]]) -> Optional[CachedResponse]:
+        """The stored copy if it is still within ttl"""
+        if cached is None or self.ttl is None:
+            return None
+        meta, body = cached
+        if time.time() - meta["stored_at"] >= self.ttl:
+            return None
+        self.stats.hits += 1
+        self._touch(url, meta)
+        return CachedResponse(url, body)
+
+    @staticmethod
+    def _validators(cached: Optional[tuple[dict[str, Any], str]], headers: Optional[dict[str, str]]) -> dict[str, str]:
+        """`headers` plus If-None-Match / If-Modified-Since from the stored copy"""
+        headers = dict(headers or {})
+        if cached is not None:
+            meta, _ = cached
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _settle(self, url: str, cached: Optional[tuple[dict[str, Any], str]], response: Any) -> Any:
+        """The stored copy for a 304; a 200 is stored; anything else is returned as it is"""
+        if response.status_code == 304 and cached is not None:
+            meta, body = cached
+            self.stats.revalidated += 1
+            self._touch(url, meta, revalidated=True)
+            return CachedResponse(url, body, revalidated=True)
+
+        if response.status_code == 200:
+            self.stats.misses += 1
+            self.store(url, response.text, response.headers)
+        return response
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.body"))
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write via a temp file and rename, so readers never see a half-written file"""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
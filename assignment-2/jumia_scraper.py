@@ -1,15 +1,94 @@
+from __future__ import annotations # annotations may name selenium types without importing selenium
 import csv
+from dataclasses import dataclass, replace
+from functools import partial
+import importlib
 import json
 from pathlib import Path
+import sys
+import threading
 import time
-import uuid
-from bs4 import BeautifulSoup
-from typing import Any
-import selenium
-from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-# from selenium.webdriver.chrome import 
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+import httpx
+from rate_limiter import RateScheduler
+from robots import RobotsRules
+from driver_cache import CACHE_FILE, cached_driver_path
+from parsers import DEFAULT_BACKEND, get_backend
+from pipeline import parse_ordered
+from dedupe import DedupeSink, SeenIndex, product_id
+from metrics import METRICS, PAGES, STARTUP_SECONDS, WRITE_SECONDS, MeteredSink
+from adaptive import AimdController, call_with_retries, check_html
+from records import Product, RowSink
+from price_store import DB_FILE, HistorySink, Observation, PriceStore
+from html_archive import HtmlArchive, archived
+from fast_path import SCRAPER, USER_AGENT, fetch_listing_http, iter_load_hybrid, make_http_client
+from lean_browser import LeanProfile, record_page_weight
+from sinks import CsvSink, JsonlSink, ListSink, TeeSink
+
+if TYPE_CHECKING:
+    import selenium
+    from selenium.webdriver.chrome.webdriver import WebDriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    from driver_pool import DriverPool, wait_for_cards
+
+# -- Request budget from https://www.jumia.co.ke/robots.txt (see jumia.robots.txt):
+# "Site scaping is permited IF ... using less than 200 request per minute"
+JUMIA_HOST = "www.jumia.co.ke"
+REQUESTS_PER_MINUTE = 199
+REQUEST_BURST = 5
+
+LISTING_URL = "https://www.jumia.co.ke/home-office-appliances/?page={}#catalog-listing"
+MAX_PAGES = 3
+HEADERS: list[str] = ["Product_ID", "Title", "Price", "Old Price", "Discount", "Badge", "Rating", "Number of Reviews", "Shipping"]
+
+def make_scheduler(shared: bool = False) -> RateScheduler:
+    """Rate scheduler holding Jumia's robots.txt budget; pass shared=True to split it across worker processes"""
+    scheduler = RateScheduler(shared=shared)
+    scheduler.add_host(JUMIA_HOST, rpm=REQUESTS_PER_MINUTE, burst=REQUEST_BURST)
+    return scheduler
+
+# -- Lazy imports (PEP 562 module __getattr__): https://peps.python.org/pep-0562/
+# selenium and webdriver_manager take about a quarter of a second to import, and parsing,
+# saving, the tests and the HTTP fast path never use them. The names below are imported on
+# first use instead: through `jumia_scraper.<name>` from outside (so patch("jumia_scraper.
+# ChromeDriverManager") works as before), or by _browser_imports() just before a browser is
+# needed. Import, driver lookup and Chrome launch times go to scrape_startup_seconds{stage=...}.
+_LAZY_IMPORTS: dict[str, tuple[str, str]] = {
+    "selenium": ("selenium.webdriver", ""), # the package, with selenium.webdriver loaded
+    "Service": ("selenium.webdriver.chrome.service", "Service"),
+    "ChromeDriverManager": ("webdriver_manager.chrome", "ChromeDriverManager"),
+    "DriverPool": ("driver_pool", "DriverPool"),
+    "wait_for_cards": ("driver_pool", "wait_for_cards"),
+}
+
+def __getattr__(name: str) -> Any:
+    """Import one of _LAZY_IMPORTS on first access"""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    value = getattr(module, attribute) if attribute else sys.modules[module_name.split(".")[0]]
+    METRICS.observe(STARTUP_SECONDS, time.perf_counter() - start, scraper=SCRAPER, stage="import")
+    globals()[name] = value
+    return value
+
+def _browser_imports() -> None:
+    """Bind every lazy name as a module global, keeping any already bound (e.g. by a test's patch)"""
+    for name in _LAZY_IMPORTS:
+        if name not in globals():
+            __getattr__(name)
+
+def startup_report() -> Optional[str]:
+    """Seconds spent on imports, finding chromedriver and launching Chrome this run, if a browser was started"""
+    stages = {"import": "imports", "driver_path": "driver lookup", "launch": "Chrome launch"}
+    parts = []
+    for stage, label in stages.items():
+        histogram = METRICS.histogram(STARTUP_SECONDS, scraper=SCRAPER, stage=stage)
+        if histogram is not None:
+            parts.append(f"{label} {histogram.sum:.2f}s")
+    return ", ".join(parts) if parts else None
 
 # -- Selenium WebDriver: https://www.selenium.dev/documentation/webdriver/
 # The WebDriver drives a browser natively, as a user would, either locally or 
@@ -18,21 +97,43 @@ from webdriver_manager.chrome import ChromeDriverManager
 # This helps with dynamic content that requires JavaScript execution, scrolling,
 # pagination and other stuff...
 
-def setup_driver() -> WebDriver:
-    """Setup Chrome driver with options. https://www.selenium.dev/documentation/webdriver/browsers/chrome/"""
+def setup_driver(page_load_strategy: str = "normal", lean: Optional[LeanProfile] = None,
+                 driver_cache: Optional[Path] = None) -> WebDriver:
+    """Setup Chrome driver with options. https://www.selenium.dev/documentation/webdriver/browsers/chrome/
+
+    With a `lean` profile the browser skips images, fonts and third-party scripts (see lean_browser.py).
+    With a `driver_cache` file the chromedriver path is looked up once and reused (see driver_cache.py).
+    """
+    _browser_imports()
     options = selenium.webdriver.ChromeOptions() # type: ignore # https://www.selenium.dev/documentation/webdriver/browsers/chrome/
+    # "eager" returns from driver.get() at DOMContentLoaded; wait_for_cards() then waits only as long as needed
+    # https://www.selenium.dev/documentation/webdriver/drivers/options/#pageloadstrategy
+    options.page_load_strategy = page_load_strategy
     options.add_argument("--headless")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
 
     # Regular user agent; avoids detection as a bot, but doesn't respect Jumia's robots.txt
-    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36") # User-Agent: https://developer.chrome.com/docs/devtools/user-agent/
+    options.add_argument(f"--user-agent={USER_AGENT}") # User-Agent: https://developer.chrome.com/docs/devtools/user-agent/
 
     # Custom user agent; identifies as a bot, respects Jumia's robots.txt
     # options.add_argument("--user-agent=JumiaScraperBot/1.0 (+https://yourwebsite.com/bot-info; contact@yourdomain.com)")
 
-    
-    driver = selenium.webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options) # type: ignore
+    if lean is not None:
+        lean.configure(options) # Chrome preferences: no images
+
+    start = time.perf_counter()
+    if driver_cache is not None:
+        driver_path = cached_driver_path(lambda version: ChromeDriverManager(driver_version=version).install(), driver_cache)
+    else:
+        driver_path = ChromeDriverManager().install()
+    METRICS.observe(STARTUP_SECONDS, time.perf_counter() - start, scraper=SCRAPER, stage="driver_path")
+
+    start = time.perf_counter()
+    driver = selenium.webdriver.Chrome(service=Service(driver_path), options=options) # type: ignore
+    METRICS.observe(STARTUP_SECONDS, time.perf_counter() - start, scraper=SCRAPER, stage="launch")
+    if lean is not None:
+        lean.attach(driver) # DevTools: block fonts, images from CSS, ads and trackers
     return driver
 
 # --- Parsing the Jumia appliance's page
@@ -40,29 +141,33 @@ def setup_driver() -> WebDriver:
 # From inspection with dev tools, each product is contained within <article class="prd _fb _spn c-prd col" data-spon="true"></article>
 # The product info is in a <div class="info"></div>
 
-def parse_appliance_page(html: str) -> list:
-    """Parse HTML and extract product information"""
-    soup = BeautifulSoup(html, features='html.parser')
+def parse_appliance_page(html: str, backend: str = DEFAULT_BACKEND) -> list:
+    """Parse HTML and extract product information.
+
+    `backend` picks the HTML parser (see parsers.py); every backend returns the same rows.
+    """
+    parser = get_backend(backend)
+    root = parser.parse(html)
     products = []
 
-    product_cards = soup.select("article.prd._fb.col.c-prd") # Extract all product cards
+    product_cards = parser.select(root, "article.prd._fb.col.c-prd") # Extract all product cards
     print(f"Found {len(product_cards)} product cards on this page", end=None)
 
     for card in product_cards:
         try:
-            info = card.select_one("div.info") # Extract the info div which contains product details
-            if not info:
+            info = parser.select_one(card, "div.info") # Extract the info div which contains product details
+            if info is None:
                 continue
                 
             # Extract title and price; every product card has these
-            title_elem = info.select_one("h3.name")
-            price_elem = info.select_one("div.prc")
+            title_elem = parser.select_one(info, "h3.name")
+            price_elem = parser.select_one(info, "div.prc")
             
-            if not title_elem or not price_elem:
+            if title_elem is None or price_elem is None:
                 continue
                 
-            title = title_elem.text.strip()
-            price = price_elem.text.strip()
+            title = parser.text(title_elem).strip()
+            price = parser.text(price_elem).strip()
 
             # Remove double quotes
             price = price.replace('"', '').replace(',', '')  # Remove quotes and commas for consistency
@@ -76,39 +181,46 @@ def parse_appliance_page(html: str) -> list:
             num_reviews = ""
             shipping = ""
 
-            old_div = info.select_one("div.old") # Old price
-            if old_div:
-                old_price = old_div.text.strip().replace('"', '') # Remove quotes from old price
+            old_div = parser.select_one(info, "div.old") # Old price
+            if old_div is not None:
+                old_price = parser.text(old_div).strip().replace('"', '') # Remove quotes from old price
 
-            discount_div = info.select_one("div.bdg._dsct._sm") # Discount
-            if discount_div:
-                discount = discount_div.text.strip()
+            discount_div = parser.select_one(info, "div.bdg._dsct._sm") # Discount
+            if discount_div is not None:
+                discount = parser.text(discount_div).strip()
 
-            badge_div = info.select_one("div.bdg._mall._xs") # Badge (e.g. "Jumia Mall")
-            if badge_div:
-                badge = badge_div.text.strip()
+            badge_div = parser.select_one(info, "div.bdg._mall._xs") # Badge (e.g. "Jumia Mall")
+            if badge_div is not None:
+                badge = parser.text(badge_div).strip()
 
-            rev = info.select_one("div.rev") # Reviews section
-            if rev:
-                rating_div = rev.select_one("div.stars._s")
-                if rating_div:
-                    rating = rating_div.text.strip().split(" out")[0]
+            rev = parser.select_one(info, "div.rev") # Reviews section
+            if rev is not None:
+                rating_div = parser.select_one(rev, "div.stars._s")
+                if rating_div is not None:
+                    rating = parser.text(rating_div).strip().split(" out")[0]
                 
                 # Extract number of reviews more safely
-                rev_text = rev.get_text()
+                rev_text = parser.text(rev)
                 if "(" in rev_text and ")" in rev_text:
                     try:
                         num_reviews = rev_text.split("(")[1].split(")")[0]
                     except IndexError:
                         num_reviews = ""
 
-            if info.select_one("svg.ic.xprss"):
+            if parser.select_one(info, "svg.ic.xprss") is not None:
                 shipping = "Express"
 
-            # Generate 4-character UUID for product
-            product_id = str(uuid.uuid4())[:4].upper()
+            # Stable ID from the product URL (the title if the card has no link); same product, same ID on every run
+            url = ""
+            link = parser.select_one(card, "a.core")
+            if link is not None:
+                try:
+                    url = parser.attr(link, "href")
+                except KeyError:
+                    url = ""
+            pid = product_id(url) if url else product_id(title)
 
-            products.append([product_id, title, price, old_price, discount, badge, rating, num_reviews, shipping])
+            products.append([pid, title, price, old_price, discount, badge, rating, num_reviews, shipping])
         
         except Exception as e:
             print(f"[!] Skipping product due to error: {e}")
@@ -116,26 +228,26 @@ def parse_appliance_page(html: str) -> list:
 
     return products
 
+def parse_products(html: str, backend: str = DEFAULT_BACKEND) -> list[Product]:
+    """parse_appliance_page, with each row's prices, discount and rating parsed into a Product (see records.py)"""
+    return [Product.from_row(row) for row in parse_appliance_page(html, backend)]
+
 def save_to_csv(products, filename) -> None:
     """Save products to CSV file"""
-    headers: list[str] = ["Product_ID", "Title", "Price", "Old Price", "Discount", "Badge", "Rating", "Number of Reviews", "Shipping"]
-    
     with open(filename, mode='w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerow(headers)
+        writer.writerow(HEADERS)
         writer.writerows(products)
     
     print(f"✅ Saved {len(products)} products to {filename}")
 
 def save_to_json(products, filename) -> None:
    """Save products to JSON file with Product_ID as keys"""
-   headers: list[str] = ["Product_ID", "Title", "Price", "Old Price", "Discount", "Badge", "Rating", "Number of Reviews", "Shipping"]
-   
    # Convert list of lists to dictionary with Product_ID as keys
    products_dict = {}
    for product in products:
        product_id = product[0]  # First element is Product_ID
-       product_data = {headers[i]: product[i] for i in range(1, len(headers))}  # Skip Product_ID in the data
+       product_data = {HEADERS[i]: product[i] for i in range(1, len(HEADERS))}  # Skip Product_ID in the data
        products_dict[product_id] = product_data
    
    with open(filename, 'w', encoding='utf-8') as jsonfile:
@@ -143,56 +255,234 @@ def save_to_json(products, filename) -> None:
    
    print(f"✅ Saved {len(products)} products to {filename}")
 
-def main() -> None:
-    OUTPUT_DIR: Path = Path(__file__).parent / "output"
-    OUTPUT_DIR.mkdir(exist_ok=True)  # Ensure output directory exists
-    OUTPUT_CSV: Path = OUTPUT_DIR / "jumia_appliances.csv"
-    OUTPUT_JSON: Path = OUTPUT_DIR / "jumia_appliances.json"
+def observation(product: Product) -> Observation:
+    """A parsed Product as a price_store.Observation"""
+    return Observation(key=product.product_id, title=product.title, price=product.price, old_price=product.old_price)
+
+def scrape_sequential(urls: list[str], scheduler: RateScheduler, robots: RobotsRules, sink: Any,
+                      controller: Optional[AimdController] = None, archive: Optional[HtmlArchive] = None,
+                      http_client: Optional[httpx.Client] = None, lean: Optional[LeanProfile] = None,
+                      driver_cache: Optional[Path] = None, backend: str = DEFAULT_BACKEND, page_weight: bool = False) -> int:
+    """Load listing pages one by one in a single browser, writing each page's products to `sink`.
 
-    driver: WebDriver = setup_driver()
-    all_products: list[Any] = [] 
+    CAPTCHA / "too many requests" pages and timeouts are retried after a jittered backoff (see adaptive.py).
+    Every loaded page is also added to `archive`, if given (see html_archive.py).
+    With an `http_client` each page is first fetched over plain HTTP, and the browser is only
+    started for pages whose server-rendered HTML has no product cards (see fast_path.py).
+    A `lean` profile keeps the browser from downloading anything but the page (see lean_browser.py),
+    and a `driver_cache` file saves looking up chromedriver on every start (see driver_cache.py).
+    `backend` picks the HTML parser (see parsers.py). With `page_weight` each page's bytes and load time are recorded.
+    """
+    driver: Optional[WebDriver] = None if http_client else setup_driver(lean=lean, driver_cache=driver_cache)
     
     try:
-        for page_num in range(1, 4):
-            url: str = f"https://www.jumia.co.ke/home-office-appliances/?page={page_num}#catalog-listing"
+        for page_num, url in enumerate(urls, start=1):
             print(f"🕷️  Scraping page {page_num}: {url}")
+
+            if not robots.allowed(url):
+                print(f"🚫 robots.txt disallows {url}, stopping...")
+                break
             
-            driver.get(url) # equivalent to requests.get(url) or httpx.get(url) but with Selenium's browser automation
-            time.sleep(3)  # Wait for page to load
-            
-            html: str = driver.page_source # Get the HTML after fully loading the page
-            page_products = parse_appliance_page(html)
+            def load(url: str = url) -> str:
+                nonlocal driver
+                driver = driver or setup_driver(lean=lean, driver_cache=driver_cache) # in hybrid mode, started for the first page that needs it
+                _browser_imports()
+                scheduler.acquire(url) # Waits for a slot in Jumia's request budget: https://www.jumia.co.ke/robots.txt
+                start = time.perf_counter()
+                driver.get(url) # equivalent to requests.get(url) or httpx.get(url) but with Selenium's browser automation
+                wait_for_cards(driver) # Wait until the product cards are rendered, no longer than needed
+
+                html: str = driver.page_source # Get the HTML after fully loading the page
+                METRICS.record_load(SCRAPER, html, time.perf_counter() - start)
+                if page_weight:
+                    record_page_weight(SCRAPER, driver) # bytes transferred and load time, see lean_browser.py
+                check_html(html) # a CAPTCHA or 429 page is retried, not mistaken for the end of the listing
+                return html
+
+            html = fetch_listing_http(http_client, url, scheduler, controller) if http_client else None
+            if html is None:
+                html = call_with_retries(load, controller)
+            if archive is not None:
+                archive.add(url, html, SCRAPER) # keep the raw page for offline re-parsing
+            page_products = parse_metered(html, backend)
             
             if not page_products:
                 print(f"No products found on page {page_num}, stopping...")
                 break
             
-            all_products.extend(page_products)
-            print(f"Page {page_num}: Found {len(page_products)} products (Total: {len(all_products)})")
-            
-            # Delay to respect Jumia's rate limits: https://www.jumia.co.ke/robots.txt
-            time.sleep(5)
+            sink.write_rows(page_products)
+            print(f"Page {page_num}: Found {len(page_products)} products (Total: {sink.rows_written})")
 
             # Additional features to respect Jumia's robots.txt
-            # TODO: rate limit by calculating request rate
-            # TODO: check disallowed url patterns i.e *--*, /mobapi/, /en/, facets, paths, other pattern etc
             # TODO: update user agent to identify as a bot
-            # TODO: implement error handling for CAPTCHA and HTTP 429 errors
     
     except Exception as e:
         print(f"Error during scraping: {e}")
     
     finally:
-        driver.quit() # Close the browser
-    
-    if all_products:
-        # -- Save to both CSV and JSON formats
-        save_to_csv(products=all_products, filename=OUTPUT_CSV)
-        save_to_json(products=all_products, filename=OUTPUT_JSON)
-        print(f"✅ Scraping complete! Total products scraped: {len(all_products)}")
-        
+        if driver is not None:
+            driver.quit() # Close the browser
+
+    return sink.rows_written
+
+def parse_metered(html: str, backend: str = DEFAULT_BACKEND) -> list[Product]:
+    """parse_products, recording parse time and products per page"""
+    start = time.perf_counter()
+    products = parse_products(html, backend)
+    METRICS.record_page(SCRAPER, len(products), time.perf_counter() - start)
+    return products
+
+def write_pages(htmls: Iterable[str], sink: Any, parse_workers: Optional[int] = None, backend: str = DEFAULT_BACKEND) -> int:
+    """Parse listing pages in order and write their Products to `sink`, stopping at the first empty page"""
+    if parse_workers:
+        pages = parse_ordered(htmls, partial(parse_products, backend=backend), parse_workers)
     else:
+        pages = (parse_metered(html, backend) for html in htmls)
+    for page_num, page_products in enumerate(pages, start=1):
+        if parse_workers:
+            METRICS.record_page(SCRAPER, len(page_products))  # parsed in another process; no parse time here
+        if not page_products:
+            print(f"No products found on page {page_num}, stopping...")
+            break
+        sink.write_rows(page_products)
+        print(f"Page {page_num}: Found {len(page_products)} products (Total: {sink.rows_written})")
+    return sink.rows_written
+
+def scrape_with_pool(urls: list[str], pool_size: int, scheduler: RateScheduler, robots: RobotsRules, sink: Any,
+                     parse_workers: Optional[int] = None, archive: Optional[HtmlArchive] = None,
+                     http_client: Optional[httpx.Client] = None, lean: Optional[LeanProfile] = None,
+                     driver_cache: Optional[Path] = None, backend: str = DEFAULT_BACKEND, page_weight: bool = False) -> int:
+    """Load listing pages in parallel on a pool of `pool_size` drivers, writing them to `sink` in page order.
+
+    With `parse_workers` the HTML is parsed on that many processes (see pipeline.py) while the drivers keep loading.
+    With an `http_client`, `pool_size` pages are fetched over HTTP at once and the driver pool is only
+    started if one of them needs a browser (see fast_path.py). Every driver uses the `lean` profile
+    and the `driver_cache` file, if given, and pages are parsed with `backend` (see parsers.py).
+    `page_weight` records each page's bytes and load time, as in scrape_sequential.
+    """
+    urls = [url for url in urls if robots.allowed(url)]
+    controller = AimdController(maximum=pool_size) # drivers in use follow the AIMD limit (see adaptive.py)
+
+    def start_pool() -> DriverPool:
+        _browser_imports()
+        return DriverPool(pool_size, factory=lambda: setup_driver(page_load_strategy="eager", lean=lean, driver_cache=driver_cache),
+                          page_weight=page_weight)
+
+    if http_client is None:
+        with start_pool() as pool:
+            htmls = pool.iter_load(urls, scheduler, controller)
+            if archive is not None:
+                htmls = archived(archive, urls, htmls, SCRAPER)
+            return write_pages(htmls, sink, parse_workers, backend)
+
+    pool: Optional[DriverPool] = None
+    pool_lock = threading.Lock()
+
+    def browser_load(url: str) -> str:
+        nonlocal pool
+        with pool_lock:
+            pool = pool or start_pool()
+        return pool.load(url, scheduler, controller)
+
+    try:
+        htmls = iter_load_hybrid(urls, http_client, browser_load, pool_size, scheduler, controller)
+        if archive is not None:
+            htmls = archived(archive, urls, htmls, SCRAPER)
+        return write_pages(htmls, sink, parse_workers, backend)
+    finally:
+        if pool is not None:
+            pool.close()
+
+@dataclass(frozen=True)
+class ScrapeOptions:
+    """How main() crawls and what it writes; the defaults are one browser, saved once at the end"""
+    pool_size: int = 1  # > 1 loads pages in parallel on a DriverPool (see driver_pool.py)
+    # stream=True appends every page to CSV + JSON Lines as soon as it is parsed (see sinks.py);
+    # otherwise products are collected and saved once at the end, as CSV + JSON keyed by Product_ID
+    stream: bool = False
+    dedupe: bool = False  # streams too, but appends and skips products stored by any earlier run (see dedupe.py)
+    parse_workers: Optional[int] = None  # with pool_size > 1, parse on this many processes (see pipeline.py)
+    metrics_file: Optional[Path] = None  # .prom or .json file receiving the run's metrics (see metrics.py)
+    history: bool = False  # also record every product's price in this run to an SQLite store (see price_store.py)
+    archive: bool = False  # append every loaded page's HTML to a WARC, to re-parse later without a browser (see html_archive.py)
+    http_first: bool = False  # try a plain HTTP fetch first and open Chrome only for pages that need it (see fast_path.py)
+    lean: bool = False  # block images, fonts and third-party scripts in Chrome (see lean_browser.py)
+    fast_start: bool = False  # reuse the chromedriver path found by an earlier run (see driver_cache.py)
+    backend: str = DEFAULT_BACKEND  # "lxml" parses pages several times faster than html.parser (see parsers.py; needs lxml)
+
+def main(scheduler: RateScheduler | None = None, robots: RobotsRules | None = None, options: Optional[ScrapeOptions] = None,
+         **overrides: Any) -> None:
+    """Scrape the appliance listing as `options` say; keyword `overrides` replace single options, e.g. main(pool_size=3)"""
+    options = replace(options or ScrapeOptions(), **overrides)
+    OUTPUT_DIR: Path = Path(__file__).parent / "output"
+    OUTPUT_DIR.mkdir(exist_ok=True)  # Ensure output directory exists
+    OUTPUT_CSV: Path = OUTPUT_DIR / "jumia_appliances.csv"
+    OUTPUT_JSON: Path = OUTPUT_DIR / "jumia_appliances.json"
+    OUTPUT_JSONL: Path = OUTPUT_DIR / "jumia_appliances.jsonl"
+    SEEN_IDS: Path = OUTPUT_DIR / "jumia_seen_ids.txt"
+    PRICE_DB: Path = OUTPUT_DIR / DB_FILE
+    ARCHIVE: Path = OUTPUT_DIR / "jumia_pages.warc.gz"
+
+    scheduler = scheduler or make_scheduler()
+    robots = robots or RobotsRules.from_file() # Saved copy of https://www.jumia.co.ke/robots.txt
+    urls: list[str] = [LISTING_URL.format(page_num) for page_num in range(1, MAX_PAGES + 1)]
+
+    pages = HtmlArchive(ARCHIVE) if options.archive else None
+    http_client = make_http_client(options.pool_size) if options.http_first else None
+    profile = LeanProfile() if options.lean else None
+    driver_cache = OUTPUT_DIR / CACHE_FILE if options.fast_start else None
+    # Page weight costs a script call per page load; it is only measured when lean mode or a metrics file reports it
+    page_weight = options.lean or options.metrics_file is not None
+    stream = options.stream or options.dedupe # dedupe appends to the streamed files
+    sink: Any = TeeSink(CsvSink(OUTPUT_CSV, HEADERS, append=options.dedupe), JsonlSink(OUTPUT_JSONL, HEADERS, append=options.dedupe)) if stream else ListSink()
+    sink = RowSink(sink) # pages arrive as Products (see records.py); the files get their text rows
+    if options.dedupe:
+        sink = DedupeSink(sink, SeenIndex(SEEN_IDS))
+    store = PriceStore(PRICE_DB) if options.history else None
+    if store:
+        sink = HistorySink(sink, store, store.start_run(SCRAPER), observation)
+    sink = MeteredSink(sink, SCRAPER) # times every page written (see metrics.py)
+    try:
+        with sink: # closing the HistorySink finishes the run, even if scraping fails
+            if options.pool_size > 1:
+                total: int = scrape_with_pool(urls, options.pool_size, scheduler, robots, sink, options.parse_workers, pages, http_client,
+                                              profile, driver_cache, options.backend, page_weight)
+            else:
+                total = scrape_sequential(urls, scheduler, robots, sink, archive=pages, http_client=http_client, lean=profile,
+                                          driver_cache=driver_cache, backend=options.backend, page_weight=page_weight)
+        if store:
+            print(f"💸 {len(store.price_drops(SCRAPER))} price drops, {len(store.new_products(SCRAPER))} new and "
+                  f"{len(store.removed_products(SCRAPER))} removed products since the last run ({PRICE_DB})")
+    finally:
+        if store:
+            store.close()
+        if pages:
+            pages.close()
+            print(f"🗄️  {len(pages)} pages archived in {ARCHIVE}")
+        if http_client:
+            http_client.close()
+            print(f"⚡ {METRICS.counter(PAGES, scraper=SCRAPER, fetch='http'):g} pages over HTTP, "
+                  f"{METRICS.counter(PAGES, scraper=SCRAPER, fetch='browser'):g} in the browser")
+    if options.dedupe:
+        print(f"Skipped {sink.skipped} products already stored by an earlier run")
+    if not total and options.dedupe and sink.skipped:
+        print(f"✅ Scraping complete! No new products; all {sink.skipped} scraped were already stored")
+    elif not total:
         print("❌ No products were scraped.")
+    elif stream:
+        print(f"✅ Scraping complete! Streamed {total} products to {OUTPUT_CSV} and {OUTPUT_JSONL}")
+    else:
+        # -- Save to both CSV and JSON formats
+        with METRICS.timer(WRITE_SECONDS, scraper=SCRAPER):
+            save_to_csv(products=sink.rows, filename=OUTPUT_CSV)
+            save_to_json(products=sink.rows, filename=OUTPUT_JSON)
+        print(f"✅ Scraping complete! Total products scraped: {total}")
+
+    startup = startup_report()
+    if startup:
+        print(f"⏱️  Startup: {startup}")
+    if options.metrics_file:
+        print(f"📊 Metrics written to {METRICS.write(options.metrics_file)}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from metrics import METRICS, PAGE_LOAD_SECONDS, PAGE_TRANSFER_BYTES, Metrics
+
+# -- Lean browsing: only the listing HTML is read, so don't download anything else.
+# Two layers, because neither catches everything on its own:
+#   Chrome preferences   turn image loading off for every page the profile opens
+#                        https://chromeenterprise.google/policies/#DefaultImagesSetting
+#   DevTools blocking    Network.setBlockedURLs cancels matching requests before they are sent:
+#                        fonts, images referenced from CSS, and third-party ad / tracker scripts
+#                        https://chromedevtools.github.io/devtools-protocol/tot/Network/#method-setBlockedURLs
+# `allow` keeps anything a page turns out to need: a blocked pattern containing one of its
+# entries is dropped from the list (e.g. allow=("jumia.is",) keeps Jumia's own CDN).
+#
+# page_weight() reads the Resource Timing API after a load: bytes over the wire for the page
+# and everything it fetched, and the load time. The scrapers record both per page
+# (scrape_page_transfer_bytes, scrape_page_load_seconds); `python lean_browser.py` loads the
+# same listing pages with and without LeanProfile and prints the bytes and time saved per page.
+
+IMAGE_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico")
+FONT_PATTERNS = ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot")
+THIRD_PARTY_PATTERNS = (
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*criteo.com*", "*criteo.net*",
+    "*tiktok.com*", "*snapchat.com*", "*bing.com*", "*clarity.ms*", "*adjust.com*", "*onesignal.com*",
+)
+CONTENT_BLOCKED = 2  # Chrome content setting value for "block"
+
+# transferSize is 0 for cached and cross-origin resources without Timing-Allow-Origin,
+# so this is a lower bound, the same way for both profiles
+PAGE_WEIGHT_JS = """
+const nav = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+return {
+    bytes: (nav ? nav.transferSize : 0) + resources.reduce((total, r) => total + (r.transferSize || 0), 0),
+    requests: resources.length + 1,
+    load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : performance.now(),
+};
+"""
+
+@dataclass(frozen=True)
+class LeanProfile:
+    """What a lean Chrome session refuses to download"""
+    images: bool = True
+    fonts: bool = True
+    third_party: bool = True
+    extra: tuple[str, ...] = ()  # more URL patterns to block, "*" as wildcard
+    allow: tuple[str, ...] = ()  # blocked patterns containing any of these are not blocked
+
+    def prefs(self) -> dict[str, Any]:
+        """Chrome preferences for ChromeOptions.add_experimental_option("prefs", ...)"""
+        return {"profile.managed_default_content_settings.images": CONTENT_BLOCKED} if self.images else {}
+
+    def blocked_urls(self) -> list[str]:
+        """URL patterns for Network.setBlockedURLs, minus the allowed ones"""
+        patterns = [
+            *(IMAGE_PATTERNS if self.images else ()),
+            *(FONT_PATTERNS if self.fonts else ()),
+            *(THIRD_PARTY_PATTERNS if self.third_party else ()),
+            *self.extra,
+        ]
+        return [pattern for pattern in patterns if not any(allowed in pattern for allowed in self.allow)]
+
+    def configure(self, options: Any) -> None:
+        """Add the preferences to ChromeOptions, before the driver starts"""
+        prefs = self.prefs()
+        if prefs:
+            options.add_experimental_option("prefs", prefs)
+            options.add_argument("--blink-settings=imagesEnabled=false")
+
+    def attach(self, driver: Any) -> None:
+        """Turn on DevTools request blocking in a running driver; lasts for the whole session"""
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls()})
+
+def page_weight(driver: Any) -> Optional[dict[str, float]]:
+    """{"bytes", "requests", "load_ms"} of the page just loaded, None if the browser couldn't say"""
+    try:
+        weight = driver.execute_script(PAGE_WEIGHT_JS)
+    except Exception:
+        return None
+    if not isinstance(weight, dict) or not all(isinstance(weight.get(key), (int, float)) for key in ("bytes", "requests", "load_ms")):
+        return None
+    return weight
+
+def record_page_weight(scraper: str, driver: Any, metrics: Optional[Metrics] = None) -> Optional[dict[str, float]]:
+    """page_weight, observed into PAGE_TRANSFER_BYTES and PAGE_LOAD_SECONDS"""
+    weight = page_weight(driver)
+    if weight is not None:
+        metrics = metrics or METRICS
+        metrics.observe(PAGE_TRANSFER_BYTES, weight["bytes"], scraper=scraper)
+        metrics.observe(PAGE_LOAD_SECONDS, weight["load_ms"] / 1000, scraper=scraper)
+    return weight
+
+def compare(urls: list[str], full_driver: Any, lean_driver: Any) -> list[dict[str, Any]]:
+    """Load each URL in both drivers; per page: bytes and seconds with each, and what lean saved"""
+    from driver_pool import wait_for_cards
+
+    results = []
+    for url in urls:
+        row: dict[str, Any] = {"url": url}
+        for name, driver in (("full", full_driver), ("lean", lean_driver)):
+            start = time.perf_counter()
+            driver.get(url)
+            wait_for_cards(driver)
+            weight = page_weight(driver) or {"bytes": 0, "requests": 0}
+            row[f"{name}_bytes"] = weight["bytes"]
+            row[f"{name}_requests"] = weight["requests"]
+            row[f"{name}_seconds"] = time.perf_counter() - start
+        row["bytes_saved"] = row["full_bytes"] - row["lean_bytes"]
+        row["seconds_saved"] = row["full_seconds"] - row["lean_seconds"]
+        results.append(row)
+    return results
+
+if __name__ == "__main__":
+    from jumia_scraper import LISTING_URL, setup_driver
+
+    arg_parser = argparse.ArgumentParser(description="Bytes and time a lean Chrome session saves per Jumia listing page")
+    arg_parser.add_argument("--pages", type=int, default=2)
+    arg_parser.add_argument("--allow", nargs="*", default=[], help="URL substrings never to block")
+    args = arg_parser.parse_args()
+
+    full, lean = setup_driver(), setup_driver(lean=LeanProfile(allow=tuple(args.allow)))
+    try:
+        rows = compare([LISTING_URL.format(n) for n in range(1, args.pages + 1)], full, lean)
+    finally:
+        full.quit()
+        lean.quit()
+    for row in rows:
+        print(f"{row['url']}\n   full {row['full_bytes'] / 1024:8.0f} KiB {row['full_requests']:4.0f} requests {row['full_seconds']:5.2f}s"
+              f"\n   lean {row['lean_bytes'] / 1024:8.0f} KiB {row['lean_requests']:4.0f} requests {row['lean_seconds']:5.2f}s"
+              f"\n   saved {row['bytes_saved'] / 1024:.0f} KiB and {row['seconds_saved']:.2f}s")
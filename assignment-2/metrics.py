@@ -0,0 +1,252 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+# -- Crawl metrics in the Prometheus data model: https://prometheus.io/docs/concepts/metric_types/
+# Counters only go up (responses by status code, fetch errors); histograms count observations
+# into fixed buckets (fetch latency, response size, parse time, rows per page, write time),
+# so a whole crawl costs a few integers per metric however many pages it visits.
+# Every series is a metric name plus labels, e.g. scrape_fetch_seconds{scraper="jumia"}.
+#
+# The scrapers record into the shared METRICS registry; at the end of a run
+#   METRICS.write("output/metrics.prom")   # Prometheus text format, for node_exporter's textfile collector
+#   METRICS.write("output/metrics.json")   # count / sum / mean / p50 / p95 / max per series
+# shows where the crawl time went. Work done in parse worker processes (pipeline.py) is not
+# recorded: each process would have its own registry.
+
+FETCH_SECONDS = "scrape_fetch_seconds"  # request sent -> body received
+RESPONSE_BYTES = "scrape_response_bytes"
+RESPONSES = "scrape_responses_total"  # by status code
+FETCH_ERRORS = "scrape_fetch_errors_total"  # no response at all: timeouts, connection errors, ...
+PARSE_SECONDS = "scrape_parse_seconds"
+PAGE_ROWS = "scrape_page_rows"
+WRITE_SECONDS = "scrape_write_seconds"
+PAGE_TRANSFER_BYTES = "scrape_page_transfer_bytes"  # browser page + everything it loaded, as transferred (see lean_browser.py)
+PAGE_LOAD_SECONDS = "scrape_page_load_seconds"  # browser navigation start -> load event
+STARTUP_SECONDS = "scrape_startup_seconds"  # by stage: import, driver_path, launch (see jumia_scraper.py)
+PAGES = "scrape_pages_total"  # by how a page was fetched, in jumia_scraper's hybrid mode (see fast_path.py)
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BYTES_BUCKETS = tuple(1024 * 4 ** n for n in range(8))  # 1 KiB ... 16 MiB
+COUNT_BUCKETS = (0, 1, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+Labels = tuple[tuple[str, str], ...]
+
+def buckets_for(name: str) -> tuple[float, ...]:
+    """Bucket upper bounds picked by the metric's unit suffix"""
+    if name.endswith("_seconds"):
+        return SECONDS_BUCKETS
+    if name.endswith("_bytes"):
+        return BYTES_BUCKETS
+    return COUNT_BUCKETS
+
+@dataclass
+class Histogram:
+    bounds: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)  # per bucket, plus one for +Inf
+    count: int = 0
+    sum: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.counts = self.counts or [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate, interpolated within the bucket holding the q-th observation (as histogram_quantile does)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+def response_size(response: Any) -> int:
+    """Body size in bytes; cached responses only keep the text"""
+    content = getattr(response, "content", None)
+    if isinstance(content, bytes):
+        return len(content)
+    text = getattr(response, "text", "")
+    return len(text.encode("utf-8")) if isinstance(text, str) else 0
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _series(name: str, labels: Iterable[tuple[str, str]]) -> str:
+    """Prometheus series name: name{key="value",...}"""
+    pairs = ",".join(f'{key}="{value}"' for key, value in labels)
+    return f"{name}{{{pairs}}}" if pairs else name
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+class Metrics:
+    """Thread-safe registry of labelled counters and histograms"""
+
+    def __init__(self) -> None:
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets_for(name))
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the seconds spent in the `with` block, also when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def record_response(self, scraper: str, response: Any, seconds: float) -> None:
+        """Latency, size and status code of one requests / httpx / http_cache response"""
+        status = getattr(response, "status_code", None)
+        status = status if isinstance(status, int) else "unknown"
+        self.observe(FETCH_SECONDS, seconds, scraper=scraper)
+        self.observe(RESPONSE_BYTES, response_size(response), scraper=scraper)
+        self.inc(RESPONSES, scraper=scraper, status=status)
+
+    def record_load(self, scraper: str, html: str, seconds: float) -> None:
+        """Latency and size of one browser page load; WebDriver exposes no status code"""
+        self.observe(FETCH_SECONDS, seconds, scraper=scraper)
+        self.observe(RESPONSE_BYTES, len(html.encode("utf-8")), scraper=scraper)
+
+    def record_error(self, scraper: str) -> None:
+        """A fetch that got no response at all"""
+        self.inc(FETCH_ERRORS, scraper=scraper)
+
+    def record_page(self, scraper: str, rows: int, seconds: Optional[float] = None) -> None:
+        """Rows found on one page and, when parsed in this process, the parse time"""
+        self.observe(PAGE_ROWS, rows, scraper=scraper)
+        if seconds is not None:
+            self.record_parse(scraper, seconds)
+
+    def record_parse(self, scraper: str, seconds: float) -> None:
+        self.observe(PARSE_SECONDS, seconds, scraper=scraper)
+
+    def record_write(self, scraper: str, seconds: float) -> None:
+        self.observe(WRITE_SECONDS, seconds, scraper=scraper)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get((name, _labels(labels)), 0)
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get((name, _labels(labels)))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Every series in the Prometheus text exposition format"""
+        lines: list[str] = []
+        with self._lock:
+            typed: set[str] = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{_series(name, labels)} {_number(value)}")
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, bucket_count in zip((*histogram.bounds, "+Inf"), histogram.counts):
+                    cumulative += bucket_count
+                    le = bound if isinstance(bound, str) else _number(bound)
+                    lines.append(f"{_series(name + '_bucket', (*labels, ('le', le)))} {cumulative}")
+                lines.append(f"{_series(name + '_sum', labels)} {_number(histogram.sum)}")
+                lines.append(f"{_series(name + '_count', labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict[str, Any]:
+        """Counters, and count / sum / mean / p50 / p95 / max of every histogram, keyed by series"""
+        with self._lock:
+            return {
+                "counters": {_series(name, labels): value for (name, labels), value in sorted(self._counters.items())},
+                "histograms": {
+                    _series(name, labels): {
+                        "count": h.count,
+                        "sum": h.sum,
+                        "mean": h.sum / h.count if h.count else 0.0,
+                        "p50": h.quantile(0.5),
+                        "p95": h.quantile(0.95),
+                        "max": h.max,
+                    }
+                    for (name, labels), h in sorted(self._histograms.items())
+                },
+            }
+
+    def write(self, path: Path | str) -> Path:
+        """Save to `path`: a JSON summary for .json, the Prometheus text format otherwise"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = json.dumps(self.summary(), indent=2) if path.suffix == ".json" else self.to_prometheus()
+        tmp = path.with_suffix(path.suffix + ".tmp")  # collectors never see a half-written file
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(path)
+        return path
+
+class MeteredSink:
+    """Wraps a sink (see sinks.py) and times every write_rows into WRITE_SECONDS"""
+
+    def __init__(self, sink: Any, scraper: str, metrics: Optional[Metrics] = None) -> None:
+        self.sink = sink
+        self.scraper = scraper
+        self.metrics = metrics or METRICS
+
+    @property
+    def rows_written(self) -> int:
+        return self.sink.rows_written
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.sink, name)  # e.g. ListSink.rows, DedupeSink.skipped
+
+    def write_rows(self, rows: Iterable[Any]) -> int:
+        start = time.perf_counter()
+        try:
+            return self.sink.write_rows(rows)
+        finally:
+            self.metrics.record_write(self.scraper, time.perf_counter() - start)
+
+    def close(self) -> None:
+        self.sink.close()
+
+    def __enter__(self) -> "MeteredSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+METRICS = Metrics()
@@ -0,0 +1,113 @@
+from functools import lru_cache
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup
+
+try:  # lxml is optional: pip install lxml
+    import lxml.html
+    from lxml import etree
+except ImportError:  # pragma: no cover - depends on the environment
+    lxml = None  # type: ignore
+    etree = None  # type: ignore
+
+# -- Pluggable HTML parser backends
+# The scrapers only need a few operations: parse a page, select elements with simple CSS
+# selectors ("article.prd._fb", ".title", "div.rev div.stars"), read text and attributes.
+# Each backend implements exactly those, so the extraction code is written once and can
+# run on whichever parser is fastest:
+#   - "html.parser": BeautifulSoup + Python's html.parser, what the scrapers have always used
+#   - "bs4-lxml":    BeautifulSoup with lxml building the tree (faster parse, same soup API)
+#   - "lxml":        lxml.html with precompiled XPath, no BeautifulSoup at all (fastest)
+# https://www.crummy.com/software/BeautifulSoup/bs4/doc/#installing-a-parser
+
+DEFAULT_BACKEND = "html.parser"
+
+class SoupBackend:
+    """BeautifulSoup tree built by `features` ("html.parser" or "lxml")"""
+
+    def __init__(self, name: str, features: str) -> None:
+        self.name = name
+        self.features = features
+
+    def parse(self, html: str) -> Any:
+        return BeautifulSoup(html, features=self.features)
+
+    def select(self, node: Any, selector: str) -> list[Any]:
+        return node.select(selector)
+
+    def select_one(self, node: Any, selector: str) -> Any:
+        return node.select_one(selector)
+
+    def text(self, node: Any) -> str:
+        return node.get_text()
+
+    def attr(self, node: Any, name: str) -> str:
+        """Attribute value; KeyError when missing, like tag[name]"""
+        return node[name]
+
+@lru_cache(maxsize=None)
+def _compile_selector(selector: str) -> Any:
+    """Translate a simple CSS selector into a compiled XPath.
+
+    Supports what the scrapers use: `tag`, `.class`, `tag.class1.class2` and the
+    descendant combinator (whitespace), e.g. "div.rev div.stars._s".
+    """
+    steps = []
+    for compound in selector.split():
+        tag, *classes = compound.split(".")
+        predicates = "".join(
+            f"[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]" for cls in classes
+        )
+        steps.append(f"{tag or '*'}{predicates}")
+    return etree.XPath("descendant::" + "//".join(steps))
+
+class LxmlBackend:
+    """lxml.html tree queried with precompiled XPath; no BeautifulSoup objects are built"""
+
+    name = "lxml"
+
+    def parse(self, html: str) -> Any:
+        try:
+            return lxml.html.document_fromstring(html)
+        except etree.ParserError:  # empty document
+            return lxml.html.Element("html")
+
+    def select(self, node: Any, selector: str) -> list[Any]:
+        return _compile_selector(selector)(node)
+
+    def select_one(self, node: Any, selector: str) -> Any:
+        found = _compile_selector(selector)(node)
+        return found[0] if found else None
+
+    def text(self, node: Any) -> str:
+        return node.text_content()
+
+    def attr(self, node: Any, name: str) -> str:
+        """Attribute value; KeyError when missing, like tag[name]"""
+        value = node.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+def available_backends() -> list[str]:
+    """Backend names usable in this environment"""
+    return ["html.parser"] + (["bs4-lxml", "lxml"] if etree is not None else [])
+
+def fastest_backend() -> str:
+    """The quickest backend that is installed"""
+    return "lxml" if etree is not None else DEFAULT_BACKEND
+
+def get_backend(name: Optional[str] = None) -> Any:
+    """Backend object for `name` (default: html.parser)"""
+    name = name or DEFAULT_BACKEND
+    if name not in ("html.parser", "bs4-lxml", "lxml"):
+        raise ValueError(f"Unknown parser backend {name!r}; choose from {available_backends()}")
+    if name not in available_backends():
+        raise ValueError(f"Parser backend {name!r} needs lxml: pip install lxml")
+    return _BACKENDS[name]
+
+_BACKENDS: dict[str, Any] = {
+    "html.parser": SoupBackend("html.parser", "html.parser"),
+    "bs4-lxml": SoupBackend("bs4-lxml", "lxml"),
+    "lxml": LxmlBackend(),
+}
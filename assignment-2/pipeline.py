@@ -0,0 +1,79 @@
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+# -- Fetch / parse pipeline: https://docs.python.org/3/library/concurrent.futures.html
+# Fetching is I/O bound and parallelises fine in threads; parsing HTML is CPU bound and holds
+# the GIL, so in-process parsing is capped at one core however many pages are fetched at once.
+# Here fetcher threads hand the raw HTML to a ProcessPoolExecutor, every worker process parses
+# on its own core, and the results are yielded back in page order.
+#
+# `parse` runs in another process, so it must be picklable: a module-level function such as
+# `jumia_scraper.parse_appliance_page` or `functools.partial(webscraper_io.parse_page, backend="lxml")`.
+# Workers are started with "spawn", which is safe next to running threads.
+
+T = TypeVar("T")
+
+def default_workers() -> int:
+    """One parse process per core"""
+    return os.cpu_count() or 1
+
+def make_parse_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+def parse_ordered(htmls: Iterable[str], parse: Callable[[str], list[Any]], workers: Optional[int] = None) -> Iterator[list[Any]]:
+    """Parse `htmls` across processes; yields each page's rows in input order as soon as they are ready.
+
+    At most 2 x workers pages are queued, so a fast producer can't pile up HTML in memory.
+    """
+    workers = workers or default_workers()
+    pool = make_parse_pool(workers)
+    window = 2 * workers
+    pending: deque[Future] = deque()
+    try:
+        for html in htmls:
+            pending.append(pool.submit(parse, html))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def run_pipeline(items: Iterable[T], fetch: Callable[[T], Optional[str]], parse: Callable[[str], list[Any]],
+                 fetch_workers: int = 4, parse_workers: Optional[int] = None, stop_on_empty: bool = True) -> Iterator[list[Any]]:
+    """Fetch `items` on threads, parse on processes, yield each item's rows in item order.
+
+    `fetch` returns the page's HTML, or None when it failed. With `stop_on_empty` the
+    pipeline ends at the first page without rows (the end of a paginated listing) and
+    `items` may be endless, e.g. itertools.count(1).
+    """
+    parse_workers = parse_workers or default_workers()
+    parse_pool = make_parse_pool(parse_workers)
+    window = fetch_workers + 2 * parse_workers
+    items = iter(items)
+    pending: deque[Future] = deque()
+
+    def fetch_stage(item: T) -> Optional[Future]:
+        html = fetch(item)
+        return parse_pool.submit(parse, html) if html else None
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool:
+        try:
+            for item in itertools.islice(items, window):
+                pending.append(fetch_pool.submit(fetch_stage, item))
+            while pending:
+                parsed = pending.popleft().result()
+                rows = parsed.result() if parsed is not None else []
+                if stop_on_empty and not rows:
+                    break
+                yield rows
+                for item in itertools.islice(items, 1):
+                    pending.append(fetch_pool.submit(fetch_stage, item))
+        finally:
+            for future in pending:
+                future.cancel()
+            parse_pool.shutdown(cancel_futures=True)
@@ -0,0 +1,294 @@
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional
+
+from records import parse_cents
+
+# -- Price history in SQLite: https://docs.python.org/3/library/sqlite3.html
+# The scrapers overwrite their CSV / JSON on every run. PriceStore keeps every run instead:
+#   runs      one row per crawl of a source ("jumia", "books")
+#   products  one row per product: latest title / URL / price, first and last run it was seen in
+#   prices    one row per product per run: the observed price (and old price, if any)
+# Rows are written with executemany in batches, one transaction per batch, as upserts
+# (INSERT ... ON CONFLICT DO UPDATE). WAL mode with synchronous=NORMAL keeps the commits cheap.
+# Each table has a primary key and indexes covering the queries below, so a daily crawl of
+# hundreds of thousands of products costs the same on day 100 as on day 1.
+#
+#   with PriceStore(OUTPUT_DIR / "price_history.sqlite") as store:
+#       run = store.start_run("jumia")
+#       store.add(run, observations)
+#       store.finish_run(run)
+#       store.price_drops("jumia")        # cheaper than in the run before
+#       store.new_products("jumia")       # first seen in the latest run
+#       store.removed_products("jumia")   # seen in the run before, gone in the latest
+# "Latest" and "before" are the last two finished runs that recorded products, so a crashed or
+# empty scrape doesn't make every product look removed, and then new.
+
+DB_FILE = "price_history.sqlite"
+BATCH_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    products INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_by_source ON runs (source, run_id);
+
+CREATE TABLE IF NOT EXISTS products (
+    source TEXT NOT NULL,
+    product_key TEXT NOT NULL,
+    title TEXT,
+    url TEXT,
+    price REAL,
+    first_run INTEGER NOT NULL,
+    last_run INTEGER NOT NULL,
+    PRIMARY KEY (source, product_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS products_by_first_run ON products (source, first_run);
+CREATE INDEX IF NOT EXISTS products_by_last_run ON products (source, last_run);
+
+CREATE TABLE IF NOT EXISTS prices (
+    source TEXT NOT NULL,
+    product_key TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    observed_at TEXT NOT NULL,
+    price REAL,
+    old_price REAL,
+    PRIMARY KEY (source, product_key, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prices_by_run ON prices (source, run_id);
+CREATE INDEX IF NOT EXISTS prices_by_time ON prices (source, observed_at);
+"""
+
+UPSERT_PRODUCT = """
+INSERT INTO products (source, product_key, title, url, price, first_run, last_run)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (source, product_key) DO UPDATE SET
+    title = excluded.title, url = COALESCE(excluded.url, url), price = excluded.price, last_run = excluded.last_run
+"""
+
+UPSERT_PRICE = """
+INSERT INTO prices (source, product_key, run_id, observed_at, price, old_price)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (source, product_key, run_id) DO UPDATE SET
+    observed_at = excluded.observed_at, price = excluded.price, old_price = excluded.old_price
+"""
+
+def parse_price(text: Any) -> Optional[float]:
+    """"KSh 1,299" -> 1299.0, "£51.77" -> 51.77; the first number of a range; None if there is none"""
+    if isinstance(text, (int, float)):
+        return float(text)
+    cents = parse_cents(text)  # the one price-text parser, shared with records.Product
+    return cents / 100 if cents is not None else None
+
+class Observation(NamedTuple):
+    """One product as seen in one run"""
+    key: str  # stable per product, e.g. dedupe.product_id or the product URL
+    title: str
+    price: Optional[float | str]
+    url: Optional[str] = None
+    old_price: Optional[float | str] = None
+
+class PriceChange(NamedTuple):
+    key: str
+    title: str
+    old_price: float
+    new_price: float
+
+    @property
+    def change(self) -> float:
+        """Relative change, e.g. -0.25 for a 25% drop"""
+        return (self.new_price - self.old_price) / self.old_price if self.old_price else 0.0
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class PriceStore:
+    """Products and their price in every run, in one SQLite file"""
+
+    def __init__(self, path: Path | str, batch_size: int = BATCH_SIZE) -> None:
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self._db = sqlite3.connect(str(path), isolation_level=None)  # transactions are explicit
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def start_run(self, source: str, started_at: Optional[str] = None) -> int:
+        """Open a run of `source`; returns its run_id"""
+        cursor = self._db.execute("INSERT INTO runs (source, started_at) VALUES (?, ?)", (source, started_at or _now()))
+        return cursor.lastrowid  # type: ignore
+
+    def _source(self, run_id: int) -> str:
+        row = self._db.execute("SELECT source FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"no run {run_id}")
+        return row[0]
+
+    def add(self, run_id: int, observations: Iterable[Observation], observed_at: Optional[str] = None) -> int:
+        """Upsert `observations` into run `run_id`, one transaction per batch; returns how many were written.
+
+        Prices may still be scraped text such as "KSh 1,299"; they are parsed with parse_price.
+        """
+        source = self._source(run_id)
+        observed_at = observed_at or _now()
+        written = 0
+        for batch in _batches(observations, self.batch_size):
+            batch = [Observation(*o) for o in batch]  # plain (key, title, price, ...) tuples work too
+            with self._transaction():
+                self._db.executemany(UPSERT_PRODUCT, [
+                    (source, o.key, o.title, o.url, parse_price(o.price), run_id, run_id) for o in batch
+                ])
+                self._db.executemany(UPSERT_PRICE, [
+                    (source, o.key, run_id, observed_at, parse_price(o.price), parse_price(o.old_price)) for o in batch
+                ])
+            written += len(batch)
+        return written
+
+    def finish_run(self, run_id: int) -> None:
+        with self._transaction():
+            self._db.execute(
+                "UPDATE runs SET finished_at = ?, products = (SELECT COUNT(*) FROM prices WHERE source = runs.source AND run_id = runs.run_id) WHERE run_id = ?",
+                (_now(), run_id),
+            )
+
+    def record_run(self, source: str, observations: Iterable[Observation]) -> int:
+        """start_run + add + finish_run in one call; returns the run_id"""
+        run_id = self.start_run(source)
+        self.add(run_id, observations)
+        self.finish_run(run_id)
+        return run_id
+
+    def runs(self, source: str) -> list[int]:
+        """run_ids of `source`, oldest first"""
+        return [row[0] for row in self._db.execute("SELECT run_id FROM runs WHERE source = ? ORDER BY run_id", (source,))]
+
+    def _latest_two(self, source: str) -> tuple[Optional[int], Optional[int]]:
+        """The last two finished runs that recorded products; open, crashed-early or empty runs are skipped"""
+        rows = self._db.execute(
+            "SELECT run_id FROM runs WHERE source = ? AND finished_at IS NOT NULL AND products > 0 ORDER BY run_id DESC LIMIT 2",
+            (source,),
+        ).fetchall()
+        latest = rows[0][0] if rows else None
+        previous = rows[1][0] if len(rows) > 1 else None
+        return latest, previous
+
+    def price_drops(self, source: str, min_drop: float = 0.0) -> list[PriceChange]:
+        """Products cheaper in the latest run than in the run before, biggest relative drop first.
+
+        `min_drop` is a fraction, e.g. 0.1 keeps only drops of at least 10%.
+        """
+        latest, previous = self._latest_two(source)
+        if previous is None:
+            return []
+        rows = self._db.execute(
+            """
+            SELECT new.product_key, products.title, old.price, new.price
+            FROM prices AS new
+            JOIN prices AS old ON old.source = new.source AND old.product_key = new.product_key AND old.run_id = ?
+            JOIN products ON products.source = new.source AND products.product_key = new.product_key
+            WHERE new.source = ? AND new.run_id = ? AND new.price < old.price AND new.price <= old.price * (1 - ?)
+            ORDER BY (old.price - new.price) / old.price DESC
+            """,
+            (previous, source, latest, min_drop),
+        )
+        return [PriceChange(*row) for row in rows]
+
+    def new_products(self, source: str) -> list[tuple[str, str]]:
+        """(key, title) of products first seen in the latest run"""
+        latest, previous = self._latest_two(source)
+        if previous is None:
+            return []  # on the first run everything is new; that isn't news
+        rows = self._db.execute(
+            "SELECT product_key, title FROM products WHERE source = ? AND first_run = ? ORDER BY product_key", (source, latest)
+        )
+        return rows.fetchall()
+
+    def removed_products(self, source: str) -> list[tuple[str, str]]:
+        """(key, title) of products seen in the run before the latest but not in the latest.
+
+        Only meaningful when both runs covered the same listings.
+        """
+        latest, previous = self._latest_two(source)
+        if previous is None:
+            return []
+        rows = self._db.execute(
+            "SELECT product_key, title FROM products WHERE source = ? AND last_run = ? ORDER BY product_key", (source, previous)
+        )
+        return rows.fetchall()
+
+    def history(self, source: str, key: str) -> list[tuple[str, Optional[float]]]:
+        """(observed_at, price) of one product, oldest first"""
+        rows = self._db.execute(
+            "SELECT observed_at, price FROM prices WHERE source = ? AND product_key = ? ORDER BY run_id", (source, key)
+        )
+        return rows.fetchall()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """BEGIN ... COMMIT, or ROLLBACK if the block raises"""
+        self._db.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "PriceStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class HistorySink:
+    """Wraps a sink (see sinks.py) and records every written page as observations of run `run_id`"""
+
+    def __init__(self, sink: Any, store: PriceStore, run_id: int, observation: Callable[[Any], Observation]) -> None:
+        self.sink = sink
+        self.store = store
+        self.run_id = run_id
+        self.observation = observation
+
+    @property
+    def rows_written(self) -> int:
+        return self.sink.rows_written
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.sink, name)  # e.g. ListSink.rows, DedupeSink.skipped
+
+    def write_rows(self, rows: Iterable[Any]) -> int:
+        rows = list(rows)
+        written = self.sink.write_rows(rows)
+        self.store.add(self.run_id, (self.observation(row) for row in rows))
+        return written
+
+    def close(self) -> None:
+        self.sink.close()
+        self.store.finish_run(self.run_id)
+
+    def __enter__(self) -> "HistorySink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,129 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+# -- Token bucket rate limiting: https://en.wikipedia.org/wiki/Token_bucket
+# A bucket holds up to `burst` tokens and refills at `rate` tokens per second.
+# Each request takes one token; when the bucket is empty the caller waits for the next one.
+# Over any window of T seconds at most `burst + rate * T` requests get through,
+# which is what lets us run right up to a site's published budget without going over.
+
+class TokenBucket:
+    """Token bucket that can be shared by threads, async tasks and worker processes.
+
+    With `shared=True` the bucket state lives in shared memory, so a bucket created
+    in the parent and handed to `multiprocessing.Process`/`Pool(initializer=...)`
+    draws from one budget in every worker. time.monotonic() is system-wide on
+    Linux/macOS/Windows, so timestamps written by one process are valid in another.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, shared: bool = False) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.shared = shared
+        if shared:
+            self._lock = multiprocessing.Lock()
+            self._state = multiprocessing.RawArray("d", [float(burst), time.monotonic()])
+        else:
+            self._lock = threading.Lock()
+            self._state = [float(burst), time.monotonic()]  # [tokens, last refill]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        if not self.shared:
+            del state["_lock"]  # a pickled private bucket becomes an independent copy
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if not self.shared:
+            self._lock = threading.Lock()
+
+    @classmethod
+    def from_rpm(cls, rpm: float, burst: int = 1, shared: bool = False) -> "TokenBucket":
+        """Bucket that never lets more than `rpm` requests through in any 60-second window, burst included"""
+        if rpm <= burst:
+            raise ValueError(f"rpm ({rpm}) must be larger than burst ({burst})")
+        return cls(rate=(rpm - burst) / 60, burst=burst, shared=shared)
+
+    def reserve(self, tokens: int = 1) -> float:
+        """Take `tokens` now and return how long the caller must wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            available = min(self.burst, self._state[0] + (now - self._state[1]) * self.rate)
+            self._state[0] = available - tokens  # may go negative: the debt is paid off by waiting
+            self._state[1] = now
+            debt = -self._state[0]
+        return max(0.0, debt / self.rate)
+
+    def acquire(self, tokens: int = 1) -> float:
+        """Block until `tokens` are available (threads, processes); returns the time waited"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 1) -> float:
+        """Await until `tokens` are available without blocking the event loop"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+class RateScheduler:
+    """Per-host request budgets; every scraper asks it for permission before each request.
+
+    Hosts given to `add_host` get their own bucket. Any other host gets a bucket
+    built from the default budget the first time it is seen. For budgets shared
+    across processes, declare the hosts before starting the workers.
+    """
+
+    def __init__(self, default_rpm: Optional[float] = None, default_burst: int = 1, shared: bool = False) -> None:
+        self.default_rpm = default_rpm
+        self.default_burst = default_burst
+        self.shared = shared
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]  # thread locks can't be pickled; each process gets its own
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_host(self, host: str, rpm: float, burst: int = 1) -> TokenBucket:
+        """Give `host` its own budget of `rpm` requests per minute"""
+        bucket = TokenBucket.from_rpm(rpm, burst=burst, shared=self.shared)
+        with self._lock:
+            self._buckets[host] = bucket
+        return bucket
+
+    def bucket_for(self, url: str) -> Optional[TokenBucket]:
+        """Bucket governing `url`, or None when the host has no budget"""
+        host = urlsplit(url).hostname or url
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None and self.default_rpm is not None:
+                bucket = TokenBucket.from_rpm(self.default_rpm, burst=self.default_burst, shared=self.shared)
+                self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, url: str) -> float:
+        """Wait for a request slot for `url`; returns the time waited"""
+        bucket = self.bucket_for(url)
+        return bucket.acquire() if bucket else 0.0
+
+    async def acquire_async(self, url: str) -> float:
+        """Async version of acquire"""
+        bucket = self.bucket_for(url)
+        return await bucket.acquire_async() if bucket else 0.0
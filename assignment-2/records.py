@@ -0,0 +1,215 @@
+import re
+import sys
+from array import array
+from enum import Enum
+from typing import Any, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+# -- Typed product records
+# parse_appliance_page returns every field as scraped text ("KSh 1000", "-23%", "4.5", "12").
+# The scraper turns each card into a Product while parsing (jumia_scraper.parse_products), so
+# the values are parsed once, in the parse stage, and everything downstream reads them typed:
+#   prices in integer cents (no float rounding), discount in whole percent, rating as a
+#   float, review count as an int, shipping as a Shipping member
+# The price store takes the numbers as they are; the CSV / JSON sinks get Product.to_row()
+# text through RowSink. Product is a NamedTuple, so a record is one tuple with no per-instance
+# __dict__. ProductColumns goes further for large batches: one typed array per numeric column
+# (https://docs.python.org/3/library/array.html) and product IDs as 64-bit ints, so a
+# product costs a few dozen bytes plus its title instead of ten Python objects.
+#
+#   products = parse_products(html)                 # or Product.from_row(row) per text row
+#   columns = ProductColumns(products)
+#   columns[0].price                                # KSh, or None if the card had no price
+
+MISSING = -1  # stored in integer columns for "not on the card"
+
+_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+class Shipping(Enum):
+    STANDARD = ""
+    EXPRESS = "Express"  # the card shows Jumia Express' icon
+
+_SHIPPING = list(Shipping)  # code <-> member, for ProductColumns
+
+def _number(text: str) -> Optional[str]:
+    match = _NUMBER.search(text or "")
+    return match.group().replace(",", "") if match else None
+
+def parse_cents(text: str) -> Optional[int]:
+    """"KSh 1,299.50" -> 129950; the lower bound of a range such as "KSh 1,000 - KSh 2,000"; None if empty"""
+    number = _number(text)
+    if number is None:
+        return None
+    whole, _, fraction = number.partition(".")
+    return int(whole) * 100 + int((fraction + "00")[:2])
+
+def parse_price_range(text: str) -> tuple[Optional[int], Optional[int]]:
+    """"KSh 1,000 - KSh 2,000" -> (100000, 200000); a single price has no upper bound"""
+    low, _, high = (text or "").partition(" - ")
+    return parse_cents(low), parse_cents(high) if high else None
+
+def parse_percent(text: str) -> Optional[int]:
+    """"-23%" -> 23; None if empty"""
+    number = _number(text)
+    return round(float(number)) if number is not None else None
+
+def parse_rating(text: str) -> Optional[float]:
+    """"4.5" or "4.5 out of 5" -> 4.5; None if empty"""
+    number = _number(text)
+    return float(number) if number is not None else None
+
+def parse_count(text: str) -> int:
+    """"12", "(12)" or "1,204" -> the number; 0 if empty"""
+    number = _number(text)
+    return int(float(number)) if number is not None else 0
+
+def _money(cents: Optional[int]) -> str:
+    if cents is None:
+        return ""
+    return f"KSh {cents // 100}" if cents % 100 == 0 else f"KSh {cents / 100:.2f}"
+
+class Product(NamedTuple):
+    """One Jumia product card with its values parsed"""
+    product_id: str
+    title: str
+    price_cents: Optional[int]  # None when the card's price can't be read
+    old_price_cents: Optional[int] = None
+    discount_percent: Optional[int] = None
+    badge: str = ""
+    rating: Optional[float] = None
+    reviews: int = 0
+    shipping: Shipping = Shipping.STANDARD
+    price_max_cents: Optional[int] = None  # upper end of a price range ("KSh 1,000 - KSh 2,000")
+
+    @property
+    def price(self) -> Optional[float]:
+        """Price in KSh"""
+        return self.price_cents / 100 if self.price_cents is not None else None
+
+    @property
+    def old_price(self) -> Optional[float]:
+        return self.old_price_cents / 100 if self.old_price_cents is not None else None
+
+    @classmethod
+    def from_row(cls, row: Sequence[str]) -> "Product":
+        """Parse one parse_appliance_page row (see jumia_scraper.HEADERS)"""
+        pid, title, price, old_price, discount, badge, rating, reviews, shipping = row
+        price_cents, price_max_cents = parse_price_range(price)
+        return cls(
+            product_id=pid,
+            title=title,
+            price_cents=price_cents,
+            old_price_cents=parse_cents(old_price),
+            discount_percent=parse_percent(discount),
+            badge=badge,
+            rating=parse_rating(rating),
+            reviews=parse_count(reviews),
+            shipping=Shipping(shipping) if shipping in Shipping._value2member_map_ else Shipping.STANDARD,
+            price_max_cents=price_max_cents,
+        )
+
+    def to_row(self) -> list[str]:
+        """Back to the scraped-text layout of HEADERS, e.g. for CsvSink"""
+        return [
+            self.product_id,
+            self.title,
+            _money(self.price_cents) + (f" - {_money(self.price_max_cents)}" if self.price_max_cents is not None else ""),
+            _money(self.old_price_cents),
+            f"-{self.discount_percent}%" if self.discount_percent is not None else "",
+            self.badge,
+            f"{self.rating:g}" if self.rating is not None else "",
+            str(self.reviews) if self.reviews else "",
+            self.shipping.value,
+        ]
+
+class ProductColumns:
+    """Column-oriented batch of Products: typed arrays for the numbers, lists for the text"""
+
+    def __init__(self, products: Iterable[Product] = ()) -> None:
+        self.ids = array("Q")  # 16-hex-digit product IDs as unsigned 64-bit ints
+        self.titles: list[str] = []
+        self.price_cents = array("q")  # MISSING when the price can't be read
+        self.old_price_cents = array("q")  # MISSING when there is no old price
+        self.discount_percent = array("h")  # MISSING when there is no discount
+        self.badges: list[str] = []  # few distinct values; interned, so each is stored once
+        self.ratings = array("d")  # NaN when there is no rating
+        self.reviews = array("l")
+        self.shipping = array("B")  # index into Shipping
+        self.price_max_cents = array("q")  # MISSING unless the price is a range
+        self.extend(products)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[str]]) -> "ProductColumns":
+        """Parse parse_appliance_page rows straight into columns"""
+        return cls(Product.from_row(row) for row in rows)
+
+    def append(self, product: Product) -> None:
+        self.ids.append(int(product.product_id, 16))
+        self.titles.append(product.title)
+        self.price_cents.append(MISSING if product.price_cents is None else product.price_cents)
+        self.old_price_cents.append(MISSING if product.old_price_cents is None else product.old_price_cents)
+        self.discount_percent.append(MISSING if product.discount_percent is None else product.discount_percent)
+        self.badges.append(sys.intern(product.badge))
+        self.ratings.append(float("nan") if product.rating is None else product.rating)
+        self.reviews.append(product.reviews)
+        self.shipping.append(_SHIPPING.index(product.shipping))
+        self.price_max_cents.append(MISSING if product.price_max_cents is None else product.price_max_cents)
+
+    def extend(self, products: Iterable[Product]) -> None:
+        for product in products:
+            self.append(product)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> Product:
+        price, old_price = self.price_cents[i], self.old_price_cents[i]
+        discount, rating, price_max = self.discount_percent[i], self.ratings[i], self.price_max_cents[i]
+        return Product(
+            product_id=f"{self.ids[i]:016X}",
+            title=self.titles[i],
+            price_cents=None if price == MISSING else price,
+            old_price_cents=None if old_price == MISSING else old_price,
+            discount_percent=None if discount == MISSING else discount,
+            badge=self.badges[i],
+            rating=None if rating != rating else rating,  # NaN != NaN
+            reviews=self.reviews[i],
+            shipping=_SHIPPING[self.shipping[i]],
+            price_max_cents=None if price_max == MISSING else price_max,
+        )
+
+    def __iter__(self) -> Iterator[Product]:
+        return (self[i] for i in range(len(self)))
+
+    def to_rows(self) -> list[list[str]]:
+        return [product.to_row() for product in self]
+
+    def nbytes(self) -> int:
+        """Bytes held by the numeric columns (the title strings come on top)"""
+        columns: list[Any] = [self.ids, self.price_cents, self.old_price_cents, self.discount_percent,
+                              self.ratings, self.reviews, self.shipping, self.price_max_cents]
+        return sum(column.itemsize * len(column) for column in columns)
+
+class RowSink:
+    """Wraps a text sink (see sinks.py) and writes each Product as its scraped-text row (Product.to_row)"""
+
+    def __init__(self, sink: Any) -> None:
+        self.sink = sink
+
+    @property
+    def rows_written(self) -> int:
+        return self.sink.rows_written
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.sink, name)  # e.g. ListSink.rows
+
+    def write_rows(self, products: Iterable[Product]) -> int:
+        return self.sink.write_rows([product.to_row() for product in products])
+
+    def close(self) -> None:
+        self.sink.close()
+
+    def __enter__(self) -> "RowSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
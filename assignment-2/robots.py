@@ -0,0 +1,178 @@
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+
+# -- robots.txt matching, as specified in RFC 9309: https://www.rfc-editor.org/rfc/rfc9309
+# Rules match the start of a URL's path + query. `*` matches any run of characters and a
+# trailing `$` anchors the end. When both an Allow and a Disallow rule match, the longest
+# rule wins; Allow wins a tie.
+#
+# jumia.robots.txt has ~160 Disallow rules, and checking each one in turn for every
+# discovered URL gets slow at crawl volume. Most rules are one of two shapes:
+#   - a plain prefix, e.g. "/mobapi/"
+#   - "/*" or "*" followed by plain text, e.g. "/*ac_design=", i.e. "contains the text"
+# Each shape is compiled into one regex whose alternatives share prefixes (built from a
+# character trie), so a URL is checked against all rules of that shape in a single pass.
+# The few rules with wildcards in the middle go into one combined regex of their own.
+
+ROBOTS_FILE: Path = Path(__file__).parent / "jumia.robots.txt"
+
+# scheme://host is dropped, the fragment is cut off, path + query remain.
+# A regex is several times faster than urllib.parse.urlsplit here, which matters at millions of URLs.
+_URL_TARGET = re.compile(r"(?:[A-Za-z][A-Za-z0-9+.-]*://[^/?#]*)?([^#]*)")
+
+def _pattern_to_regex(pattern: str) -> str:
+    """Translate one robots.txt path pattern into an anchored-at-start regex"""
+    anchored = pattern.endswith("$")
+    if anchored:
+        pattern = pattern[:-1]
+    regex = ".*".join(re.escape(part) for part in pattern.split("*"))
+    return regex + ("$" if anchored else "")
+
+def _trie_regex(literals: Iterable[str]) -> str:
+    """One regex matching any of `literals`, with shared prefixes factored out.
+
+    e.g. ["capacity=", "capacity_kg=", "car_scent="] -> "ca(?:pacity(?:=|_kg=)|r_scent=)"
+    """
+    trie: dict = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of a literal
+
+    def build(node: dict) -> str:
+        if "" in node and len(node) == 1:
+            return ""
+        branches = []
+        optional = False
+        for char in sorted(node):
+            if char == "":
+                optional = True  # a literal ends here; shorter matches are enough
+                continue
+            branches.append(re.escape(char) + build(node[char]))
+        if optional:
+            return ""  # the shorter literal already matches whatever follows
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+class _RuleSet:
+    """All rules of one kind (Allow or Disallow), compiled for fast matching"""
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.patterns = patterns
+        self.regexes = [re.compile(_pattern_to_regex(p)) for p in patterns]
+
+        prefixes: list[str] = []  # "/mobapi/"
+        contains: list[str] = []  # "*--*", i.e. "--" anywhere
+        contains_after_root: list[str] = []  # "/*ac_design=", i.e. "ac_design=" anywhere after the leading "/"
+        generic: list[str] = []  # everything else, e.g. "/*/*/*/"
+        for pattern in patterns:
+            body = pattern.rstrip("*") or "*"
+            if "$" in body:
+                generic.append(pattern)
+            elif "*" not in body:
+                prefixes.append(body)
+            elif body.startswith("/*") and "*" not in body[2:]:
+                contains_after_root.append(body[2:])
+            elif body.startswith("*") and "*" not in body[1:]:
+                contains.append(body[1:])
+            else:
+                generic.append(pattern)
+
+        self._prefix = re.compile(_trie_regex(prefixes)) if prefixes else None
+        self._contains = re.compile(_trie_regex(contains)) if contains else None
+        self._contains_after_root = re.compile(_trie_regex(contains_after_root)) if contains_after_root else None
+        self._generic = re.compile("|".join(f"(?:{_pattern_to_regex(p)})" for p in generic)) if generic else None
+
+    def any_match(self, target: str) -> bool:
+        """Whether any rule matches; one regex call per rule shape"""
+        return bool(
+            (self._prefix and self._prefix.match(target))
+            or (self._contains and self._contains.search(target))
+            or (self._contains_after_root and target.startswith("/") and self._contains_after_root.search(target, 1))
+            or (self._generic and self._generic.match(target))
+        )
+
+    def longest_match(self, target: str) -> int:
+        """Length of the longest matching rule, -1 if none; checks rules one by one"""
+        return max((len(p) for p, regex in zip(self.patterns, self.regexes) if regex.match(target)), default=-1)
+
+class RobotsRules:
+    """Allow/Disallow rules for one user agent, parsed once and compiled for allowed(url) checks"""
+
+    def __init__(self, allow: list[str], disallow: list[str], sitemaps: Optional[list[str]] = None) -> None:
+        self.sitemaps = sitemaps or []
+        self._allow = _RuleSet(allow)
+        self._disallow = _RuleSet(disallow)
+
+    @classmethod
+    def parse(cls, text: str, user_agent: str = "*") -> "RobotsRules":
+        """Parse robots.txt text, keeping the groups that apply to `user_agent`.
+
+        Groups naming the agent win over `*` groups; repeated groups for the same
+        agent are merged, as jumia.robots.txt repeats `User-agent: *` several times.
+        """
+        agent = user_agent.lower()
+        groups: dict[str, tuple[list[str], list[str]]] = {}
+        sitemaps: list[str] = []
+        current: list[str] = []  # agents of the group being read
+        in_rules = False
+
+        for raw_line in text.splitlines():
+            line = raw_line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            field, value = (part.strip() for part in line.split(":", 1))
+            field = field.lower()
+
+            if field == "sitemap":
+                sitemaps.append(value)
+            elif field == "user-agent":
+                if in_rules:  # a User-agent line after rules starts a new group
+                    current, in_rules = [], False
+                current.append(value.lower())
+            elif field in ("allow", "disallow"):
+                in_rules = True
+                if not value:  # "Disallow:" with no path allows everything
+                    continue
+                for name in current or ["*"]:
+                    allow, disallow = groups.setdefault(name, ([], []))
+                    (allow if field == "allow" else disallow).append(value)
+
+        matched = next((name for name in groups if name != "*" and name in agent), "*")
+        allow, disallow = groups.get(matched, ([], []))
+        return cls(allow, disallow, sitemaps)
+
+    @classmethod
+    def from_file(cls, path: Path | str = ROBOTS_FILE, user_agent: str = "*") -> "RobotsRules":
+        """Parse a robots.txt file saved on disk, e.g. jumia.robots.txt"""
+        return cls.parse(Path(path).read_text(encoding="utf-8"), user_agent)
+
+    @staticmethod
+    def _target(url: str) -> str:
+        """The part of a URL robots rules match against: path plus query, no fragment"""
+        target = _URL_TARGET.match(url).group(1) # type: ignore
+        return target if target.startswith("/") else "/" + target
+
+    def allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch `url`"""
+        target = self._target(url)
+        if not self._disallow.any_match(target):
+            return True  # the common case: one pass over the combined rules
+        if not self._allow.any_match(target):
+            return False
+        # Both kinds match (rare): the longest rule decides
+        return self._allow.longest_match(target) >= self._disallow.longest_match(target)
+
+    def allowed_naive(self, url: str) -> bool:
+        """Reference implementation: test every rule one by one; used by tests and benchmarks"""
+        target = self._target(url)
+        return self._allow.longest_match(target) >= self._disallow.longest_match(target)
+
+    def filter(self, urls: Iterable[str]) -> Iterable[str]:
+        """Lazily yield only the allowed URLs"""
+        return (url for url in urls if self.allowed(url))
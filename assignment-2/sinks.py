@@ -0,0 +1,148 @@
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+# -- Streaming output: rows are appended and flushed as each page is parsed,
+# instead of being collected in a list and written once the crawl ends.
+# Memory stays flat however many pages are scraped, a crash only loses the page
+# in progress, and the files can be read (e.g. `tail -f`, pd.read_csv) mid-run.
+# JSON Lines (https://jsonlines.org/) is one JSON object per line, so like CSV
+# it can be appended to and read back row by row.
+
+Row = Sequence[Any] | dict[str, Any]
+
+class _FileSink(ABC):
+    """Shared open/flush/close handling; subclasses format the rows"""
+
+    def __init__(self, path: Path | str, headers: Sequence[str], append: bool = False, fsync: bool = False) -> None:
+        self.path = Path(path)
+        self.headers = list(headers)
+        self.fsync = fsync
+        self.rows_written = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not append or not self.path.exists() or self.path.stat().st_size == 0
+        self._file = open(self.path, mode="a" if append else "w", newline="", encoding="utf-8")
+        if is_new:
+            self._start()
+            self.flush()
+
+    def _start(self) -> None:
+        """Write whatever a new file begins with"""
+
+    @abstractmethod
+    def _write(self, rows: list[Row]) -> None:
+        """Format `rows` into the open file"""
+
+    def write_rows(self, rows: Iterable[Row]) -> int:
+        """Append one page of rows and flush them to disk; returns how many were written"""
+        rows = list(rows)
+        self._write(rows)
+        self.flush()
+        self.rows_written += len(rows)
+        return len(rows)
+
+    def flush(self) -> None:
+        self._file.flush()
+        if self.fsync:  # survive a machine crash too, not only a process crash
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "_FileSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class CsvSink(_FileSink):
+    """CSV file with a header row; rows are lists in header order or dicts keyed by header"""
+
+    def _start(self) -> None:
+        csv.writer(self._file).writerow(self.headers)
+
+    def _write(self, rows: list[Row]) -> None:
+        writer = csv.writer(self._file)
+        writer.writerows([row[h] for h in self.headers] if isinstance(row, dict) else row for row in rows)
+
+class JsonlSink(_FileSink):
+    """JSON Lines file: one {header: value} object per row"""
+
+    def _write(self, rows: list[Row]) -> None:
+        self._file.writelines(
+            json.dumps(row if isinstance(row, dict) else dict(zip(self.headers, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+class ListSink:
+    """Keeps rows in memory, for callers that want the whole result as a list"""
+
+    def __init__(self) -> None:
+        self.rows: list[Row] = []
+
+    @property
+    def rows_written(self) -> int:
+        return len(self.rows)
+
+    def write_rows(self, rows: Iterable[Row]) -> int:
+        rows = list(rows)
+        self.rows.extend(rows)
+        return len(rows)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "ListSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class TeeSink:
+    """Writes every page to several sinks, e.g. CSV and JSON Lines side by side"""
+
+    def __init__(self, *sinks: _FileSink) -> None:
+        self.sinks = sinks
+
+    @property
+    def rows_written(self) -> int:
+        return self.sinks[0].rows_written if self.sinks else 0
+
+    def write_rows(self, rows: Iterable[Row]) -> int:
+        rows = list(rows)
+        for sink in self.sinks:
+            sink.write_rows(rows)
+        return len(rows)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self) -> "TeeSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def open_sink(path: Path | str, headers: Sequence[str], fmt: Optional[str] = None, append: bool = False) -> _FileSink:
+    """CsvSink or JsonlSink, picked by `fmt` or else by the file extension"""
+    fmt = fmt or Path(path).suffix.lstrip(".").lower()
+    if fmt == "csv":
+        return CsvSink(path, headers, append=append)
+    if fmt in ("jsonl", "ndjson"):
+        return JsonlSink(path, headers, append=append)
+    raise ValueError(f"Unsupported sink format {fmt!r}; use 'csv' or 'jsonl'")
+
+def read_jsonl(path: Path | str) -> Iterable[dict[str, Any]]:
+    """Lazily read rows back from a JSON Lines file, skipping a half-written last line"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue  # e.g. the process was killed mid-write
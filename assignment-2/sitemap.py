@@ -0,0 +1,143 @@
+import argparse
+import zlib
+from pathlib import Path
+from typing import Any, Iterator, Optional
+from urllib.parse import urljoin
+from xml.etree.ElementTree import Element, XMLPullParser
+
+import httpx
+
+from robots import RobotsRules
+
+# -- Sitemap discovery: https://www.sitemaps.org/protocol.html
+# jumia.robots.txt advertises `Sitemap: https://static.jumia.co.ke/index-sitemap.xml`, a
+# sitemap index whose <sitemap><loc> entries point at child sitemaps (often .xml.gz), which
+# in turn list page URLs in <url><loc>. A large site's sitemaps hold millions of URLs, so
+# nothing here loads a whole file: bytes are streamed in chunks (from disk or over HTTP),
+# gunzipped incrementally when they start with the gzip magic bytes (every member of a
+# multi-member .gz, e.g. concatenated files), and fed to an XMLPullParser. Each entry is dropped
+# from the tree as soon as its <loc> is read, so memory stays flat however long the file is.
+# Child sitemaps are walked depth first and URLs are yielded lazily, filtered through robots.txt.
+# An index's child locations (at most 50,000 per the protocol) are read to the end before the
+# first child is fetched, so only one HTTP stream is open at a time.
+#
+#   robots = RobotsRules.from_file()
+#   for url in iter_urls(robots.sitemaps[0], robots=robots):
+#       ...
+
+CHUNK_SIZE = 64 * 1024
+MAX_DEPTH = 3  # index -> child index -> urlset is as deep as real sites go
+USER_AGENT = "ScraperBotbyLisaDennisandWayne"
+GZIP_MAGIC = b"\x1f\x8b"
+
+def _is_url(location: str) -> bool:
+    return location.startswith(("http://", "https://"))
+
+def read_chunks(location: str, scheduler: Any = None) -> Iterator[bytes]:
+    """Raw bytes of a sitemap, chunk by chunk, from a URL or a local path"""
+    if not _is_url(location):
+        with open(location.removeprefix("file://"), "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+        return
+    if scheduler is not None:
+        scheduler.acquire(location)
+    with httpx.stream("GET", location, headers={"User-Agent": USER_AGENT}, timeout=30, follow_redirects=True) as response:
+        response.raise_for_status()
+        yield from response.iter_bytes(CHUNK_SIZE)
+
+def _decompressed(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Pass chunks through, gunzipping on the fly if the stream is gzip"""
+    inflater = None
+    for chunk in chunks:
+        if inflater is None:
+            inflater = zlib.decompressobj(wbits=31) if chunk.startswith(GZIP_MAGIC) else False
+        if not inflater:
+            yield chunk
+            continue
+        while chunk:  # a small compressed chunk can inflate a lot; hand it on in CHUNK_SIZE pieces
+            yield inflater.decompress(chunk, CHUNK_SIZE)
+            if inflater.eof:  # end of one gzip member; the bytes after it start the next one
+                chunk = inflater.unused_data
+                inflater = zlib.decompressobj(wbits=31)
+            else:
+                chunk = inflater.unconsumed_tail
+    if inflater:
+        yield inflater.flush()
+
+def _local_name(tag: str) -> str:
+    """"{http://www.sitemaps.org/schemas/sitemap/0.9}loc" -> "loc" """
+    return tag.rsplit("}", 1)[-1]
+
+def iter_entries(location: str, scheduler: Any = None) -> Iterator[tuple[str, str]]:
+    """("sitemap", loc) for each child of a sitemap index, ("url", loc) for each page of a urlset"""
+    parser = XMLPullParser(events=("start", "end"))
+    root: Optional[Element] = None
+    for chunk in _decompressed(read_chunks(location, scheduler)):
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            kind = _local_name(elem.tag)
+            if kind not in ("url", "sitemap"):
+                continue
+            loc = next((child.text for child in elem if _local_name(child.tag) == "loc"), None)
+            if loc and loc.strip():
+                yield kind, loc.strip()
+            root.clear()  # type: ignore # drop finished entries; keeps memory constant
+    parser.close()
+
+def _resolve(parent: str, loc: str) -> str:
+    """Child sitemap location; relative locations are taken relative to the parent sitemap"""
+    if _is_url(loc) or _is_url(parent):
+        return urljoin(parent, loc)
+    return loc if Path(loc).is_absolute() else str(Path(parent).parent / loc)
+
+def iter_urls(location: str, robots: Optional[RobotsRules] = None, scheduler: Any = None, max_depth: int = MAX_DEPTH) -> Iterator[str]:
+    """Every page URL listed under a sitemap or sitemap index, lazily, skipping URLs robots.txt disallows"""
+    visited: set[str] = set()
+
+    def walk(sitemap: str, depth: int) -> Iterator[str]:
+        if sitemap in visited or depth > max_depth:
+            return
+        visited.add(sitemap)
+        children = []  # fetched once this sitemap's stream is closed
+        for kind, loc in iter_entries(sitemap, scheduler):
+            if kind == "sitemap":
+                children.append(_resolve(sitemap, loc))
+            elif robots is None or robots.allowed(loc):
+                yield loc
+        for child in children:
+            yield from walk(child, depth + 1)
+
+    yield from walk(location, 0)
+
+def discover(robots: Optional[RobotsRules] = None, scheduler: Any = None) -> Iterator[str]:
+    """Page URLs from every sitemap robots.txt advertises (jumia.robots.txt by default)"""
+    robots = robots or RobotsRules.from_file()
+    for sitemap in robots.sitemaps:
+        yield from iter_urls(sitemap, robots, scheduler)
+
+if __name__ == "__main__":
+    from rate_limiter import RateScheduler
+
+    arg_parser = argparse.ArgumentParser(description="List page URLs from the sitemaps in jumia.robots.txt")
+    arg_parser.add_argument("--sitemap", help="start from this sitemap (URL or path) instead")
+    arg_parser.add_argument("--limit", type=int, help="stop after this many URLs")
+    arg_parser.add_argument("--output", type=Path, default=Path(__file__).parent / "output" / "jumia_sitemap_urls.txt")
+    args = arg_parser.parse_args()
+
+    rules = RobotsRules.from_file()
+    scheduler = RateScheduler(default_rpm=60)
+    urls = iter_urls(args.sitemap, rules, scheduler) if args.sitemap else discover(rules, scheduler)
+    args.output.parent.mkdir(exist_ok=True)
+    count = 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        for url in urls:
+            f.write(url + "\n")
+            count += 1
+            if args.limit and count >= args.limit:
+                break
+    print(f"✅ Wrote {count} URLs to {args.output}")
@@ -0,0 +1,263 @@
+# test_adaptive.py
+import asyncio
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+import webscraper_io
+from adaptive import (
+    CAPTCHA,
+    RATE_LIMITED,
+    TIMEOUT,
+    AimdController,
+    Throttled,
+    backoff_delay,
+    block_reason,
+    call_with_retries,
+    check_html,
+    classify,
+    parse_retry_after,
+)
+
+class TestSignals:
+    """Test recognising slow-down signals"""
+
+    def test_parse_retry_after(self) -> None:
+        """Test both Retry-After forms, and garbage"""
+        in_a_minute = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+
+        assert parse_retry_after("120") == 120
+        assert parse_retry_after(in_a_minute) == pytest.approx(60, abs=2)
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_block_pages(self) -> None:
+        """Test that CAPTCHA and rate-limit interstitials are told apart from listings"""
+        assert block_reason("<html><head><title>Attention Required! | Cloudflare</title></head></html>") == CAPTCHA
+        assert block_reason("<html><head><title>429 Too Many Requests</title></head></html>") == RATE_LIMITED
+        assert block_reason('<html><form id="challenge-form" action="/?__cf_chl_f_tk=x" class="cf-chl-form"></form></html>') == CAPTCHA
+        assert block_reason("<html><head><title>Home Appliances | Jumia</title></head></html>") is None
+
+    def test_cloudflare_script_on_a_normal_page(self) -> None:
+        """Test that the challenge-platform script Cloudflare adds to every page isn't taken for a CAPTCHA"""
+        page = ('<html><head><title>Home Appliances | Jumia</title>'
+                '<script src="/cdn-cgi/challenge-platform/scripts/jsd/main.js"></script></head>'
+                '<body><article class="prd _fb col c-prd"></article></body></html>')
+
+        assert block_reason(page) is None
+        check_html(page)  # no Throttled
+
+    def test_classify(self) -> None:
+        """Test that 429s and timeouts are retryable, a 404 and other errors are not"""
+        too_many = httpx.Response(429, headers={"Retry-After": "7"}, request=httpx.Request("GET", "https://x/"))
+        not_found = httpx.Response(404, request=httpx.Request("GET", "https://x/"))
+
+        signal = classify(httpx.HTTPStatusError("429", request=too_many.request, response=too_many))
+        assert (signal.reason, signal.retry_after) == (RATE_LIMITED, 7)  # type: ignore
+        assert classify(httpx.ReadTimeout("slow")).reason == TIMEOUT  # type: ignore
+        assert classify(httpx.HTTPStatusError("404", request=not_found.request, response=not_found)) is None
+        assert classify(Exception("Connection error")) is None
+
+    def test_backoff_is_jittered_and_bounded(self) -> None:
+        """Test that delays stay within the exponential cap but honour Retry-After"""
+        delays = [backoff_delay(3, base=1, cap=5) for _ in range(200)]
+
+        assert all(0 <= delay <= 5 for delay in delays)
+        assert len(set(delays)) > 100
+        assert backoff_delay(0, retry_after=30) >= 30
+
+class TestAimdController:
+    """Test the AimdController class"""
+
+    def test_slow_start_then_additive_increase(self) -> None:
+        """Test that the limit doubles per round until the first cut, then grows by ~1 per round"""
+        controller = AimdController(initial=1, maximum=32, cooldown=0)
+        for _ in range(7):
+            controller.on_success()
+        assert controller.limit == 8
+
+        controller.on_throttle()
+        assert controller.limit == 4
+        for _ in range(4):  # one round at limit 4
+            controller.on_success()
+        assert controller.limit == 4  # just short of one full round
+        for _ in range(4):
+            controller.on_success()
+        assert controller.limit == 5
+
+    def test_one_cut_per_cooldown(self) -> None:
+        """Test that many failures from the same burst halve the limit only once"""
+        controller = AimdController(initial=8, maximum=8, cooldown=10)
+
+        for _ in range(5):
+            controller.on_throttle()
+
+        assert controller.limit == 4
+        assert controller.throttles == 5
+
+    def test_never_below_minimum_or_above_maximum(self) -> None:
+        """Test the bounds"""
+        controller = AimdController(initial=2, minimum=2, maximum=3, cooldown=0)
+        for _ in range(10):
+            controller.on_throttle()
+        assert controller.limit == 2
+        for _ in range(50):
+            controller.on_success()
+        assert controller.limit == 3
+
+    def test_retry_after_pauses(self) -> None:
+        """Test that Retry-After pauses everyone for that long"""
+        controller = AimdController()
+
+        controller.on_throttle(Throttled(RATE_LIMITED, retry_after=30))
+
+        assert controller.pause_remaining() == pytest.approx(30, abs=1)
+
+    def test_slot_caps_threads(self) -> None:
+        """Test that no more than `limit` threads hold a slot at once"""
+        controller = AimdController(initial=2, maximum=2)
+        in_slot = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def worker() -> None:
+            nonlocal in_slot, peak
+            with controller.slot():
+                with lock:
+                    in_slot += 1
+                    peak = max(peak, in_slot)
+                time.sleep(0.01)
+                with lock:
+                    in_slot -= 1
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 2
+
+class TestRetries:
+    """Test call_with_retries and the scrapers using it"""
+
+    @patch('adaptive.time.sleep')
+    def test_retries_throttled_then_succeeds(self, mock_sleep) -> None:
+        """Test that slow-down failures are retried and the success reported"""
+        fn = Mock(side_effect=[Throttled(CAPTCHA), httpx.ReadTimeout("slow"), "page"])
+        controller = AimdController(initial=4, maximum=4, cooldown=0)
+
+        assert call_with_retries(fn, controller) == "page"
+        assert mock_sleep.call_count == 2
+        assert controller.throttles == 2 and controller.successes == 1
+
+    @patch('adaptive.time.sleep')
+    def test_gives_up_after_retries(self, mock_sleep) -> None:
+        """Test that the last failure is raised once the retries are used up"""
+        fn = Mock(side_effect=Throttled(RATE_LIMITED))
+
+        with pytest.raises(Throttled):
+            call_with_retries(fn, retries=2)
+        assert fn.call_count == 3
+
+    @patch('adaptive.time.sleep')
+    def test_other_errors_are_not_retried(self, mock_sleep) -> None:
+        """Test that errors retrying won't fix are raised at once"""
+        fn = Mock(side_effect=ValueError("bad page"))
+
+        with pytest.raises(ValueError):
+            call_with_retries(fn)
+        mock_sleep.assert_not_called()
+
+    @patch('adaptive.time.sleep')
+    @patch('webscraper_io.httpx.get')
+    def test_webscraper_io_retries_429(self, mock_get, mock_sleep) -> None:
+        """Test that a 429 with Retry-After is retried instead of ending the catalog"""
+        request = httpx.Request("GET", webscraper_io.BASE_URL.format(1))
+        page = '<div class="thumbnail"><a class="title" title="Laptop"></a><h4 class="price">$1</h4><p class="description">d</p></div>'
+        mock_get.side_effect = [httpx.Response(429, headers={"Retry-After": "3"}, request=request), httpx.Response(200, text=page, request=request)]
+
+        rows = webscraper_io.scrape_page(1, controller=AimdController())
+
+        assert rows == [["Laptop", "$1", "d"]]
+        assert mock_sleep.call_args_list[0][0][0] >= 3
+
+    @patch('adaptive.time.sleep')
+    @patch('webscraper_io.httpx.get')
+    def test_webscraper_io_retry_waits_for_scheduler(self, mock_get, mock_sleep) -> None:
+        """Test that every attempt of the sequential crawl, the retry too, takes a slot from the rate budget"""
+        request = httpx.Request("GET", webscraper_io.BASE_URL.format(1))
+        mock_get.side_effect = [httpx.Response(429, request=request), httpx.Response(200, text="<html></html>", request=request)]
+        scheduler = Mock()
+
+        webscraper_io.scrape_page(1, controller=AimdController(), scheduler=scheduler)
+
+        assert scheduler.acquire.call_count == mock_get.call_count == 2
+
+    def test_async_crawl_survives_429s(self) -> None:
+        """Test that the async crawl retries throttled pages and still returns every page in order"""
+        hits: dict[int, int] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            page_num = int(request.url.params["page"])
+            hits[page_num] = hits.get(page_num, 0) + 1
+            if page_num > 4:
+                return httpx.Response(200, text="<html></html>")
+            if page_num == 2 and hits[page_num] == 1:
+                return httpx.Response(429)
+            box = f'<div class="thumbnail"><a class="title" title="Laptop {page_num}"></a><h4 class="price">$1</h4><p class="description">d</p></div>'
+            return httpx.Response(200, text=box)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch('adaptive.backoff_delay', return_value=0):
+            rows = asyncio.run(webscraper_io.crawl_async(concurrency=4, client=client, controller=AimdController(maximum=4)))
+
+        assert [row[0] for row in rows] == [f"Laptop {n}" for n in range(1, 5)]
+        assert hits[2] == 2
+
+    @patch('webscraper_io.httpx.get')
+    def test_webscraper_io_backoff_sleeps_outside_the_slot(self, mock_get) -> None:
+        """Test that a page waiting out its backoff doesn't hold one of the controller's slots"""
+        request = httpx.Request("GET", webscraper_io.BASE_URL.format(1))
+        mock_get.side_effect = [httpx.Response(429, request=request), httpx.Response(200, text="<html></html>", request=request)]
+        controller = AimdController(initial=1, maximum=1)
+        in_flight_while_sleeping = []
+
+        with patch('adaptive.time.sleep', side_effect=lambda _: in_flight_while_sleeping.append(controller._in_flight)):
+            webscraper_io.scrape_page(1, controller=controller)
+
+        assert in_flight_while_sleeping == [0]
+
+    @patch('webscraper_io.time.sleep')
+    @patch('webscraper_io.scrape_page')
+    def test_webscraper_io_still_throttled_page_is_skipped(self, mock_scrape, mock_sleep, tmp_path) -> None:
+        """Test that a page still throttled after the last retry is skipped, not taken for the end of the catalog"""
+        mock_scrape.side_effect = [[["Laptop 1", "$1", "d"]], Throttled(RATE_LIMITED), [["Laptop 3", "$3", "d"]], []]
+
+        with patch('webscraper_io.OUTPUT', tmp_path / "laptops.csv"):
+            webscraper_io.main()
+
+        assert mock_scrape.call_count == 4
+        assert "Laptop 3" in (tmp_path / "laptops.csv").read_text()
+
+    def test_async_crawl_skips_page_still_throttled(self) -> None:
+        """Test that the async crawl skips a page that stays throttled and carries on past it"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            page_num = int(request.url.params["page"])
+            if page_num > 3:
+                return httpx.Response(200, text="<html></html>")
+            if page_num == 2:
+                return httpx.Response(429)
+            box = f'<div class="thumbnail"><a class="title" title="Laptop {page_num}"></a><h4 class="price">$1</h4><p class="description">d</p></div>'
+            return httpx.Response(200, text=box)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch('adaptive.backoff_delay', return_value=0):
+            rows = asyncio.run(webscraper_io.crawl_async(concurrency=2, client=client, controller=AimdController(maximum=2)))
+
+        assert [row[0] for row in rows] == ["Laptop 1", "Laptop 3"]
@@ -0,0 +1,88 @@
+# test_dedupe.py
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from dedupe import DedupeSink, SeenIndex, product_id
+from sinks import ListSink
+
+@pytest.fixture
+def index_path():
+    """Fixture providing a path for the ID file"""
+    with tempfile.TemporaryDirectory() as name:
+        yield Path(name) / "seen_ids.txt"
+
+class TestProductId:
+    """Test product_id"""
+
+    def test_deterministic(self) -> None:
+        """Test that the same key always gives the same 16-character ID"""
+        assert product_id("/fridge-1.html") == product_id("/fridge-1.html")
+        assert len(product_id("/fridge-1.html")) == 16
+
+    def test_no_collisions_on_many_keys(self) -> None:
+        """Test that 100k distinct keys get 100k distinct IDs"""
+        ids = {product_id(f"/product-{n}.html") for n in range(100_000)}
+
+        assert len(ids) == 100_000
+
+    def test_key_parts_are_separated(self) -> None:
+        """Test that ("ab", "c") and ("a", "bc") don't hash alike"""
+        assert product_id("ab", "c") != product_id("a", "bc")
+
+class TestSeenIndex:
+    """Test the SeenIndex class"""
+
+    def test_persists_across_runs(self, index_path: Path) -> None:
+        """Test that IDs recorded in one run are known in the next"""
+        with SeenIndex(index_path) as index:
+            assert index.add(product_id("a")) is True
+            assert index.add(product_id("a")) is False
+
+        with SeenIndex(index_path) as index:
+            assert product_id("a") in index
+            assert product_id("b") not in index
+            assert len(index) == 1
+            assert list(index) == [product_id("a")]
+
+    def test_filter_new_skips_known_and_repeated_rows(self, index_path: Path) -> None:
+        """Test that rows already stored, or repeated within the batch, are dropped"""
+        a, b, c = (product_id(key) for key in "abc")
+        with SeenIndex(index_path) as index:
+            index.filter_new([[a, "first run"]])
+
+            new_rows = index.filter_new([[a, "again"], [b, "new"], [b, "duplicate"], [c, "new"]])
+
+        assert new_rows == [[b, "new"], [c, "new"]]
+        assert index_path.read_text().split() == [a, b, c]
+
+class TestDedupeSink:
+    """Test the DedupeSink class"""
+
+    def test_overlapping_crawls(self, index_path: Path) -> None:
+        """Test that a second crawl over the same pages only writes products it hasn't stored"""
+        page = lambda *keys: [[product_id(key), key] for key in keys]
+
+        with DedupeSink(ListSink(), SeenIndex(index_path)) as first:
+            first.write_rows(page("a", "b"))
+        with DedupeSink(ListSink(), SeenIndex(index_path)) as second:
+            second.write_rows(page("b", "c"))
+            second.write_rows(page("c", "d"))
+
+        assert [row[1] for row in second.sink.rows] == ["c", "d"]
+        assert second.rows_written == 2
+        assert second.skipped == 2
+
+    def test_ids_recorded_only_after_write(self, index_path: Path) -> None:
+        """Test that rows which failed to write are not marked as stored"""
+        class BrokenSink(ListSink):
+            def write_rows(self, rows):
+                raise OSError("disk full")
+
+        with DedupeSink(BrokenSink(), SeenIndex(index_path)) as sink:
+            with pytest.raises(OSError):
+                sink.write_rows([[product_id("a"), "a"]])
+
+        with SeenIndex(index_path) as index:
+            assert product_id("a") not in index
@@ -0,0 +1,58 @@
+# test_driver_cache.py
+import json
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from driver_cache import PIN_ENV, cached_driver_path
+
+@pytest.fixture
+def binary(tmp_path: Path) -> Path:
+    path = tmp_path / "chromedriver"
+    path.write_text("")
+    return path
+
+class TestCachedDriverPath:
+    """Test the cached_driver_path function"""
+
+    def test_resolves_once(self, tmp_path: Path, binary: Path) -> None:
+        """Test that the second start reads the path instead of calling install"""
+        install = Mock(return_value=str(binary))
+        cache = tmp_path / "chromedriver.json"
+
+        assert cached_driver_path(install, cache) == cached_driver_path(install, cache) == str(binary)
+        install.assert_called_once_with(None)
+
+    def test_pinned_version(self, tmp_path: Path, binary: Path, monkeypatch) -> None:
+        """Test that the pin (argument or environment) is passed to install and a new pin resolves again"""
+        install = Mock(return_value=str(binary))
+        cache = tmp_path / "chromedriver.json"
+        monkeypatch.setenv(PIN_ENV, "126.0.1")
+
+        cached_driver_path(install, cache)
+        cached_driver_path(install, cache)
+        cached_driver_path(install, cache, version="127.0.2")
+
+        assert install.call_args_list == [(("126.0.1",),), (("127.0.2",),)]
+
+    def test_stale_or_missing_binary(self, tmp_path: Path, binary: Path) -> None:
+        """Test that an old unpinned entry, or one whose binary is gone, resolves again"""
+        install = Mock(return_value=str(binary))
+        cache = tmp_path / "chromedriver.json"
+        cache.write_text(json.dumps({"version": None, "path": str(binary), "resolved_at": time.time() - 30 * 24 * 3600}))
+
+        cached_driver_path(install, cache)
+        binary.unlink()
+        cached_driver_path(install, cache)
+
+        assert install.call_count == 2
+
+    def test_unreadable_cache(self, tmp_path: Path, binary: Path) -> None:
+        """Test that a corrupt cache file is rewritten"""
+        cache = tmp_path / "chromedriver.json"
+        cache.write_text("{not json")
+
+        assert cached_driver_path(Mock(return_value=str(binary)), cache) == str(binary)
+        assert json.loads(cache.read_text())["path"] == str(binary)
@@ -0,0 +1,210 @@
+# test_driver_pool.py
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+from adaptive import AimdController
+from driver_pool import DriverPool, PoolExhausted, load_listing, wait_for_cards
+
+def fake_driver(cards: int = 1, ready: str = "complete", delay: float = 0.0) -> Mock:
+    """Mock WebDriver whose page has `cards` product cards; get() takes `delay` seconds"""
+    driver = Mock(spec=WebDriver)
+
+    def find_element(by: str, selector: str) -> Mock:
+        if not cards:
+            raise NoSuchElementException(selector)
+        return Mock()
+    driver.find_element.side_effect = find_element
+    driver.find_elements.side_effect = lambda by, selector: [Mock()] * cards
+    driver.execute_script.return_value = ready
+
+    def get(url: str) -> None:
+        time.sleep(delay)
+        driver.page_source = f"<html>{url}</html>"
+    driver.get.side_effect = get
+    return driver
+
+class TestWaitForCards:
+    """Test the explicit wait helpers"""
+
+    def test_returns_true_when_cards_present(self) -> None:
+        """Test that the wait ends as soon as cards are in the DOM"""
+        driver = fake_driver(cards=2, ready="loading")
+
+        assert wait_for_cards(driver, timeout=1) is True
+
+    def test_returns_false_on_loaded_page_without_cards(self) -> None:
+        """Test that a card-less page (e.g. past the last listing page) ends the wait after the grace period, not the timeout"""
+        driver = fake_driver(cards=0, ready="complete")
+
+        start = time.monotonic()
+        assert wait_for_cards(driver, timeout=5, grace=0.3) is False
+        assert 0.3 <= time.monotonic() - start < 1
+
+    def test_keeps_waiting_for_cards_rendered_after_load(self) -> None:
+        """Test that a loaded page whose cards are still being rendered waits for them instead of returning"""
+        driver = fake_driver(cards=0, ready="complete")
+        rendered = time.monotonic() + 0.3
+
+        def find_element(by: str, selector: str) -> Mock:
+            if time.monotonic() < rendered:
+                raise NoSuchElementException(selector)
+            return Mock()
+        driver.find_element.side_effect = find_element
+        driver.find_elements.side_effect = lambda by, selector: [Mock()] if time.monotonic() >= rendered else []
+
+        assert wait_for_cards(driver, timeout=5, grace=1) is True
+        assert time.monotonic() >= rendered
+
+    def test_times_out(self) -> None:
+        """Test that a page that never loads gives up after the timeout"""
+        driver = fake_driver(cards=0, ready="loading")
+
+        assert wait_for_cards(driver, timeout=0.3) is False
+
+    def test_load_listing_returns_rendered_html(self) -> None:
+        """Test that load_listing opens the URL and returns the page source"""
+        driver = fake_driver()
+
+        assert load_listing(driver, "https://example.com/?page=1") == "<html>https://example.com/?page=1</html>"
+        driver.get.assert_called_once_with("https://example.com/?page=1")
+
+    @patch('driver_pool.record_page_weight')
+    def test_page_weight_only_when_asked(self, mock_weight) -> None:
+        """Test that page weight, an extra script call per load, is only recorded when asked for"""
+        driver = fake_driver()
+
+        load_listing(driver, "https://example.com/?page=1")
+        mock_weight.assert_not_called()
+
+        DriverPool(1, lambda: driver, page_weight=True).load("https://example.com/?page=2")
+        mock_weight.assert_called_once_with("jumia", driver)
+
+class TestDriverPool:
+    """Test the DriverPool class"""
+
+    def test_starts_size_drivers(self) -> None:
+        """Test that the pool builds one driver per slot"""
+        factory = Mock(side_effect=lambda: fake_driver())
+
+        with DriverPool(3, factory):
+            pass
+
+        assert factory.call_count == 3
+
+    def test_rejects_empty_pool(self) -> None:
+        """Test that a pool needs at least one driver"""
+        with pytest.raises(ValueError):
+            DriverPool(0, fake_driver)
+
+    def test_failed_start_quits_started_drivers(self) -> None:
+        """Test that when one driver fails to start, the ones that did are quit before the error is raised"""
+        started = [fake_driver(), fake_driver()]
+        factory = Mock(side_effect=[started[0], WebDriverException("chrome failed to start"), started[1]])
+
+        with pytest.raises(WebDriverException):
+            DriverPool(3, factory)
+
+        for driver in started:
+            driver.quit.assert_called_once()
+
+    def test_load_all_keeps_url_order(self) -> None:
+        """Test that HTML comes back in URL order even when pages finish out of order"""
+        delays = iter([0.05, 0.0, 0.02])
+        pool = DriverPool(3, lambda: fake_driver(delay=next(delays)))
+        urls = [f"https://example.com/?page={n}" for n in range(1, 7)]
+
+        htmls = pool.load_all(urls)
+
+        assert htmls == [f"<html>{url}</html>" for url in urls]
+
+    def test_load_all_runs_in_parallel(self) -> None:
+        """Test that throughput scales with pool size"""
+        urls = [f"https://example.com/?page={n}" for n in range(8)]
+
+        start = time.monotonic()
+        DriverPool(4, lambda: fake_driver(delay=0.1)).load_all(urls)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.5  # 8 pages x 0.1s on 4 drivers, not 0.8s
+
+    def test_drivers_are_reused(self) -> None:
+        """Test that each page borrows an existing driver instead of starting a new one"""
+        drivers: list[Mock] = []
+        lock = threading.Lock()
+
+        def factory() -> Mock:
+            driver = fake_driver()
+            with lock:
+                drivers.append(driver)
+            return driver
+
+        DriverPool(2, factory).load_all([f"https://example.com/?page={n}" for n in range(6)])
+
+        assert len(drivers) == 2
+        assert sum(driver.get.call_count for driver in drivers) == 6
+
+    def test_load_asks_scheduler_first(self) -> None:
+        """Test that the rate scheduler is consulted before each page load"""
+        pool = DriverPool(1, fake_driver)
+        scheduler = Mock()
+
+        pool.load("https://example.com/?page=1", scheduler)
+
+        scheduler.acquire.assert_called_once_with("https://example.com/?page=1")
+
+    def test_backoff_sleeps_outside_the_slot(self) -> None:
+        """Test that a page waiting out a CAPTCHA backoff doesn't hold one of the controller's slots"""
+        driver = fake_driver()
+        pages = iter(["<title>Are you a robot?</title>", "<html>page</html>"])
+        driver.get.side_effect = lambda url: setattr(driver, "page_source", next(pages))
+        controller = AimdController(initial=1, maximum=1)
+        in_flight_while_sleeping = []
+
+        with patch('adaptive.time.sleep', side_effect=lambda _: in_flight_while_sleeping.append(controller._in_flight)):
+            html = DriverPool(1, lambda: driver).load("https://example.com/?page=1", controller=controller)
+
+        assert html == "<html>page</html>"
+        assert in_flight_while_sleeping == [0]
+
+    def test_crashed_driver_is_replaced(self) -> None:
+        """Test that a driver raising WebDriverException is quit and swapped for a new one"""
+        broken = fake_driver()
+        broken.get.side_effect = WebDriverException("chrome not reachable")
+        factory = Mock(side_effect=[broken, fake_driver()])
+        pool = DriverPool(1, factory)
+
+        with pytest.raises(WebDriverException):
+            pool.load("https://example.com/?page=1")
+
+        broken.quit.assert_called_once()
+        assert pool.load("https://example.com/?page=2") == "<html>https://example.com/?page=2</html>"
+
+    def test_failed_restart_exhausts_pool(self) -> None:
+        """Test that when a crashed driver can't be restarted, the pool raises instead of waiting forever"""
+        broken = fake_driver()
+        broken.get.side_effect = WebDriverException("chrome not reachable")
+        factory = Mock(side_effect=[broken, WebDriverException("chrome failed to start")])
+        pool = DriverPool(1, factory)
+
+        with pytest.raises(WebDriverException):
+            pool.load("https://example.com/?page=1")
+        with pytest.raises(PoolExhausted):
+            pool.load("https://example.com/?page=2")
+
+        broken.quit.assert_called_once()
+
+    def test_close_quits_all_drivers(self) -> None:
+        """Test that leaving the context quits every driver"""
+        drivers = [fake_driver(), fake_driver()]
+        factory = Mock(side_effect=drivers)
+
+        with DriverPool(2, factory):
+            pass
+
+        for driver in drivers:
+            driver.quit.assert_called_once()
@@ -0,0 +1,86 @@
+# test_fast_path.py
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from fast_path import fetch_listing_http, has_product_cards, iter_load_hybrid
+from metrics import METRICS, PAGES
+
+CARD = '<article class="prd _fb col c-prd"><div class="info"><h3 class="name">{}</h3><div class="prc">KSh 1</div></div></article>'
+
+def client_for(*responses: httpx.Response | Exception) -> httpx.Client:
+    """httpx.Client answering each request with the next of `responses`, no network involved"""
+    answers = iter(responses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+def fetched(fetch: str) -> float:
+    return METRICS.counter(PAGES, scraper="jumia", fetch=fetch)
+
+class TestHasProductCards:
+    """Test the has_product_cards function"""
+
+    @pytest.mark.parametrize("html,expected", [
+        (CARD.format("Fridge"), True),
+        ("<article class='prd'>", True),
+        ('<ARTICLE data-id="1" class="c-prd prd">', True),
+        ('<article class="prdx">', False),
+        ('<div class="prd">', False),
+        ('<div id="app"></div><script src="app.js"></script>', False),
+    ])
+    def test_has_product_cards(self, html: str, expected: bool) -> None:
+        """Test that only article.prd cards count"""
+        assert has_product_cards(html) is expected
+
+class TestFetchListingHttp:
+    """Test the fetch_listing_http function"""
+
+    def test_server_rendered_page(self) -> None:
+        """Test that a page with cards is returned and counted as an HTTP page"""
+        html = f"<html><body>{CARD.format('Fridge')}</body></html>"
+        before = fetched("http")
+        scheduler = Mock()
+
+        assert fetch_listing_http(client_for(httpx.Response(200, text=html)), "https://x/?page=1", scheduler) == html
+        scheduler.acquire.assert_called_once_with("https://x/?page=1")
+        assert fetched("http") == before + 1
+
+    @pytest.mark.parametrize("answer", [
+        httpx.Response(200, text='<div id="app"></div>'),  # cards rendered by JavaScript
+        httpx.Response(404, text=CARD.format("Fridge")),
+        httpx.ConnectError("boom"),
+    ])
+    def test_falls_back_to_browser(self, answer) -> None:
+        """Test that pages without cards, bad statuses and network errors mean "use the browser\""""
+        before = fetched("browser")
+
+        assert fetch_listing_http(client_for(answer), "https://x/?page=1") is None
+        assert fetched("browser") == before + 1
+
+    @patch('adaptive.time.sleep')
+    def test_retries_rate_limits(self, mock_sleep) -> None:
+        """Test that a 429 is retried after a backoff, not handed to the browser"""
+        client = client_for(httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200, text=CARD.format("Fridge")))
+
+        assert fetch_listing_http(client, "https://x/?page=1") is not None
+        assert mock_sleep.call_args[0][0] >= 2
+
+class TestIterLoadHybrid:
+    """Test the iter_load_hybrid function"""
+
+    def test_only_pages_without_cards_use_the_browser(self) -> None:
+        """Test that pages come back in URL order, the browser loading only those HTTP couldn't serve"""
+        pages = {"https://x/1": CARD.format("One"), "https://x/2": "<div id='app'></div>", "https://x/3": CARD.format("Three")}
+        client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=pages[str(request.url)])))
+        browser_load = Mock(return_value="rendered 2")
+
+        htmls = list(iter_load_hybrid(list(pages), client, browser_load, workers=3))
+
+        assert htmls == [pages["https://x/1"], "rendered 2", pages["https://x/3"]]
+        browser_load.assert_called_once_with("https://x/2")
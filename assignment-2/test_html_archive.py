@@ -0,0 +1,133 @@
+# test_html_archive.py
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from html_archive import HtmlArchive, archived, reparse
+from webscraper_io import BASE_URL, parse_page, scrape_page
+
+def laptops_html(name: str) -> str:
+    return f'<div class="thumbnail"><div class="title" title="{name}"></div><div class="price">$1</div><div class="description">d</div></div>'
+
+@pytest.fixture
+def archive_path(tmp_path: Path) -> Path:
+    return tmp_path / "pages.warc.gz"
+
+class TestHtmlArchive:
+    """Test the HtmlArchive class"""
+
+    def test_add_and_get(self, archive_path: Path) -> None:
+        """Test that pages are found by URL, the latest copy winning"""
+        with HtmlArchive(archive_path) as archive:
+            archive.add("https://a", "<p>one</p>", "jumia", 200)
+            archive.add("https://b", "<p>b</p>")
+            archive.add("https://a", "<p>two ü</p>", "jumia", 200)
+
+            page = archive.get("https://a")
+
+            assert (page.url, page.html, page.scraper, page.status) == ("https://a", "<p>two ü</p>", "jumia", 200)
+            assert archive.get("https://missing") is None
+            assert len(archive) == 2 and "https://b" in archive
+
+    def test_is_a_gzip_file(self, archive_path: Path) -> None:
+        """Test that the concatenated members read back as one gzip stream"""
+        with HtmlArchive(archive_path) as archive:
+            archive.add("https://a", "<p>one</p>")
+            archive.add("https://b", "<p>two</p>")
+
+        lines = gzip.decompress(archive_path.read_bytes()).decode("utf-8").splitlines()
+
+        assert [json.loads(line)["url"] for line in lines[::2]] == ["https://a", "https://b"]
+        assert lines[1::2] == ["<p>one</p>", "<p>two</p>"]
+
+    def test_pages_in_archive_order(self, archive_path: Path) -> None:
+        """Test that pages() scans sequentially, filtering by scraper and keeping the latest copies"""
+        with HtmlArchive(archive_path) as archive:
+            archive.add("https://a", "old", "jumia")
+            archive.add("https://b", "b", "books")
+            archive.add("https://c", "c", "jumia")
+            archive.add("https://a", "new", "jumia")
+
+            assert [(p.url, p.html) for p in archive.pages("jumia")] == [("https://c", "c"), ("https://a", "new")]
+            assert [p.html for p in archive.pages(latest=False)] == ["old", "b", "c", "new"]
+
+    def test_reopen_appends(self, archive_path: Path) -> None:
+        """Test that a reopened archive keeps its index and adds after the existing records"""
+        with HtmlArchive(archive_path) as archive:
+            archive.add("https://a", "a")
+        with HtmlArchive(archive_path) as archive:
+            archive.add("https://b", "b")
+            assert [archive.get(url).html for url in ("https://a", "https://b")] == ["a", "b"]
+
+    def test_rebuilds_lost_index(self, archive_path: Path) -> None:
+        """Test that records missing from the index, or a torn index line, are re-indexed on open"""
+        with HtmlArchive(archive_path) as archive:
+            archive.add("https://a", "a")
+            archive.add("https://b", "b")
+        index = archive_path.with_name(archive_path.name + ".idx")
+        index.write_text(index.read_text().splitlines(keepends=True)[0] + '{"url": "https://b", "off', encoding="utf-8")
+
+        with HtmlArchive(archive_path) as archive:
+            assert archive.get("https://b").html == "b"
+        with HtmlArchive(archive_path) as archive:
+            assert sorted(archive.urls()) == ["https://a", "https://b"]
+
+    def test_drops_partial_record(self, archive_path: Path) -> None:
+        """Test that a record cut short by a crash is removed and later records stay readable"""
+        with HtmlArchive(archive_path) as archive:
+            archive.add("https://a", "a")
+        with open(archive_path, "ab") as f:
+            f.write(gzip.compress(b'{"url": "https://b"}\nbbbb')[:15])
+
+        with HtmlArchive(archive_path) as archive:
+            archive.add("https://c", "c")
+            assert [p.url for p in archive.pages()] == ["https://a", "https://c"]
+
+class TestReparse:
+    """Test re-running a parser over the archive"""
+
+    def test_reparse_in_process(self, archive_path: Path) -> None:
+        """Test that every page's rows come back with its URL, in archive order"""
+        with HtmlArchive(archive_path) as archive:
+            archive.add("https://1", laptops_html("One"), "webscraper_io")
+            archive.add("https://2", laptops_html("Two"), "webscraper_io")
+            archive.add("https://x", laptops_html("Other"), "books")
+
+            results = list(reparse(archive, parse_page, "webscraper_io", workers=0))
+
+        assert results == [("https://1", [["One", "$1", "d"]]), ("https://2", [["Two", "$1", "d"]])]
+
+    def test_reparse_on_workers(self, archive_path: Path) -> None:
+        """Test that parsing on worker processes returns the same rows in the same order"""
+        with HtmlArchive(archive_path) as archive:
+            for n in range(6):
+                archive.add(f"https://{n}", laptops_html(f"Laptop {n}"))
+
+            assert list(reparse(archive, parse_page, workers=2)) == list(reparse(archive, parse_page, workers=0))
+
+    def test_archived_passes_pages_through(self, archive_path: Path) -> None:
+        """Test that archived() stores each page under its URL as it is consumed"""
+        with HtmlArchive(archive_path) as archive:
+            htmls = list(archived(archive, ["https://1", "https://2"], iter(["one", "two"]), "jumia"))
+
+            assert htmls == ["one", "two"]
+            assert archive.get("https://2").html == "two"
+
+    @patch('webscraper_io.httpx.get')
+    def test_scrape_page_archives_responses(self, mock_get, archive_path: Path) -> None:
+        """Test that webscraper_io adds each fetched page, which then re-parses to the scraped rows"""
+        response = Mock(spec=httpx.Response)
+        response.text = laptops_html("Laptop")
+        response.status_code = 200
+        mock_get.return_value = response
+
+        with HtmlArchive(archive_path) as archive:
+            rows = scrape_page(3, archive=archive)
+            page = archive.get(BASE_URL.format(3))
+
+            assert (page.scraper, page.status) == ("webscraper_io", 200)
+            assert list(reparse(archive, parse_page, workers=0)) == [(BASE_URL.format(3), rows)]
@@ -0,0 +1,162 @@
+# test_http_cache.py
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from http_cache import CachedResponse, HttpCache
+from webscraper_io import BASE_URL, scrape_page
+
+PAGE = "https://books.toscrape.com/catalogue/page-1.html"
+
+class FakeServer:
+    """Stands in for requests.get / httpx.get; honours If-None-Match like a real server"""
+
+    def __init__(self, body: str = "<html>v1</html>", etag: str = '"v1"', last_modified: str = "") -> None:
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests: list[dict[str, str]] = []
+
+    def __call__(self, url: str, headers: dict[str, str] | None = None, **kwargs) -> Mock:
+        headers = headers or {}
+        self.requests.append(headers)
+        response = Mock()
+        response.headers = {"ETag": self.etag, "Last-Modified": self.last_modified} if self.etag else {"Last-Modified": self.last_modified}
+        not_modified = (self.etag and headers.get("If-None-Match") == self.etag) or \
+            (not self.etag and self.last_modified and headers.get("If-Modified-Since") == self.last_modified)
+        response.status_code = 304 if not_modified else 200
+        response.text = "" if not_modified else self.body
+        return response
+
+@pytest.fixture
+def cache_dir():
+    """Fixture providing an empty cache directory"""
+    with tempfile.TemporaryDirectory() as name:
+        yield Path(name)
+
+class TestHttpCache:
+    """Test the HttpCache class"""
+
+    def test_first_fetch_downloads_and_stores(self, cache_dir: Path) -> None:
+        """Test that a miss goes to the server without validators and is stored"""
+        server = FakeServer()
+        cache = HttpCache(cache_dir)
+
+        response = cache.fetch(PAGE, server)
+
+        assert response.text == "<html>v1</html>"
+        assert server.requests == [{}]
+        assert cache.stats.misses == 1
+        assert len(cache) == 1
+
+    def test_repeat_fetch_is_a_304(self, cache_dir: Path) -> None:
+        """Test that an unchanged page is revalidated with If-None-Match and served from disk"""
+        server = FakeServer()
+        HttpCache(cache_dir).fetch(PAGE, server)
+
+        cache = HttpCache(cache_dir)  # a later run
+        response = cache.fetch(PAGE, server)
+
+        assert server.requests[1]["If-None-Match"] == '"v1"'
+        assert isinstance(response, CachedResponse) and response.revalidated
+        assert response.text == "<html>v1</html>"
+        assert cache.stats.revalidated == 1
+
+    def test_last_modified_validator(self, cache_dir: Path) -> None:
+        """Test that servers without ETags are revalidated with If-Modified-Since"""
+        server = FakeServer(etag="", last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+        cache = HttpCache(cache_dir)
+        cache.fetch(PAGE, server)
+
+        assert cache.fetch(PAGE, server).text == "<html>v1</html>"
+        assert server.requests[1] == {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"}
+
+    def test_changed_page_is_replaced(self, cache_dir: Path) -> None:
+        """Test that a new body (200 to a conditional request) overwrites the stored one"""
+        server = FakeServer()
+        cache = HttpCache(cache_dir)
+        cache.fetch(PAGE, server)
+        server.body, server.etag = "<html>v2</html>", '"v2"'
+
+        assert cache.fetch(PAGE, server).text == "<html>v2</html>"
+        assert cache.fetch(PAGE, server).text == "<html>v2</html>"
+        assert cache.stats.revalidated == 1
+
+    def test_fresh_entries_skip_the_network(self, cache_dir: Path) -> None:
+        """Test that within the ttl no request (and no scheduler slot) is spent"""
+        server = FakeServer()
+        scheduler = Mock()
+        cache = HttpCache(cache_dir, ttl=60)
+        cache.fetch(PAGE, server, scheduler=scheduler)
+
+        cache.fetch(PAGE, server, scheduler=scheduler)
+
+        assert len(server.requests) == 1
+        assert scheduler.acquire.call_count == 1
+        assert cache.stats.hits == 1
+
+    def test_expired_entries_are_revalidated(self, cache_dir: Path) -> None:
+        """Test that entries older than the ttl go back to the server"""
+        server = FakeServer()
+        cache = HttpCache(cache_dir, ttl=60)
+        cache.fetch(PAGE, server)
+
+        with patch('http_cache.time.time', return_value=time.time() + 120):
+            cache.fetch(PAGE, server)
+
+        assert cache.stats.revalidated == 1
+
+    def test_errors_are_not_stored(self, cache_dir: Path) -> None:
+        """Test that non-200 responses are passed through and not cached"""
+        error = Mock(status_code=503, text="busy", headers={})
+        cache = HttpCache(cache_dir)
+
+        assert cache.fetch(PAGE, Mock(return_value=error)) is error
+        assert len(cache) == 0
+
+    def test_size_bound_evicts_least_recently_used(self, cache_dir: Path) -> None:
+        """Test that going over max_bytes deletes the entries used longest ago"""
+        cache = HttpCache(cache_dir, max_bytes=250)
+        for n, mtime in zip(range(3), (100, 300, 200)):
+            cache.fetch(f"{PAGE}?{n}", FakeServer(body="x" * 100))
+            _, body_path = cache._paths(f"{PAGE}?{n}")
+            os.utime(body_path, (mtime, mtime))
+        cache.fetch(f"{PAGE}?3", FakeServer(body="x" * 100))
+
+        assert cache.load(f"{PAGE}?0") is None  # oldest
+        assert cache.load(f"{PAGE}?1") is not None
+        assert cache.size_bytes <= 250
+        assert cache.stats.evictions >= 1
+
+    def test_size_is_exact_under_threads(self, cache_dir: Path) -> None:
+        """Test that fetches from many threads at once keep size_bytes equal to the bodies on disk"""
+        cache = HttpCache(cache_dir, max_bytes=10_000)
+        urls = [f"{PAGE}?{n % 40}" for n in range(400)]  # repeats store the same URL concurrently
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(lambda url: cache.fetch(url, FakeServer(body="x" * 500, etag="")), urls))
+
+        assert cache.size_bytes == sum(path.stat().st_size for path in cache_dir.glob("*.body"))
+        assert cache.size_bytes <= 10_000
+
+class TestScrapePageCache:
+    """Test webscraper_io.scrape_page with a cache"""
+
+    def test_scrape_page_uses_cache(self, cache_dir: Path) -> None:
+        """Test that scrape_page returns the same rows from a 304 as from a download"""
+        html = '<div class="thumbnail"><div class="title" title="Laptop">Laptop</div><div class="price">$1</div><div class="description">d</div></div>'
+        server = FakeServer(body=html)
+        cache = HttpCache(cache_dir)
+
+        with patch('webscraper_io.httpx.get', server):
+            first = scrape_page(1, cache=cache)
+            second = scrape_page(1, cache=cache)
+
+        assert first == second == [["Laptop", "$1", "d"]]
+        assert cache.stats.revalidated == 1
+        assert cache.load(BASE_URL.format(1)) is not None
@@ -5,16 +5,25 @@ from pathlib import Path
 import tempfile
 import csv
 import json
+import subprocess
+import sys
+import httpx
 from selenium.webdriver.chrome.webdriver import WebDriver
 
 # Import the functions to test
 from jumia_scraper import (
     setup_driver, 
     parse_appliance_page, 
+    parse_products,
     save_to_csv, 
     save_to_json, 
+    make_scheduler,
+    startup_report,
+    ScrapeOptions,
     main
 )
+from lean_browser import LeanProfile
+from sinks import CsvSink, JsonlSink, read_jsonl
 
 class TestSetupDriver:
     """Test the setup_driver function"""
@@ -32,6 +41,16 @@ class TestSetupDriver:
         assert driver == mock_driver
         mock_chrome.assert_called_once()
     
+    @patch('jumia_scraper.selenium.webdriver.Chrome')
+    @patch('jumia_scraper.ChromeDriverManager')
+    def test_setup_driver_page_load_strategy(self, mock_chrome_manager, mock_chrome) -> None:
+        """Test that the page load strategy is passed through to Chrome options"""
+        mock_chrome_manager.return_value.install.return_value = "/fake/path"
+
+        setup_driver(page_load_strategy="eager")
+
+        assert mock_chrome.call_args.kwargs['options'].page_load_strategy == "eager"
+
     @patch('jumia_scraper.selenium.webdriver.Chrome')
     @patch('jumia_scraper.ChromeDriverManager')
     def test_setup_driver_configures_options(self, mock_chrome_manager, mock_chrome) -> None:
@@ -47,6 +66,43 @@ class TestSetupDriver:
         assert 'options' in kwargs
         assert 'service' in kwargs
 
+    @patch('jumia_scraper.selenium.webdriver.Chrome')
+    @patch('jumia_scraper.ChromeDriverManager')
+    def test_setup_driver_lean_profile(self, mock_chrome_manager, mock_chrome) -> None:
+        """Test that a lean profile sets the image preference and blocks URLs once the driver runs"""
+        mock_chrome_manager.return_value.install.return_value = "/fake/path"
+        profile = LeanProfile()
+
+        driver = setup_driver(lean=profile)
+
+        assert mock_chrome.call_args.kwargs['options'].experimental_options["prefs"] == profile.prefs()
+        driver.execute_cdp_cmd.assert_any_call("Network.setBlockedURLs", {"urls": profile.blocked_urls()})
+
+    @patch('jumia_scraper.selenium.webdriver.Chrome')
+    @patch('jumia_scraper.ChromeDriverManager')
+    def test_setup_driver_cached_path(self, mock_chrome_manager, mock_chrome) -> None:
+        """Test that with a driver cache chromedriver is looked up once, and startup stages are timed"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            binary = Path(temp_dir) / "chromedriver"
+            binary.write_text("")
+            mock_chrome_manager.return_value.install.return_value = str(binary)
+            cache = Path(temp_dir) / "chromedriver.json"
+
+            setup_driver(driver_cache=cache)
+            setup_driver(driver_cache=cache)
+
+        mock_chrome_manager.return_value.install.assert_called_once()
+        assert mock_chrome.call_count == 2
+        assert "driver lookup" in startup_report() and "Chrome launch" in startup_report()
+
+    def test_import_leaves_selenium_alone(self) -> None:
+        """Test that importing the scraper (e.g. for parse_appliance_page) doesn't import selenium"""
+        code = "import sys, jumia_scraper; sys.exit('selenium' in sys.modules or 'webdriver_manager' in sys.modules)"
+
+        result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent)
+
+        assert result.returncode == 0
+
 class TestParseAppliancePage:
     """Test the parse_appliance_page function"""
     
@@ -89,7 +145,7 @@ class TestParseAppliancePage:
         assert len(product) == 9  # Product_ID, Title, Price, Old Price, Discount, Badge, Rating, Number of Reviews, Shipping
         assert product[1] == "Test Appliance"  # Title
         assert product[2] == "KSh 1,000"  # Price
-        assert len(product[0]) == 4  # Product_ID should be 4 characters
+        assert len(product[0]) == 16  # Product_ID is a 64-bit hash in hex
     
     def test_parse_html_with_complete_product(self) -> None:
         """Test parsing HTML with a product that has all optional fields"""
@@ -175,6 +231,23 @@ class TestParseAppliancePage:
         assert product[2] == "KSh 1000"  # Price without quotes and commas
         assert product[3] == "KSh 1500"  # Old price without quotes
 
+    def test_product_id_is_stable(self) -> None:
+        """Test that a product keeps its ID across runs and distinct products get distinct IDs"""
+        card = '<article class="prd _fb col c-prd"><a class="core" href="{}"><div class="info"><h3 class="name">Fridge</h3><div class="prc">KSh 1</div></div></a></article>'
+        html = card.format("/fridge-1.html") + card.format("/fridge-2.html")
+
+        first, second = parse_appliance_page(html)
+
+        assert [row[0] for row in parse_appliance_page(html)] == [first[0], second[0]]
+        assert first[0] != second[0]  # same title, different product URL
+
+    def test_parse_products(self, sample_html) -> None:
+        """Test that parse_products gives the page's cards as typed Products"""
+        product, = parse_products(sample_html)
+
+        assert product.title == "Test Product"
+        assert product.price_cents == 100000 and product.old_price_cents is None
+
 class TestSaveToCsv:
     """Test the save_to_csv function"""
     
@@ -332,9 +405,196 @@ class TestMain:
         mock_save_csv.assert_called_once()
         mock_save_json.assert_called_once()
         
-        # Verify sleep was called between pages
-        assert mock_sleep.call_count >= 2  # At least 2 calls for delays
+        # Pages wait on their product cards and the rate scheduler, not on fixed sleeps
+        mock_sleep.assert_not_called()
     
+    @patch('jumia_scraper.setup_driver')
+    @patch('jumia_scraper.parse_appliance_page')
+    @patch('jumia_scraper.save_to_csv')
+    @patch('jumia_scraper.save_to_json')
+    @patch('jumia_scraper.time.sleep')
+    def test_main_acquires_rate_budget_per_page(self, mock_sleep, mock_save_json, mock_save_csv, mock_parse, mock_setup) -> None:
+        """Test that main asks the rate scheduler for a slot before every page load"""
+        mock_driver = Mock(spec=WebDriver)
+        mock_setup.return_value = mock_driver
+        mock_driver.page_source = "<html>test</html>"
+        mock_parse.side_effect = [[["A1B2", "Product 1", "KSh 1,000", "", "", "", "", "", ""]], []]
+        scheduler = Mock()
+        scheduler.acquire.side_effect = lambda url: calls.append(("acquire", url))
+        mock_driver.get.side_effect = lambda url: calls.append(("get", url))
+        calls: list[tuple[str, str]] = []
+
+        main(scheduler=scheduler)
+
+        assert [kind for kind, _ in calls] == ["acquire", "get", "acquire", "get"]
+        assert calls[0][1] == calls[1][1]
+
+    @patch('jumia_scraper.setup_driver')
+    def test_main_skips_disallowed_urls(self, mock_setup) -> None:
+        """Test that main never loads a URL robots.txt disallows"""
+        mock_driver = Mock(spec=WebDriver)
+        mock_setup.return_value = mock_driver
+        robots = Mock()
+        robots.allowed.return_value = False
+
+        main(robots=robots)
+
+        robots.allowed.assert_called_once_with("https://www.jumia.co.ke/home-office-appliances/?page=1#catalog-listing")
+        mock_driver.get.assert_not_called()
+        mock_driver.quit.assert_called_once()
+
+    @patch('jumia_scraper.DriverPool')
+    @patch('jumia_scraper.save_to_csv')
+    @patch('jumia_scraper.save_to_json')
+    def test_main_with_driver_pool(self, mock_save_json, mock_save_csv, mock_pool) -> None:
+        """Test that pool_size > 1 loads pages through a DriverPool and stops at the first empty page"""
+        pool = mock_pool.return_value.__enter__.return_value
+        card = '<article class="prd _fb col c-prd"><div class="info"><h3 class="name">{}</h3><div class="prc">KSh 1</div></div></article>'
+        pool.iter_load.return_value = [card.format("Product 1"), "<html></html>", card.format("Product 3")]
+
+        main(pool_size=3)
+
+        assert mock_pool.call_args[0][0] == 3
+        urls = pool.iter_load.call_args[0][0]
+        assert urls == [f"https://www.jumia.co.ke/home-office-appliances/?page={n}#catalog-listing" for n in (1, 2, 3)]
+        saved = mock_save_csv.call_args.kwargs['products']
+        assert [product[1] for product in saved] == ["Product 1"]
+
+    @patch('jumia_scraper.DriverPool')
+    @patch('jumia_scraper.save_to_csv')
+    @patch('jumia_scraper.save_to_json')
+    def test_main_with_parse_workers(self, mock_save_json, mock_save_csv, mock_pool) -> None:
+        """Test that parse_workers parses the pool's pages on processes, in page order"""
+        pool = mock_pool.return_value.__enter__.return_value
+        card = '<article class="prd _fb col c-prd"><div class="info"><h3 class="name">{}</h3><div class="prc">KSh 1</div></div></article>'
+        pool.iter_load.return_value = iter([card.format(f"Product {n}") for n in (1, 2, 3)])
+
+        main(pool_size=3, parse_workers=2)
+
+        saved = mock_save_csv.call_args.kwargs['products']
+        assert [product[1] for product in saved] == ["Product 1", "Product 2", "Product 3"]
+
+    @patch('jumia_scraper.DriverPool')
+    @patch('jumia_scraper.parse_ordered')
+    @patch('jumia_scraper.save_to_csv')
+    @patch('jumia_scraper.save_to_json')
+    def test_main_backend_reaches_parse_workers(self, mock_save_json, mock_save_csv, mock_parse_ordered, mock_pool) -> None:
+        """Test that main(backend=...) is the parser the worker processes run, overriding the given options"""
+        mock_parse_ordered.return_value = iter([[]])
+
+        main(options=ScrapeOptions(pool_size=3, parse_workers=2), backend="lxml")
+
+        parse = mock_parse_ordered.call_args[0][1]
+        assert parse.func is parse_products and parse.keywords == {"backend": "lxml"}
+
+    def test_main_rejects_unknown_option(self) -> None:
+        """Test that a misspelt option fails before anything is scraped"""
+        with pytest.raises(TypeError):
+            main(pool_sise=3)
+
+    @patch('jumia_scraper.setup_driver')
+    @patch('jumia_scraper.parse_appliance_page')
+    @patch('jumia_scraper.save_to_csv')
+    @patch('jumia_scraper.save_to_json')
+    def test_main_backend_sequential(self, mock_save_json, mock_save_csv, mock_parse, mock_setup) -> None:
+        """Test that the sequential scraper parses every page with the chosen backend"""
+        mock_setup.return_value.page_source = "<html></html>"
+        mock_parse.return_value = []
+
+        main(backend="lxml")
+
+        mock_parse.assert_called_once_with("<html></html>", "lxml")
+
+    @patch('jumia_scraper.make_http_client')
+    @patch('jumia_scraper.setup_driver')
+    @patch('jumia_scraper.save_to_csv')
+    @patch('jumia_scraper.save_to_json')
+    def test_main_http_first_skips_the_browser(self, mock_save_json, mock_save_csv, mock_setup, mock_client) -> None:
+        """Test that http_first never starts Chrome when every page is server-rendered"""
+        card = '<article class="prd _fb col c-prd"><div class="info"><h3 class="name">{}</h3><div class="prc">KSh 1</div></div></article>'
+        mock_client.return_value = httpx.Client(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text=card.format(f"Product {request.url.params['page']}"))))
+
+        main(http_first=True)
+
+        mock_setup.assert_not_called()
+        saved = mock_save_csv.call_args.kwargs['products']
+        assert [product[1] for product in saved] == ["Product 1", "Product 2", "Product 3"]
+
+    @patch('jumia_scraper.make_http_client')
+    @patch('jumia_scraper.setup_driver')
+    @patch('jumia_scraper.save_to_csv')
+    @patch('jumia_scraper.save_to_json')
+    def test_main_http_first_falls_back_per_page(self, mock_save_json, mock_save_csv, mock_setup, mock_client) -> None:
+        """Test that only the page without server-rendered cards is loaded in the browser"""
+        card = '<article class="prd _fb col c-prd"><div class="info"><h3 class="name">{}</h3><div class="prc">KSh 1</div></div></article>'
+        mock_client.return_value = httpx.Client(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text="<div id='app'></div>" if request.url.params['page'] == "2" else card.format("HTTP"))))
+        mock_driver = Mock(spec=WebDriver)
+        mock_driver.page_source = card.format("Browser")
+        mock_setup.return_value = mock_driver
+
+        main(http_first=True)
+
+        mock_setup.assert_called_once()
+        assert [call[0][0] for call in mock_driver.get.call_args_list] == ["https://www.jumia.co.ke/home-office-appliances/?page=2#catalog-listing"]
+        mock_driver.quit.assert_called_once()
+        saved = mock_save_csv.call_args.kwargs['products']
+        assert [product[1] for product in saved] == ["HTTP", "Browser", "HTTP"]
+
+    @patch('jumia_scraper.setup_driver')
+    @patch('jumia_scraper.save_to_csv')
+    @patch('jumia_scraper.save_to_json')
+    def test_main_stream_writes_each_page(self, mock_save_json, mock_save_csv, mock_setup) -> None:
+        """Test that stream=True appends every page to CSV and JSON Lines while scraping"""
+        card = '<article class="prd _fb col c-prd"><div class="info"><h3 class="name">{}</h3><div class="prc">KSh 1</div></div></article>'
+        pages = iter([card.format("Product 1"), card.format("Product 2"), "<html></html>"])
+        mock_driver = Mock(spec=WebDriver)
+        mock_setup.return_value = mock_driver
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path, jsonl_path = Path(temp_dir) / "out.csv", Path(temp_dir) / "out.jsonl"
+            rows_on_disk: list[int] = []
+
+            def get(url: str) -> None:
+                rows_on_disk.append(len(list(read_jsonl(jsonl_path))))
+                mock_driver.page_source = next(pages)
+            mock_driver.get.side_effect = get
+
+            with patch('jumia_scraper.CsvSink', lambda path, headers, **kwargs: CsvSink(csv_path, headers, **kwargs)), \
+                 patch('jumia_scraper.JsonlSink', lambda path, headers, **kwargs: JsonlSink(jsonl_path, headers, **kwargs)), \
+                 patch('jumia_scraper.wait_for_cards'):
+                main(stream=True)
+
+            assert rows_on_disk == [0, 1, 2]  # page 1 was on disk before page 2 was requested
+            assert [row["Title"] for row in read_jsonl(jsonl_path)] == ["Product 1", "Product 2"]
+            with open(csv_path, encoding='utf-8') as f:
+                assert [row["Title"] for row in csv.DictReader(f)] == ["Product 1", "Product 2"]
+
+        mock_save_csv.assert_not_called()
+        mock_save_json.assert_not_called()
+
+    @patch('jumia_scraper.PriceStore')
+    @patch('jumia_scraper.scrape_with_pool')
+    def test_main_history_closes_store_on_failure(self, mock_scrape, mock_store) -> None:
+        """Test that a crash in the pool still finishes the price run and closes the store"""
+        store = mock_store.return_value
+        store.start_run.return_value = 7
+        mock_scrape.side_effect = RuntimeError("pool died")
+
+        with pytest.raises(RuntimeError):
+            main(pool_size=2, history=True)
+
+        store.finish_run.assert_called_once_with(7)
+        store.close.assert_called_once()
+
+    def test_make_scheduler_matches_robots_budget(self) -> None:
+        """Test that the default scheduler stays under robots.txt's 200 requests per minute"""
+        bucket = make_scheduler().bucket_for("https://www.jumia.co.ke/home-office-appliances/?page=1")
+
+        assert bucket is not None
+        assert bucket.burst + bucket.rate * 60 < 200
+
     @patch('jumia_scraper.setup_driver')
     @patch('jumia_scraper.parse_appliance_page')
     @patch('jumia_scraper.save_to_csv')
@@ -357,6 +617,24 @@ class TestMain:
         mock_save_csv.assert_not_called()
         mock_save_json.assert_not_called()
     
+    @patch('jumia_scraper.SeenIndex')
+    @patch('jumia_scraper.JsonlSink')
+    @patch('jumia_scraper.CsvSink')
+    @patch('jumia_scraper.setup_driver')
+    @patch('jumia_scraper.parse_appliance_page')
+    def test_main_dedupe_all_duplicates(self, mock_parse, mock_setup, mock_csv, mock_jsonl, mock_index, capsys) -> None:
+        """Test that a dedupe run where every product was already stored reports the duplicates, not an empty scrape"""
+        mock_setup.return_value.page_source = "<html>test</html>"
+        mock_parse.side_effect = [[["A1B2", "Fridge", "KSh 1,000", "", "", "", "", "", ""]], []]
+        mock_index.return_value.unseen.return_value = []
+        mock_csv.return_value.rows_written = 0
+
+        main(dedupe=True)
+
+        output = capsys.readouterr().out
+        assert "No products were scraped" not in output
+        assert "all 1 scraped were already stored" in output
+
     @patch('jumia_scraper.setup_driver')
     def test_main_handles_driver_exception(self, mock_setup) -> None:
         """Test that main function handles exceptions during scraping"""
@@ -0,0 +1,87 @@
+# test_lean_browser.py
+from unittest.mock import Mock, call, patch
+
+from selenium.webdriver import ChromeOptions
+
+from lean_browser import FONT_PATTERNS, IMAGE_PATTERNS, LeanProfile, compare, page_weight, record_page_weight
+from metrics import PAGE_LOAD_SECONDS, PAGE_TRANSFER_BYTES, Metrics
+
+class TestLeanProfile:
+    """Test the LeanProfile class"""
+
+    def test_blocks_everything_by_default(self) -> None:
+        """Test that images, fonts and third-party hosts are all blocked"""
+        blocked = LeanProfile().blocked_urls()
+
+        assert set(IMAGE_PATTERNS) | set(FONT_PATTERNS) <= set(blocked)
+        assert "*googletagmanager.com*" in blocked
+
+    def test_allowlist_and_extra_patterns(self) -> None:
+        """Test that allowed substrings unblock patterns, and extra patterns are added"""
+        profile = LeanProfile(images=False, extra=("*ads.example.com*",), allow=("facebook", "woff"))
+        blocked = profile.blocked_urls()
+
+        assert "*.png" not in blocked
+        assert not [pattern for pattern in blocked if "facebook" in pattern or "woff" in pattern]
+        assert "*.ttf" in blocked and "*ads.example.com*" in blocked
+
+    def test_configure_sets_image_preference(self) -> None:
+        """Test that ChromeOptions get the images content setting, only when images are blocked"""
+        options, plain = ChromeOptions(), ChromeOptions()
+
+        LeanProfile().configure(options)
+        LeanProfile(images=False).configure(plain)
+
+        assert options.experimental_options["prefs"] == {"profile.managed_default_content_settings.images": 2}
+        assert "prefs" not in plain.experimental_options
+
+    def test_attach_blocks_urls_over_devtools(self) -> None:
+        """Test that a running driver gets Network.setBlockedURLs"""
+        driver = Mock()
+        profile = LeanProfile(third_party=False)
+
+        profile.attach(driver)
+
+        assert driver.execute_cdp_cmd.call_args_list == [
+            call("Network.enable", {}),
+            call("Network.setBlockedURLs", {"urls": profile.blocked_urls()}),
+        ]
+
+class TestPageWeight:
+    """Test page_weight, record_page_weight and compare"""
+
+    def test_page_weight(self) -> None:
+        """Test that the Resource Timing summary is returned, and anything else is None"""
+        driver = Mock()
+        driver.execute_script.return_value = {"bytes": 2048, "requests": 3, "load_ms": 250.0}
+
+        assert page_weight(driver) == {"bytes": 2048, "requests": 3, "load_ms": 250.0}
+
+        driver.execute_script.return_value = None
+        assert page_weight(driver) is None
+        driver.execute_script.side_effect = Exception("no such window")
+        assert page_weight(driver) is None
+
+    def test_record_page_weight(self) -> None:
+        """Test that bytes and load time are observed per page"""
+        driver = Mock()
+        driver.execute_script.return_value = {"bytes": 2048, "requests": 3, "load_ms": 250.0}
+        metrics = Metrics()
+
+        record_page_weight("jumia", driver, metrics)
+
+        assert metrics.histogram(PAGE_TRANSFER_BYTES, scraper="jumia").sum == 2048
+        assert metrics.histogram(PAGE_LOAD_SECONDS, scraper="jumia").sum == 0.25
+
+    @patch('driver_pool.wait_for_cards')
+    def test_compare(self, mock_wait) -> None:
+        """Test that each page is loaded in both drivers and the difference reported"""
+        full, lean = Mock(), Mock()
+        full.execute_script.return_value = {"bytes": 3_000_000, "requests": 120, "load_ms": 4000}
+        lean.execute_script.return_value = {"bytes": 400_000, "requests": 15, "load_ms": 900}
+
+        rows = compare(["https://x/1", "https://x/2"], full, lean)
+
+        assert [row["bytes_saved"] for row in rows] == [2_600_000, 2_600_000]
+        assert rows[0]["full_requests"] - rows[0]["lean_requests"] == 105
+        assert full.get.call_count == lean.get.call_count == 2
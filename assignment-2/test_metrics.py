@@ -0,0 +1,153 @@
+# test_metrics.py
+import json
+import threading
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+import webscraper_io
+from metrics import (
+    FETCH_ERRORS,
+    FETCH_SECONDS,
+    PAGE_ROWS,
+    PARSE_SECONDS,
+    RESPONSE_BYTES,
+    RESPONSES,
+    WRITE_SECONDS,
+    METRICS,
+    Histogram,
+    MeteredSink,
+    Metrics,
+)
+from sinks import ListSink
+
+@pytest.fixture
+def registry():
+    """The shared METRICS registry, emptied before and after the test"""
+    METRICS.reset()
+    yield METRICS
+    METRICS.reset()
+
+class TestHistogram:
+    """Test the Histogram class"""
+
+    def test_counts_into_buckets(self) -> None:
+        """Test that values land in the first bucket whose bound they don't exceed"""
+        histogram = Histogram((1, 5, 10))
+        for value in (0.5, 1, 3, 7, 50):
+            histogram.observe(value)
+
+        assert histogram.counts == [2, 1, 1, 1]
+        assert (histogram.count, histogram.sum, histogram.max) == (5, 61.5, 50)
+
+    def test_quantile_interpolates_within_bucket(self) -> None:
+        """Test that quantiles are estimated from the bucket counts"""
+        histogram = Histogram((10, 20))
+        for value in (12, 14, 16, 18):
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) == pytest.approx(15)
+        assert Histogram((1,)).quantile(0.5) == 0.0
+
+class TestMetrics:
+    """Test the Metrics registry"""
+
+    def test_counters_by_label(self) -> None:
+        """Test that counters are kept per label set"""
+        metrics = Metrics()
+        metrics.inc(RESPONSES, scraper="a", status=200)
+        metrics.inc(RESPONSES, scraper="a", status=200)
+        metrics.inc(RESPONSES, scraper="a", status=404)
+
+        assert metrics.counter(RESPONSES, scraper="a", status=200) == 2
+        assert metrics.counter(RESPONSES, status=404, scraper="a") == 1
+
+    def test_threads_lose_nothing(self) -> None:
+        """Test that concurrent observations are all counted"""
+        metrics = Metrics()
+
+        def worker() -> None:
+            for _ in range(1000):
+                metrics.observe(FETCH_SECONDS, 0.01, scraper="a")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert metrics.histogram(FETCH_SECONDS, scraper="a").count == 4000  # type: ignore
+
+    def test_prometheus_text(self) -> None:
+        """Test the exposition format: TYPE lines, cumulative buckets, _sum and _count"""
+        metrics = Metrics()
+        metrics.inc(RESPONSES, scraper="a", status=200)
+        metrics.observe(PAGE_ROWS, 3, scraper="a")
+        metrics.observe(PAGE_ROWS, 30, scraper="a")
+
+        lines = metrics.to_prometheus().splitlines()
+
+        assert "# TYPE scrape_responses_total counter" in lines
+        assert 'scrape_responses_total{scraper="a",status="200"} 1' in lines
+        assert "# TYPE scrape_page_rows histogram" in lines
+        assert 'scrape_page_rows_bucket{scraper="a",le="5"} 1' in lines
+        assert 'scrape_page_rows_bucket{scraper="a",le="50"} 2' in lines
+        assert 'scrape_page_rows_bucket{scraper="a",le="+Inf"} 2' in lines
+        assert 'scrape_page_rows_sum{scraper="a"} 33' in lines
+        assert 'scrape_page_rows_count{scraper="a"} 2' in lines
+
+    def test_write_picks_format_by_suffix(self) -> None:
+        """Test that .json gets the summary and anything else the Prometheus text"""
+        metrics = Metrics()
+        metrics.observe(FETCH_SECONDS, 0.2, scraper="a")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            summary = json.loads(metrics.write(Path(temp_dir) / "run.json").read_text(encoding="utf-8"))
+            text = metrics.write(Path(temp_dir) / "run.prom").read_text(encoding="utf-8")
+
+        assert summary["histograms"]['scrape_fetch_seconds{scraper="a"}']["count"] == 1
+        assert summary["histograms"]['scrape_fetch_seconds{scraper="a"}']["mean"] == pytest.approx(0.2)
+        assert 'scrape_fetch_seconds_count{scraper="a"} 1' in text
+
+    def test_metered_sink(self) -> None:
+        """Test that writes are timed and the wrapped sink stays reachable"""
+        metrics = Metrics()
+        with MeteredSink(ListSink(), "a", metrics) as sink:
+            sink.write_rows([[1], [2]])
+
+        assert sink.rows == [[1], [2]]
+        assert sink.rows_written == 2
+        assert metrics.histogram(WRITE_SECONDS, scraper="a").count == 1  # type: ignore
+
+class TestInstrumentedScrapers:
+    """Test that the scrapers record into METRICS"""
+
+    @patch('webscraper_io.httpx.get')
+    def test_webscraper_io_page(self, mock_get, registry: Metrics) -> None:
+        """Test that a page records latency, size, status, parse time and rows"""
+        response = Mock(spec=httpx.Response)
+        response.status_code = 200
+        response.content = b"<html>...</html>"
+        response.text = '<div class="thumbnail"><a class="title" title="Laptop"></a><h4 class="price">$1</h4><p class="description">d</p></div>'
+        mock_get.return_value = response
+
+        rows = webscraper_io.scrape_page(1)
+
+        assert len(rows) == 1  # type: ignore
+        assert registry.counter(RESPONSES, scraper="webscraper_io", status=200) == 1
+        assert registry.histogram(RESPONSE_BYTES, scraper="webscraper_io").sum == 16  # type: ignore
+        assert registry.histogram(FETCH_SECONDS, scraper="webscraper_io").count == 1  # type: ignore
+        assert registry.histogram(PARSE_SECONDS, scraper="webscraper_io").count == 1  # type: ignore
+        assert registry.histogram(PAGE_ROWS, scraper="webscraper_io").sum == 1  # type: ignore
+
+    @patch('webscraper_io.httpx.get')
+    def test_webscraper_io_errors(self, mock_get, registry: Metrics) -> None:
+        """Test that failures without a response are counted as errors"""
+        mock_get.side_effect = httpx.ConnectError("Connection failed")
+
+        webscraper_io.fetch_html(1)
+
+        assert registry.counter(FETCH_ERRORS, scraper="webscraper_io") == 1
@@ -0,0 +1,158 @@
+# test_parsers.py
+import pytest
+
+from parsers import available_backends, fastest_backend, get_backend
+from jumia_scraper import parse_appliance_page
+from webscraper_io import parse_page
+
+BACKENDS = available_backends()
+FAST_BACKENDS = [name for name in BACKENDS if name != "html.parser"]
+
+# Same markup as the test_jumia_scraper.py / test_webscraper_io.py cases, plus a few awkward ones
+JUMIA_PAGES = {
+    "empty": "<html><body></body></html>",
+    "no_products": '<html><body><div class="some-other-content">No products here</div></body></html>',
+    "single": """
+        <article class="prd _fb col c-prd">
+            <div class="info"><h3 class="name">Test Appliance</h3><div class="prc">KSh 1,000</div></div>
+        </article>""",
+    "complete": """
+        <article class="prd _fb col c-prd">
+            <div class="info">
+                <h3 class="name">Complete Appliance</h3>
+                <div class="prc">KSh 2,000</div>
+                <div class="old">KSh 2,500</div>
+                <div class="bdg _dsct _sm">-20%</div>
+                <div class="bdg _mall _xs">Jumia Mall</div>
+                <div class="rev">
+                    <div class="stars _s">4.5 out of 5</div>
+                    <span>(123)</span>
+                </div>
+                <svg class="ic xprss"></svg>
+            </div>
+        </article>""",
+    "quotes_and_entities": """
+        <article class="prd _fb col c-prd">
+            <div class="info">
+                <h3 class="name">&quot;Quoted&quot; “Fancy” Appliance &amp; Co</h3>
+                <div class="prc">KSh "1,000"</div>
+                <div class="old">KSh "1,500"</div>
+            </div>
+        </article>""",
+    "nested_and_sponsored": """
+        <section>
+            <article class="prd _fb _spn c-prd col" data-spon="true">
+                <a class="core" href="/fridge-1.html">
+                    <div class="info">
+                        <h3 class="name">Sponsored <b>Fridge</b></h3>
+                        <div class="prc">KSh 45,999</div>
+                        <!-- a comment -->
+                        <div class="rev"><div class="stars _s">3 out of 5</div>(7)</div>
+                    </div>
+                </a>
+            </article>
+            <article class="prd c-prd"><div class="info"><h3 class="name">Not a listing card</h3><div class="prc">KSh 1</div></div></article>
+            <article class="prd _fb col c-prd"><div class="info"><h3 class="name">No price</h3></div></article>
+            <article class="prd _fb col c-prd"><div class="content">No info div</div></article>
+        </section>""",
+}
+
+WEBSCRAPER_PAGES = {
+    "empty": "<html><body><div>No products here</div></body></html>",
+    "two_laptops": """
+        <div class="thumbnail">
+            <div class="title" title="Test Laptop 1">Test Laptop 1</div>
+            <div class="price">$999.99</div>
+            <div class="description">Great laptop for testing</div>
+        </div>
+        <div class="thumbnail">
+            <div class="title" title="Test Laptop 2">Test Laptop 2</div>
+            <div class="price">$1299.99</div>
+            <div class="description">Another great laptop</div>
+        </div>""",
+    "malformed": """
+        <div class="thumbnail">
+            <div class="title" title="Complete Laptop">Complete Laptop</div>
+            <div class="price">$999.99</div>
+            <div class="description">Complete description</div>
+        </div>
+        <div class="thumbnail">
+            <div class="title">Incomplete Laptop</div>
+            <div class="price">$799.99</div>
+            <div class="description">Incomplete description</div>
+        </div>
+        <div class="thumbnail">
+            <div class="title" title="No Price Laptop">No Price Laptop</div>
+            <div class="description">No price description</div>
+        </div>""",
+    "real_markup": """
+        <div class="col-md-4 col-xl-4 col-lg-4">
+            <div class="card thumbnail">
+                <div class="product-wrapper card-body">
+                    <img class="img-fluid card-img-top image img-responsive" alt="item" src="/images/test-sites/e-commerce/items/cart2.png">
+                    <div class="caption">
+                        <h4 class="price float-end card-title pull-right">$295.99</h4>
+                        <h4><a href="/test-sites/e-commerce/static/product/31" class="title" title="Asus VivoBook X441NA-GA190">Asus VivoBook X4...</a></h4>
+                        <p class="description card-text">Asus VivoBook X441NA-GA190 Chocolate Black, 14&quot;, Celeron N3450, 4GB</p>
+                    </div>
+                </div>
+            </div>
+        </div>""",
+}
+
+class TestBackends:
+    """Test backend selection"""
+
+    def test_html_parser_always_available(self) -> None:
+        """Test that the default backend needs no extra packages"""
+        assert "html.parser" in BACKENDS
+        assert fastest_backend() in BACKENDS
+
+    def test_unknown_backend(self) -> None:
+        """Test that a typo in the backend name is reported"""
+        with pytest.raises(ValueError):
+            get_backend("html5lib-turbo")
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_compound_and_descendant_selectors(self, backend: str) -> None:
+        """Test the selector subset the scrapers rely on"""
+        parser = get_backend(backend)
+        root = parser.parse('<div class="a  b"><p class="c">x</p></div><div class="b"><p class="c">y</p></div>')
+
+        assert [parser.text(node) for node in parser.select(root, "div.a.b p.c")] == ["x"]
+        assert [parser.text(node) for node in parser.select(root, ".c")] == ["x", "y"]
+        assert parser.select_one(root, "span") is None
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_attr_missing_raises_key_error(self, backend: str) -> None:
+        """Test that missing attributes raise KeyError like tag[name]"""
+        parser = get_backend(backend)
+        node = parser.select_one(parser.parse('<a class="title">t</a>'), ".title")
+
+        with pytest.raises(KeyError):
+            parser.attr(node, "title")
+
+@pytest.mark.skipif(not FAST_BACKENDS, reason="lxml is not installed")
+class TestSameRows:
+    """Test that every fast backend returns exactly the html.parser rows"""
+
+    @pytest.mark.parametrize("backend", FAST_BACKENDS)
+    @pytest.mark.parametrize("page", list(JUMIA_PAGES))
+    def test_parse_appliance_page(self, backend: str, page: str) -> None:
+        """Test Jumia product rows across backends"""
+        html = JUMIA_PAGES[page]
+
+        assert parse_appliance_page(html, backend=backend) == parse_appliance_page(html)
+
+    @pytest.mark.parametrize("backend", FAST_BACKENDS)
+    @pytest.mark.parametrize("page", list(WEBSCRAPER_PAGES))
+    def test_parse_page(self, backend: str, page: str) -> None:
+        """Test webscraper.io laptop rows across backends"""
+        html = WEBSCRAPER_PAGES[page]
+
+        assert parse_page(html, backend=backend) == parse_page(html)
+
+    def test_fixtures_are_not_trivial(self) -> None:
+        """Test that the comparison above covers real rows"""
+        assert len(parse_appliance_page(JUMIA_PAGES["nested_and_sponsored"])) == 1
+        assert parse_page(WEBSCRAPER_PAGES["real_markup"])[0][0] == "Asus VivoBook X441NA-GA190"
@@ -0,0 +1,71 @@
+# test_pipeline.py
+import itertools
+import threading
+from functools import partial
+from unittest.mock import Mock, patch
+
+from pipeline import parse_ordered, run_pipeline
+from webscraper_io import iter_pages_pipeline, parse_page
+from test_webscraper_io import laptops_page_html
+
+LAST_PAGE = 5
+
+def fetch_listing(page_num: int) -> str:
+    """Pages 1..LAST_PAGE have laptops, later pages are empty"""
+    return laptops_page_html(page_num) if page_num <= LAST_PAGE else "<html></html>"
+
+class TestParseOrdered:
+    """Test parse_ordered"""
+
+    def test_same_rows_in_input_order(self) -> None:
+        """Test that process-parsed pages match in-process parsing, page for page"""
+        htmls = [laptops_page_html(n, per_page=n) for n in range(1, 9)]
+
+        pages = list(parse_ordered(iter(htmls), parse_page, workers=2))
+
+        assert pages == [parse_page(html) for html in htmls]
+
+class TestRunPipeline:
+    """Test run_pipeline"""
+
+    def test_stops_at_first_empty_page(self) -> None:
+        """Test that an endless page sequence ends at the first page without rows"""
+        fetched: list[int] = []
+        lock = threading.Lock()
+
+        def fetch(page_num: int) -> str:
+            with lock:
+                fetched.append(page_num)
+            return fetch_listing(page_num)
+
+        pages = list(run_pipeline(itertools.count(1), fetch, partial(parse_page, backend="html.parser"), fetch_workers=2, parse_workers=2))
+
+        assert [row[0] for rows in pages for row in rows] == [f"Laptop {n}-{i}" for n in range(1, LAST_PAGE + 1) for i in range(2)]
+        assert max(fetched) <= LAST_PAGE + 2 + 2 * 2  # never runs further ahead than its window
+
+    def test_failed_fetch_ends_listing(self) -> None:
+        """Test that a page whose fetch failed (None) counts as empty"""
+        fetch = Mock(side_effect=lambda page_num: None if page_num == 3 else fetch_listing(page_num))
+
+        pages = list(run_pipeline(range(1, 10), fetch, parse_page, fetch_workers=1, parse_workers=1))
+
+        assert len(pages) == 2
+
+    def test_keeps_going_without_stop_on_empty(self) -> None:
+        """Test that stop_on_empty=False yields every item, empty or not"""
+        pages = list(run_pipeline(range(1, 8), fetch_listing, parse_page, parse_workers=1, stop_on_empty=False))
+
+        assert [len(rows) for rows in pages] == [2] * LAST_PAGE + [0, 0]
+
+class TestScrapersInPipelineMode:
+    """Test the pipeline mode of webscraper_io"""
+
+    def test_iter_pages_pipeline(self) -> None:
+        """Test that webscraper_io's pipeline mode returns what scrape_page returns"""
+        def get(url: str, timeout: float) -> Mock:
+            return Mock(text=fetch_listing(int(url.rsplit("=", 1)[1])), raise_for_status=Mock())
+
+        with patch('webscraper_io.httpx.get', side_effect=get):
+            pages = list(iter_pages_pipeline(fetch_workers=3, parse_workers=2))
+
+        assert pages == [parse_page(laptops_page_html(n)) for n in range(1, LAST_PAGE + 1)]
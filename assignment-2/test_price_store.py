@@ -0,0 +1,134 @@
+# test_price_store.py
+import time
+from pathlib import Path
+
+import pytest
+
+from jumia_scraper import observation
+from price_store import HistorySink, Observation, PriceStore, parse_price
+from records import Product, RowSink
+from sinks import ListSink
+
+@pytest.fixture
+def store(tmp_path: Path):
+    """A PriceStore in a temporary SQLite file"""
+    with PriceStore(tmp_path / "prices.sqlite", batch_size=3) as price_store:
+        yield price_store
+
+def observations(prices: dict[str, float]) -> list[Observation]:
+    return [Observation(key, f"Product {key}", price) for key, price in prices.items()]
+
+class TestParsePrice:
+    """Test parse_price"""
+
+    @pytest.mark.parametrize("text,price", [
+        ("KSh 1,299", 1299.0),
+        ("£51.77", 51.77),
+        ("Â£51.77", 51.77),
+        ("KSh 1,000 - KSh 2,000", 1000.0),
+        (12, 12.0),
+        ("", None),
+        (None, None),
+    ])
+    def test_parse_price(self, text, price) -> None:
+        """Test that scraped price text becomes a float"""
+        assert parse_price(text) == price
+
+class TestPriceStore:
+    """Test the PriceStore class"""
+
+    def test_changes_between_runs(self, store: PriceStore) -> None:
+        """Test price drops, new and removed products between the latest two runs"""
+        store.record_run("jumia", observations({"A": 100, "B": 200, "C": 300, "D": 50}))
+        store.record_run("jumia", observations({"A": 80, "B": 190, "C": 310, "E": 10}))
+
+        drops = store.price_drops("jumia")
+
+        assert [(d.key, d.old_price, d.new_price) for d in drops] == [("A", 100, 80), ("B", 200, 190)]
+        assert drops[0].change == pytest.approx(-0.2)
+        assert [d.key for d in store.price_drops("jumia", min_drop=0.1)] == ["A"]
+        assert store.new_products("jumia") == [("E", "Product E")]
+        assert store.removed_products("jumia") == [("D", "Product D")]
+
+    def test_skips_open_and_empty_runs(self, store: PriceStore) -> None:
+        """Test that a run still open (crashed) or finished without products isn't compared against"""
+        store.record_run("jumia", observations({"A": 100, "B": 200}))
+        store.record_run("jumia", observations({"A": 80, "B": 200}))
+        store.record_run("jumia", [])  # the scrape found nothing
+        store.add(store.start_run("jumia"), observations({"A": 1}))  # never finished
+
+        assert [d.key for d in store.price_drops("jumia")] == ["A"]
+        assert store.removed_products("jumia") == []
+        assert store.new_products("jumia") == []
+
+    def test_first_run_reports_nothing(self, store: PriceStore) -> None:
+        """Test that a single run has no changes to report"""
+        store.record_run("jumia", observations({"A": 100}))
+
+        assert store.price_drops("jumia") == []
+        assert store.new_products("jumia") == []
+        assert store.removed_products("jumia") == []
+
+    def test_sources_are_separate(self, store: PriceStore) -> None:
+        """Test that runs of one source don't affect another's queries"""
+        store.record_run("jumia", observations({"A": 100}))
+        store.record_run("books", observations({"A": 5}))
+        store.record_run("jumia", observations({"A": 90}))
+
+        assert [d.new_price for d in store.price_drops("jumia")] == [90]
+        assert [price for _, price in store.history("jumia", "A")] == [100, 90]
+        assert [price for _, price in store.history("books", "A")] == [5]
+
+    def test_duplicates_in_a_run_are_upserted(self, store: PriceStore) -> None:
+        """Test that a product seen twice in one run keeps the last price, across batches"""
+        run_id = store.start_run("jumia")
+        store.add(run_id, [("A", "A", "KSh 100"), ("B", "B", "KSh 5"), ("C", "C", None), ("A", "A", "KSh 90")])
+        store.finish_run(run_id)
+
+        assert [price for _, price in store.history("jumia", "A")] == [90]
+
+    def test_reopen_keeps_history(self, tmp_path: Path) -> None:
+        """Test that runs persist across connections"""
+        with PriceStore(tmp_path / "prices.sqlite") as store:
+            store.record_run("jumia", observations({"A": 100}))
+        with PriceStore(tmp_path / "prices.sqlite") as store:
+            store.record_run("jumia", observations({"A": 70}))
+            assert store.runs("jumia") == [1, 2]
+            assert [d.key for d in store.price_drops("jumia")] == ["A"]
+
+    def test_bulk_runs_stay_fast(self, tmp_path: Path) -> None:
+        """Test that a 50k-product run takes about as long on day 3 as on day 1"""
+        timings = []
+        with PriceStore(tmp_path / "prices.sqlite") as store:
+            for day in range(3):
+                start = time.perf_counter()
+                store.record_run("jumia", (Observation(f"P{n}", f"Product {n}", 1000 - (n % 7) * day) for n in range(50_000)))
+                timings.append(time.perf_counter() - start)
+            drops = store.price_drops("jumia")
+
+        assert len(drops) == sum(1 for n in range(50_000) if n % 7)
+        assert timings[2] < 3 * timings[0] + 0.5
+
+class TestHistorySink:
+    """Test recording a scrape through HistorySink"""
+
+    def test_records_each_page(self, store: PriceStore) -> None:
+        """Test that written Jumia Products become observations of the run, and text rows in the inner sink"""
+        run_id = store.start_run("jumia")
+        products = [Product.from_row(["ID1", "Fridge", "KSh 30,000", "KSh 35,000", "-14%", "", "", "", ""])]
+
+        with HistorySink(RowSink(ListSink()), store, run_id, observation) as sink:
+            sink.write_rows(products)
+
+        assert sink.rows == [products[0].to_row()]
+        assert [price for _, price in store.history("jumia", "ID1")] == [30000]
+        assert store._db.execute("SELECT products FROM runs WHERE run_id = ?", (run_id,)).fetchone() == (1,)
+
+    def test_blank_price_is_null(self, store: PriceStore) -> None:
+        """Test that a row without a readable price is stored as NULL, not as a price of 0"""
+        run_id = store.start_run("jumia")
+
+        with HistorySink(ListSink(), store, run_id, observation) as sink:
+            sink.write_rows([Product.from_row(["ID1", "Fridge", "", "", "", "", "", "", ""])])
+
+        assert [price for _, price in store.history("jumia", "ID1")] == [None]
@@ -0,0 +1,165 @@
+# test_rate_limiter.py
+import asyncio
+import multiprocessing
+import pickle
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+from rate_limiter import TokenBucket, RateScheduler
+
+def take_tokens(bucket: TokenBucket, count: int) -> None:
+    """Worker process target: draw `count` tokens from a shared bucket"""
+    for _ in range(count):
+        bucket.reserve()
+
+class TestTokenBucket:
+    """Test the TokenBucket class"""
+
+    def test_burst_is_free(self) -> None:
+        """Test that the first `burst` requests don't wait"""
+        bucket = TokenBucket(rate=1, burst=3)
+
+        waits = [bucket.reserve() for _ in range(3)]
+
+        assert waits == [0.0, 0.0, 0.0]
+
+    def test_waits_grow_once_bucket_is_empty(self) -> None:
+        """Test that each request past the burst waits one more refill interval"""
+        bucket = TokenBucket(rate=10, burst=1)
+
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits[0] == 0.0
+        assert waits[1:] == pytest.approx([0.1, 0.2, 0.3], abs=0.01)
+
+    def test_from_rpm_never_exceeds_budget(self) -> None:
+        """Test that a from_rpm bucket admits at most `rpm` requests in any 60s window"""
+        bucket = TokenBucket.from_rpm(200, burst=5)
+
+        waits = [bucket.reserve() for _ in range(400)]
+        admitted_within_a_minute = sum(1 for wait in waits if wait < 60)
+
+        assert admitted_within_a_minute <= 200
+        assert admitted_within_a_minute >= 199
+
+    def test_rejects_invalid_settings(self) -> None:
+        """Test that nonsensical rates and bursts raise ValueError"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, burst=0)
+        with pytest.raises(ValueError):
+            TokenBucket.from_rpm(5, burst=5)
+
+    @patch('rate_limiter.time.sleep')
+    def test_acquire_sleeps_for_reserved_wait(self, mock_sleep) -> None:
+        """Test that acquire sleeps only when the bucket is empty"""
+        bucket = TokenBucket(rate=2, burst=1)
+
+        bucket.acquire()
+        bucket.acquire()
+
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args[0][0] == pytest.approx(0.5, abs=0.01)
+
+    def test_acquire_async(self) -> None:
+        """Test that async tasks share one bucket"""
+        bucket = TokenBucket(rate=100, burst=2)
+
+        async def run() -> list[float]:
+            return await asyncio.gather(*(bucket.acquire_async() for _ in range(4)))
+
+        waits = asyncio.run(run())
+
+        assert sorted(waits)[:2] == [0.0, 0.0]
+        assert max(waits) == pytest.approx(0.02, abs=0.01)
+
+    def test_threads_share_one_budget(self) -> None:
+        """Test that concurrent threads never take more tokens than the bucket allows"""
+        bucket = TokenBucket(rate=1, burst=1)
+        waits: list[float] = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            for _ in range(25):
+                wait = bucket.reserve()
+                with lock:
+                    waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(waits) == 100
+        assert max(waits) == pytest.approx(99, abs=0.1)
+
+    def test_processes_share_one_budget(self) -> None:
+        """Test that a shared bucket is drawn down by worker processes"""
+        bucket = TokenBucket(rate=1, burst=1, shared=True)
+        workers = [multiprocessing.Process(target=take_tokens, args=(bucket, 10)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        # 20 tokens were taken elsewhere, so the next caller queues behind them
+        assert bucket.reserve() == pytest.approx(20, abs=0.5)
+
+class TestRateScheduler:
+    """Test the RateScheduler class"""
+
+    def test_hosts_have_separate_budgets(self) -> None:
+        """Test that budgets are tracked per host"""
+        scheduler = RateScheduler()
+        scheduler.add_host("www.jumia.co.ke", rpm=61, burst=1)
+        scheduler.add_host("books.toscrape.com", rpm=61, burst=1)
+
+        assert scheduler.bucket_for("https://www.jumia.co.ke/a") is scheduler.bucket_for("https://www.jumia.co.ke/b")
+        assert scheduler.bucket_for("https://www.jumia.co.ke/a") is not scheduler.bucket_for("http://books.toscrape.com/")
+        assert scheduler.bucket_for("https://www.jumia.co.ke/a").reserve() == 0.0 # type: ignore
+        assert scheduler.bucket_for("http://books.toscrape.com/").reserve() == 0.0 # type: ignore
+
+    def test_unknown_host_without_default_is_unlimited(self) -> None:
+        """Test that hosts without a budget are not throttled"""
+        scheduler = RateScheduler()
+
+        assert scheduler.bucket_for("https://example.com/") is None
+        assert scheduler.acquire("https://example.com/") == 0.0
+
+    def test_unknown_host_gets_default_budget(self) -> None:
+        """Test that a default budget is applied to hosts on first sight"""
+        scheduler = RateScheduler(default_rpm=120, default_burst=2)
+
+        bucket = scheduler.bucket_for("https://example.com/page")
+
+        assert bucket is not None
+        assert bucket.burst == 2
+        assert bucket.rate == pytest.approx(118 / 60)
+
+    def test_scheduler_is_picklable(self) -> None:
+        """Test that a scheduler can be sent to worker processes"""
+        scheduler = RateScheduler(default_rpm=60)
+        scheduler.add_host("www.jumia.co.ke", rpm=199, burst=5)
+
+        clone = pickle.loads(pickle.dumps(scheduler))
+
+        assert clone.bucket_for("https://www.jumia.co.ke/").rate == pytest.approx(194 / 60)
+
+    def test_acquire_async(self) -> None:
+        """Test that acquire_async waits on the host's bucket"""
+        scheduler = RateScheduler()
+        scheduler.add_host("example.com", rpm=6001, burst=1)
+
+        async def run() -> list[float]:
+            return [await scheduler.acquire_async("https://example.com/") for _ in range(2)]
+
+        start = time.monotonic()
+        waits = asyncio.run(run())
+
+        assert waits[0] == 0.0
+        assert waits[1] == pytest.approx(0.01, abs=0.005)
+        assert time.monotonic() - start >= 0.009
@@ -0,0 +1,89 @@
+# test_records.py
+import sys
+
+from dedupe import product_id
+from records import (Product, ProductColumns, RowSink, Shipping, parse_cents, parse_count, parse_percent, parse_price_range,
+                     parse_rating)
+from sinks import ListSink
+
+ROW = [product_id("fridge"), "Fridge 90L", "KSh 30000", "KSh 35,000", "-14%", "Jumia Mall", "4.5", "12", "Express"]
+BARE_ROW = [product_id("kettle"), "Kettle", "KSh 1500", "", "", "", "", "", ""]
+
+class TestParsing:
+    """Test the text-to-number helpers"""
+
+    def test_money(self) -> None:
+        """Test that prices become integer cents"""
+        assert parse_cents("KSh 1,299.50") == 129950
+        assert parse_cents("KSh 30000") == 3000000
+        assert parse_cents("KSh 1,000 - KSh 2,000") == 100000
+        assert parse_cents("Â£51.77") == 5177
+        assert parse_cents("") is None
+        assert parse_price_range("KSh 1,000 - KSh 2,000") == (100000, 200000)
+        assert parse_price_range("KSh 1,000") == (100000, None)
+
+    def test_other_fields(self) -> None:
+        """Test discount, rating and review count"""
+        assert parse_percent("-23%") == 23
+        assert parse_rating("4.5 out of 5") == 4.5
+        assert parse_count("(1,204)") == 1204
+        assert (parse_percent(""), parse_rating(""), parse_count("")) == (None, None, 0)
+
+class TestProduct:
+    """Test the Product record"""
+
+    def test_from_row(self) -> None:
+        """Test that a parse_appliance_page row is parsed into typed fields"""
+        product = Product.from_row(ROW)
+
+        assert product.price_cents == 3000000 and product.old_price_cents == 3500000
+        assert (product.discount_percent, product.rating, product.reviews) == (14, 4.5, 12)
+        assert product.shipping is Shipping.EXPRESS
+        assert product.price == 30000.0
+
+    def test_round_trip(self) -> None:
+        """Test that to_row gives back the scraped layout"""
+        assert Product.from_row(BARE_ROW).to_row() == BARE_ROW
+        assert Product.from_row(ROW).to_row() == [*ROW[:3], "KSh 35000", *ROW[4:]]
+        assert Product.from_row([*BARE_ROW[:2], "KSh 1000 - KSh 2000", *BARE_ROW[3:]]).to_row()[2] == "KSh 1000 - KSh 2000"
+
+    def test_row_sink(self) -> None:
+        """Test that RowSink hands the wrapped sink the text rows"""
+        with RowSink(ListSink()) as sink:
+            sink.write_rows([Product.from_row(ROW), Product.from_row(BARE_ROW)])
+
+        assert sink.rows_written == 2
+        assert sink.rows[1] == BARE_ROW
+
+class TestProductColumns:
+    """Test the columnar batch"""
+
+    def test_round_trip(self) -> None:
+        """Test that products come back out of the columns unchanged, missing values included"""
+        products = [Product.from_row(ROW), Product.from_row(BARE_ROW), Product.from_row([*BARE_ROW[:2], "KSh 5 - KSh 9", *BARE_ROW[3:]])]
+        columns = ProductColumns(products)
+
+        assert len(columns) == 3
+        assert list(columns) == products
+        assert columns[2].price_max_cents == 900
+        assert columns[1].rating is None and columns[1].old_price_cents is None
+
+    def test_missing_price(self) -> None:
+        """Test that an unreadable price stays None through the columns and back to the row"""
+        product = Product.from_row([BARE_ROW[0], "Kettle", "", *BARE_ROW[3:]])
+
+        assert product.price_cents is None and product.price is None
+        assert ProductColumns([product])[0] == product
+        assert product.to_row()[2] == ""
+
+    def test_smaller_than_rows(self) -> None:
+        """Test that a large batch takes several times less memory than the string rows"""
+        rows = [[product_id(str(n)), f"Product {n}", f"KSh {n}", f"KSh {n + 100}", "-5%", "", "4.1", str(n % 50), ""]
+                for n in range(10_000)]
+        columns = ProductColumns.from_rows(rows)
+
+        row_bytes = sum(sys.getsizeof(row) + sum(sys.getsizeof(field) for field in row) for row in rows)
+        column_bytes = columns.nbytes() + sum(sys.getsizeof(title) for title in columns.titles)
+
+        assert sum(columns.price_cents) == sum(n * 100 for n in range(10_000))
+        assert column_bytes * 3 < row_bytes
@@ -0,0 +1,109 @@
+# test_robots.py
+import random
+import re
+import pytest
+
+from robots import RobotsRules, _trie_regex
+
+JUMIA = "https://www.jumia.co.ke"
+
+@pytest.fixture(scope="module")
+def jumia_rules() -> RobotsRules:
+    """Rules parsed from the saved jumia.robots.txt"""
+    return RobotsRules.from_file()
+
+class TestParse:
+    """Test parsing robots.txt text"""
+
+    def test_parses_jumia_file(self, jumia_rules: RobotsRules) -> None:
+        """Test that the repeated `User-agent: *` groups are merged"""
+        assert len(jumia_rules._disallow.patterns) > 150
+        assert "/mobapi/" in jumia_rules._disallow.patterns
+        assert "*--*" in jumia_rules._disallow.patterns
+        assert "/*.css" in jumia_rules._allow.patterns
+        assert jumia_rules.sitemaps == ["https://static.jumia.co.ke/index-sitemap.xml"]
+
+    def test_specific_agent_group_wins(self) -> None:
+        """Test that a group naming our bot replaces the `*` group"""
+        text = """
+        User-agent: *
+        Disallow: /
+
+        User-agent: GoodBot
+        Disallow: /private/
+        """
+        rules = RobotsRules.parse(text, user_agent="GoodBot/1.0 (+https://example.com/bot)")
+
+        assert rules.allowed("https://example.com/public/")
+        assert not rules.allowed("https://example.com/private/page")
+        assert not RobotsRules.parse(text).allowed("https://example.com/public/")
+
+    def test_empty_disallow_allows_everything(self) -> None:
+        """Test that `Disallow:` with no path blocks nothing"""
+        rules = RobotsRules.parse("User-agent: *\nDisallow:\n")
+
+        assert rules.allowed("https://example.com/anything?at=all")
+
+class TestAllowed:
+    """Test the allowed() check"""
+
+    @pytest.mark.parametrize("path,expected", [
+        ("/home-office-appliances/?page=2#catalog-listing", True),
+        ("/samsung-galaxy-a15-6gb-128gb-123456.html", True),
+        ("/mobapi/products", False),  # plain prefix
+        ("/en/phones/", False),
+        ("/phones/?color=black", False),  # "/*color=" facet
+        ("/tvs/?price=1000-2000&page=2", False),
+        ("/catalog/?q=fridge", False),  # "/*q=" site search
+        ("/samsung--lg/", False),  # "*--*" brand selectors
+        ("/samsung--lg/logo.png", True),  # "Allow: *--*.png" is longer than "*--*"
+        ("/catalog/productspecifications/sku/", True),  # Allow beats the shorter "*/catalog/"
+        ("/a/b/c/", False),  # "/*/*/*/" CSB pages
+        ("/a/b/c/theme.css", True),  # "Allow: /*/*/*/*.css"
+        ("/cart/", False),
+        ("/generic/", False),
+        ("/flash-sales/?flashsale=1", False),
+        ("/flash-sales/", True),
+    ])
+    def test_jumia_rules(self, jumia_rules: RobotsRules, path: str, expected: bool) -> None:
+        """Test known Jumia URLs against the compiled and the naive matcher"""
+        assert jumia_rules.allowed(JUMIA + path) is expected
+        assert jumia_rules.allowed_naive(JUMIA + path) is expected
+
+    def test_end_anchor(self) -> None:
+        """Test that a trailing `$` only matches at the end of the URL"""
+        rules = RobotsRules.parse("User-agent: *\nDisallow: /*.pdf$\n")
+
+        assert not rules.allowed("https://example.com/files/report.pdf")
+        assert rules.allowed("https://example.com/files/report.pdf?download=1")
+
+    def test_compiled_matches_naive_on_random_urls(self, jumia_rules: RobotsRules) -> None:
+        """Test that the compiled matcher agrees with checking every rule in turn"""
+        rng = random.Random(7)
+        pieces = ["phones", "tvs", "catalog", "mobapi", "en", "a--b", "logo.png", "x.css", "cart", "all-products",
+                  "flash-sales", "sku-1.html", "?page=2", "?color=red", "?sort=asc", "?q=tv", "&size=4", "ratingreview"]
+        urls = [JUMIA + "/" + "/".join(rng.choice(pieces) for _ in range(rng.randint(0, 4))) for _ in range(5000)]
+
+        assert [jumia_rules.allowed(url) for url in urls] == [jumia_rules.allowed_naive(url) for url in urls]
+        assert 0 < sum(jumia_rules.allowed(url) for url in urls) < len(urls)
+
+    def test_filter(self, jumia_rules: RobotsRules) -> None:
+        """Test that filter() drops disallowed URLs and keeps order"""
+        urls = [JUMIA + "/tvs/", JUMIA + "/mobapi/", JUMIA + "/phones/"]
+
+        assert list(jumia_rules.filter(urls)) == [JUMIA + "/tvs/", JUMIA + "/phones/"]
+
+class TestTrieRegex:
+    """Test the prefix-sharing regex builder"""
+
+    def test_shares_prefixes(self) -> None:
+        """Test that common prefixes are factored out"""
+        assert _trie_regex(["capacity=", "capacity_kg=", "car="]) == "ca(?:pacity(?:=|_kg=)|r=)"
+
+    def test_shorter_literal_covers_longer(self) -> None:
+        """Test that a literal that is a prefix of another still matches on its own"""
+        regex = re.compile(_trie_regex(["/en/", "/en/docs/"]))
+
+        assert regex.match("/en/other")
+        assert regex.match("/en/docs/x")
+        assert not regex.match("/fr/")
@@ -0,0 +1,115 @@
+# test_sinks.py
+import csv
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from sinks import _FileSink, CsvSink, JsonlSink, ListSink, TeeSink, open_sink, read_jsonl
+
+HEADERS = ["Title", "Price", "Description"]
+
+@pytest.fixture
+def temp_dir():
+    """Fixture providing a scratch directory"""
+    with tempfile.TemporaryDirectory() as name:
+        yield Path(name)
+
+class TestCsvSink:
+    """Test the CsvSink class"""
+
+    def test_rows_are_on_disk_after_each_page(self, temp_dir: Path) -> None:
+        """Test that write_rows flushes, so readers see a page before the sink is closed"""
+        path = temp_dir / "out.csv"
+        with CsvSink(path, HEADERS) as sink:
+            sink.write_rows([["Laptop 1", "$1", "d1"]])
+            with open(path, encoding="utf-8") as f:
+                assert list(csv.reader(f)) == [HEADERS, ["Laptop 1", "$1", "d1"]]
+            sink.write_rows([["Laptop 2", "$2", "d2"], ["Laptop 3", "$3", "d3"]])
+
+        assert sink.rows_written == 3
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+
+    def test_accepts_dict_rows(self, temp_dir: Path) -> None:
+        """Test that dict rows are written in header order"""
+        path = temp_dir / "out.csv"
+        with CsvSink(path, HEADERS) as sink:
+            sink.write_rows([{"Price": "$1", "Description": "d", "Title": "Laptop"}])
+
+        with open(path, encoding="utf-8") as f:
+            assert list(csv.reader(f))[1] == ["Laptop", "$1", "d"]
+
+    def test_append_keeps_one_header(self, temp_dir: Path) -> None:
+        """Test that reopening in append mode continues the file without a second header"""
+        path = temp_dir / "out.csv"
+        with CsvSink(path, HEADERS) as sink:
+            sink.write_rows([["a", "1", "x"]])
+        with CsvSink(path, HEADERS, append=True) as sink:
+            sink.write_rows([["b", "2", "y"]])
+
+        with open(path, encoding="utf-8") as f:
+            assert list(csv.reader(f)) == [HEADERS, ["a", "1", "x"], ["b", "2", "y"]]
+
+    def test_creates_parent_directories(self, temp_dir: Path) -> None:
+        """Test that a missing output directory is created"""
+        path = temp_dir / "nested" / "output" / "out.csv"
+        with CsvSink(path, HEADERS):
+            pass
+
+        assert path.exists()
+
+class TestJsonlSink:
+    """Test the JsonlSink class and read_jsonl"""
+
+    def test_one_object_per_row(self, temp_dir: Path) -> None:
+        """Test that each row becomes one JSON object keyed by header"""
+        path = temp_dir / "out.jsonl"
+        with JsonlSink(path, HEADERS) as sink:
+            sink.write_rows([["Laptop “1”", "$1", "d1"], ["Laptop 2", "$2", "d2"]])
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[0]) == {"Title": "Laptop “1”", "Price": "$1", "Description": "d1"}
+        assert list(read_jsonl(path))[1]["Title"] == "Laptop 2"
+
+    def test_read_skips_truncated_last_line(self, temp_dir: Path) -> None:
+        """Test that a line cut off by a crash mid-write is ignored"""
+        path = temp_dir / "out.jsonl"
+        path.write_text('{"Title": "ok"}\n{"Title": "cut', encoding="utf-8")
+
+        assert list(read_jsonl(path)) == [{"Title": "ok"}]
+
+class TestTeeSink:
+    """Test TeeSink, ListSink and open_sink"""
+
+    def test_tee_writes_every_sink(self, temp_dir: Path) -> None:
+        """Test that each page reaches all sinks"""
+        with TeeSink(open_sink(temp_dir / "out.csv", HEADERS), open_sink(temp_dir / "out.jsonl", HEADERS)) as sink:
+            sink.write_rows([["Laptop", "$1", "d"]])
+
+        assert sink.rows_written == 1
+        assert len(list(read_jsonl(temp_dir / "out.jsonl"))) == 1
+        assert len((temp_dir / "out.csv").read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_list_sink_collects_rows(self) -> None:
+        """Test that ListSink keeps rows in memory in write order"""
+        with ListSink() as sink:
+            sink.write_rows([[1], [2]])
+            sink.write_rows([[3]])
+
+        assert sink.rows == [[1], [2], [3]]
+        assert sink.rows_written == 3
+
+    def test_open_sink_rejects_unknown_format(self, temp_dir: Path) -> None:
+        """Test that an unsupported extension is reported"""
+        with pytest.raises(ValueError):
+            open_sink(temp_dir / "out.xlsx", HEADERS)
+
+    def test_file_sink_without_write_fails_when_built(self, temp_dir: Path) -> None:
+        """Test that a _FileSink subclass missing _write is rejected before it opens a file"""
+        class HalfSink(_FileSink):
+            pass
+
+        with pytest.raises(TypeError):
+            HalfSink(temp_dir / "out.txt", HEADERS)
+        assert not (temp_dir / "out.txt").exists()
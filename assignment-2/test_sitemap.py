@@ -0,0 +1,126 @@
+# test_sitemap.py
+import gzip
+import itertools
+import tracemalloc
+from pathlib import Path
+from typing import Any, Iterator
+from unittest.mock import patch
+
+import pytest
+
+from robots import RobotsRules
+import sitemap
+from sitemap import iter_entries, iter_urls
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+JUMIA = "https://www.jumia.co.ke"
+
+def urlset(urls: list[str]) -> str:
+    entries = "".join(f"<url><loc>{url}</loc><lastmod>2025-01-01</lastmod></url>" for url in urls)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{entries}</urlset>'
+
+def sitemap_index(locs: list[str]) -> str:
+    entries = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {NS}>{entries}</sitemapindex>'
+
+@pytest.fixture
+def site(tmp_path: Path) -> Path:
+    """An index pointing at one plain and one gzipped child sitemap"""
+    (tmp_path / "products-1.xml").write_text(urlset([f"{JUMIA}/fridge-{n}.html" for n in range(3)]), encoding="utf-8")
+    with gzip.open(tmp_path / "products-2.xml.gz", "wt", encoding="utf-8") as f:
+        f.write(urlset([f"{JUMIA}/cooker-{n}.html" for n in range(2)] + [f"{JUMIA}/mobapi/secret"]))
+    (tmp_path / "index-sitemap.xml").write_text(sitemap_index(["products-1.xml", "products-2.xml.gz"]), encoding="utf-8")
+    return tmp_path / "index-sitemap.xml"
+
+class TestIterEntries:
+    """Test reading one sitemap file"""
+
+    def test_urlset(self, tmp_path: Path) -> None:
+        """Test that <url><loc> entries are read in order, whitespace stripped"""
+        path = tmp_path / "sitemap.xml"
+        path.write_text(urlset(["  https://a/1  ", "https://a/2"]), encoding="utf-8")
+
+        assert list(iter_entries(str(path))) == [("url", "https://a/1"), ("url", "https://a/2")]
+
+    def test_index(self, site: Path) -> None:
+        """Test that a sitemap index lists its children"""
+        assert [kind for kind, _ in iter_entries(str(site))] == ["sitemap", "sitemap"]
+
+    def test_multi_member_gzip(self, tmp_path: Path) -> None:
+        """Test that every member of a concatenated gzip is read, across chunk boundaries"""
+        text = urlset([f"{JUMIA}/product-{n}.html" for n in range(20)])
+        middle = len(text) // 2
+        path = tmp_path / "sitemap.xml.gz"
+        path.write_bytes(gzip.compress(text[:middle].encode()) + gzip.compress(text[middle:].encode()))
+
+        with patch('sitemap.CHUNK_SIZE', 64):
+            entries = list(iter_entries(str(path)))
+
+        assert [loc for _, loc in entries] == [f"{JUMIA}/product-{n}.html" for n in range(20)]
+
+class TestIterUrls:
+    """Test walking a sitemap index"""
+
+    def test_walks_children_including_gzip(self, site: Path) -> None:
+        """Test that page URLs of every child sitemap come out, gzipped ones included"""
+        urls = list(iter_urls(str(site)))
+
+        assert urls[:3] == [f"{JUMIA}/fridge-{n}.html" for n in range(3)]
+        assert urls[3:] == [f"{JUMIA}/cooker-0.html", f"{JUMIA}/cooker-1.html", f"{JUMIA}/mobapi/secret"]
+
+    def test_filters_through_robots(self, site: Path) -> None:
+        """Test that URLs disallowed by jumia.robots.txt are skipped"""
+        urls = list(iter_urls(str(site), robots=RobotsRules.from_file()))
+
+        assert f"{JUMIA}/mobapi/secret" not in urls
+        assert len(urls) == 5
+
+    def test_is_lazy(self, site: Path) -> None:
+        """Test that the first URLs come out before later child sitemaps are opened"""
+        (site.parent / "products-2.xml.gz").unlink()
+
+        assert list(itertools.islice(iter_urls(str(site)), 3)) == [f"{JUMIA}/fridge-{n}.html" for n in range(3)]
+
+    def test_one_stream_open_at_a_time(self, site: Path) -> None:
+        """Test that an index is read to the end and closed before its children are opened"""
+        read_chunks = sitemap.read_chunks
+        open_now: list[str] = []
+        peak = 0
+
+        def tracking(location: str, scheduler: Any = None) -> Iterator[bytes]:
+            nonlocal peak
+            open_now.append(location)
+            peak = max(peak, len(open_now))
+            try:
+                yield from read_chunks(location, scheduler)
+            finally:
+                open_now.remove(location)
+
+        with patch('sitemap.read_chunks', tracking):
+            assert len(list(iter_urls(str(site)))) == 6
+
+        assert peak == 1
+
+    def test_index_loops_are_cut(self, tmp_path: Path) -> None:
+        """Test that an index listing itself is not walked forever"""
+        path = tmp_path / "index.xml"
+        path.write_text(sitemap_index(["index.xml"]), encoding="utf-8")
+
+        assert list(iter_urls(str(path))) == []
+
+    def test_memory_stays_flat(self, tmp_path: Path) -> None:
+        """Test that streaming 50k gzipped URLs keeps far less than the whole file in memory"""
+        path = tmp_path / "big.xml.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>')
+            for n in range(50_000):
+                f.write(f"<url><loc>{JUMIA}/product-{n}.html</loc><lastmod>2025-01-01</lastmod></url>")
+            f.write("</urlset>")
+
+        tracemalloc.start()
+        count = sum(1 for _ in iter_urls(str(path)))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert count == 50_000
+        assert peak < 1024 * 1024  # the uncompressed file is ~4.5 MB
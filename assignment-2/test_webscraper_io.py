@@ -1,14 +1,16 @@
 # test_webscraper_io.py
 from typing import LiteralString
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, mock_open
+from unittest.mock import ANY, Mock, patch, mock_open
 import httpx
 from pathlib import Path
 import tempfile
 import csv
 
 # Import the functions to test
-from webscraper_io import scrape_page, main, BASE_URL, OUTPUT
+from http_cache import HttpCache
+from webscraper_io import scrape_page, crawl_async, main, BASE_URL, OUTPUT
 
 class TestScrapePage:
     """Test the scrape_page function"""
@@ -145,6 +147,116 @@ class TestScrapePage:
         actual_calls = mock_get.call_args_list
         assert actual_calls == expected_calls
 
+def laptops_page_html(page_num: int, per_page: int = 2) -> str:
+    """Listing page with `per_page` laptops named after the page number"""
+    boxes = "".join(
+        f"""
+        <div class="thumbnail">
+            <div class="title" title="Laptop {page_num}-{i}">Laptop {page_num}-{i}</div>
+            <div class="price">${page_num}{i}9.99</div>
+            <div class="description">Description {page_num}-{i}</div>
+        </div>"""
+        for i in range(per_page)
+    )
+    return f"<html><body>{boxes}</body></html>"
+
+class TestCrawlAsync:
+    """Test the asyncio crawl mode"""
+
+    @staticmethod
+    def make_client(handler) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def test_crawl_async_matches_sequential_rows(self) -> None:
+        """Test that crawl_async returns the rows scrape_page would, in page order"""
+        last_page = 7
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            page_num = int(request.url.params["page"])
+            await asyncio.sleep(0.001 * (last_page - page_num))  # later pages finish first
+            if page_num > last_page:
+                return httpx.Response(200, text="<html><body></body></html>")
+            return httpx.Response(200, text=laptops_page_html(page_num))
+
+        result = asyncio.run(crawl_async(concurrency=3, client=self.make_client(handler)))
+
+        expected = []
+        for page_num in range(1, last_page + 1):
+            with patch('webscraper_io.httpx.get') as mock_get:
+                mock_get.return_value = Mock(spec=httpx.Response, text=laptops_page_html(page_num), raise_for_status=Mock())
+                expected.extend(scrape_page(page_num)) # type: ignore
+        assert result == expected
+        assert len(result) == 2 * last_page
+
+    def test_crawl_async_stops_at_first_failed_page(self) -> None:
+        """Test that a failing page ends the crawl like the sequential loop does"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            page_num = int(request.url.params["page"])
+            if page_num == 3:
+                return httpx.Response(404)
+            return httpx.Response(200, text=laptops_page_html(page_num))
+
+        result = asyncio.run(crawl_async(concurrency=4, client=self.make_client(handler)))
+
+        assert [row[0] for row in result] == ["Laptop 1-0", "Laptop 1-1", "Laptop 2-0", "Laptop 2-1"]
+
+    def test_crawl_async_uses_cache(self) -> None:
+        """Test that a repeat async crawl through a cache revalidates every page and gives the same rows"""
+        sent: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            page_num = int(request.url.params["page"])
+            sent.append(request.headers.get("If-None-Match", ""))
+            if request.headers.get("If-None-Match") == f'"{page_num}"':
+                return httpx.Response(304)
+            return httpx.Response(200, text=laptops_page_html(page_num) if page_num <= 2 else "<html></html>", headers={"ETag": f'"{page_num}"'})
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = HttpCache(cache_dir)
+            first = asyncio.run(crawl_async(concurrency=1, client=self.make_client(handler), cache=cache))
+            sent.clear()
+            second = asyncio.run(crawl_async(concurrency=1, client=self.make_client(handler), cache=cache))
+
+        assert first == second and len(first) == 4
+        assert sent == ['"1"', '"2"', '"3"']
+        assert cache.stats.revalidated == 3
+
+    def test_crawl_async_bounds_concurrency(self) -> None:
+        """Test that no more than `concurrency` requests are in flight at once"""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            page_num = int(request.url.params["page"])
+            return httpx.Response(200, text=laptops_page_html(page_num) if page_num <= 12 else "")
+
+        asyncio.run(crawl_async(concurrency=4, client=self.make_client(handler)))
+
+        assert 1 < peak <= 4
+
+    def test_crawl_async_respects_per_host_limit(self) -> None:
+        """Test that the per-host limit caps in-flight requests below the concurrency"""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            page_num = int(request.url.params["page"])
+            return httpx.Response(200, text=laptops_page_html(page_num) if page_num <= 6 else "")
+
+        asyncio.run(crawl_async(concurrency=4, per_host=2, client=self.make_client(handler)))
+
+        assert peak <= 2
+
 class TestMain:
     """Test the main function"""
     
@@ -209,7 +321,8 @@ class TestMain:
                 main()
             
             # Should only call scrape_page once
-            mock_scrape.assert_called_once_with(1)
+            mock_scrape.assert_called_once()
+            assert mock_scrape.call_args[0] == (1,)
             
             # Should not call sleep
             mock_sleep.assert_not_called()
@@ -276,6 +389,64 @@ class TestMain:
             assert temp_output_dir.exists()
             assert temp_output_file.exists()
 
+    @patch('webscraper_io.iter_pages_async')
+    @patch('webscraper_io.scrape_page')
+    def test_main_async_mode(self, mock_scrape, mock_iter_pages) -> None:
+        """Test that main uses the async crawler when a concurrency is given"""
+        async def fake_pages(concurrency: int, scheduler, backend, controller, archive, cache):
+            yield [["Laptop 1", "$999", "Description 1"]]
+            yield [["Laptop 2", "$1299", "Description 2"]]
+        mock_iter_pages.side_effect = fake_pages
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as temp_file:
+            temp_filename = temp_file.name
+
+        try:
+            with patch('webscraper_io.OUTPUT', Path(temp_filename)):
+                main(concurrency=8)
+
+            mock_iter_pages.assert_called_once_with(concurrency=8, scheduler=None, backend="html.parser", controller=ANY, archive=None,
+                                                     cache=None)
+            assert mock_iter_pages.call_args.kwargs["controller"].maximum == 8
+            mock_scrape.assert_not_called()
+
+            with open(temp_filename, 'r', encoding='utf-8') as f:
+                rows = list(csv.reader(f))
+                assert rows == [["Title", "Price", "Description"], ["Laptop 1", "$999", "Description 1"], ["Laptop 2", "$1299", "Description 2"]]
+
+        finally:
+            Path(temp_filename).unlink(missing_ok=True)
+
+    @patch('webscraper_io.scrape_page')
+    @patch('webscraper_io.time.sleep')
+    def test_main_flushes_each_page(self, mock_sleep, mock_scrape) -> None:
+        """Test that rows are on disk as soon as their page is scraped, not only at the end"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "laptops.csv"
+            seen_on_disk: list[int] = []
+
+            def scrape(page: int, **kwargs) -> list[list[str]]:
+                seen_on_disk.append(len(output.read_text(encoding="utf-8").splitlines()))
+                return [[f"Laptop {page}", "$1", "d"]] if page <= 3 else []
+            mock_scrape.side_effect = scrape
+
+            with patch('webscraper_io.OUTPUT', output):
+                main()
+
+            assert seen_on_disk == [1, 2, 3, 4]  # header, then one more row per finished page
+
+    @patch('webscraper_io.scrape_page')
+    @patch('webscraper_io.time.sleep')
+    def test_main_backend(self, mock_sleep, mock_scrape) -> None:
+        """Test that the chosen parser backend reaches every page"""
+        mock_scrape.side_effect = lambda page, **kwargs: [["Laptop", "$1", "d"]] if page == 1 else []
+
+        with tempfile.TemporaryDirectory() as temp_dir, patch('webscraper_io.OUTPUT', Path(temp_dir) / "laptops.csv"):
+            main(backend="lxml")
+
+        assert [c.kwargs["backend"] for c in mock_scrape.call_args_list] == ["lxml", "lxml"]
+
+
 # Fixtures for common test data
 @pytest.fixture
 def sample_html() -> LiteralString:
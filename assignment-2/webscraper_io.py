@@ -1,55 +1,311 @@
+import asyncio
 import httpx
-from bs4 import BeautifulSoup
-import csv
+import itertools
 import time
-from typing import Any, Optional
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, AsyncIterator, Iterator, Optional
 import pathlib
+from adaptive import AimdController, Throttled, call_with_retries, call_with_retries_async, check_response, classify
+from html_archive import HtmlArchive
+from http_cache import HttpCache
+from metrics import METRICS, MeteredSink
+from parsers import DEFAULT_BACKEND, get_backend
+from pipeline import run_pipeline
+from rate_limiter import RateScheduler
+from sinks import CsvSink
 
 BASE_URL = "https://webscraper.io/test-sites/e-commerce/static/computers/laptops?page={}"
 OUTPUT_DIR: pathlib.Path = pathlib.Path(__file__).parent / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)  # Ensure output directory exists
 OUTPUT: pathlib.Path = OUTPUT_DIR / "my_laptops.csv"
+HEADERS: list[str] = ["Title", "Price", "Description"]
+SCRAPER = "webscraper_io"  # label of this scraper's series in metrics.py
 
-def scrape_page(page_num: int) -> Optional[list[Any]]:
-    url: str = BASE_URL.format(page_num)
-    try:
-        response: httpx.Response = httpx.get(url, timeout=10)
-        response.raise_for_status()
-    except Exception as e:
-        print(f"[!] Failed to fetch page {page_num}: {e}")
-        return []  # Continue even if page fails
-    
-    soup = BeautifulSoup(response.text, features="html.parser")
+# -- Async mode: one shared httpx.AsyncClient keeps connections alive between pages,
+# so only the first request per connection pays for the TCP/TLS handshake.
+# https://www.python-httpx.org/advanced/resource-limits/
+MAX_CONCURRENCY = 5  # pages in flight at once
+MAX_PER_HOST = 5  # in-flight requests allowed against a single host
+MAX_THROTTLED_PAGES = 5  # pages skipped as still throttled after every retry before the crawl gives up
+
+def parse_page(html: str, backend: str = DEFAULT_BACKEND) -> list[Any]:
+    """Extract [title, price, description] rows from a laptops listing page.
+
+    `backend` picks the HTML parser (see parsers.py); every backend returns the same rows.
+    """
+    parser = get_backend(backend)
+    root = parser.parse(html)
 
     items = []
-    for box in soup.select(".thumbnail"):
+    for box in parser.select(root, ".thumbnail"):
         try:
-            title = box.select_one(".title")["title"].strip() # type: ignore
-            price = box.select_one(".price").text.strip() # type: ignore
-            description = box.select_one(".description").text.strip() # type: ignore
+            title = parser.attr(parser.select_one(box, ".title"), "title").strip()
+            price = parser.text(parser.select_one(box, ".price")).strip()
+            description = parser.text(parser.select_one(box, ".description")).strip()
             items.append([title, price, description])
         except Exception:
             continue
     return items
 
-def main() -> None:
-    all_items = []
-    page = 1
-    while True:
-        print(f"- Scraping page {page}")
-        data = scrape_page(page)
-        if not data:
-            break
-        all_items.extend(data)
-        page += 1
-        time.sleep(1)
-
-    with open(OUTPUT, mode="w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Title", "Price", "Description"])
-        writer.writerows(all_items)
-
-    print(f"✅ Scraped {len(all_items)} items into {OUTPUT}")
+def fetch_html(page_num: int, cache: Optional[HttpCache] = None, scheduler: Optional[RateScheduler] = None,
+               controller: Optional[AimdController] = None, archive: Optional[HtmlArchive] = None) -> Optional[str]:
+    """HTML of one listing page, None if the request failed.
+
+    With a `controller` (adaptive.py), 429s, timeouts and CAPTCHA pages are retried after a backoff;
+    a page still throttled after the last retry raises Throttled, since it isn't the end of the listing.
+    Fetched pages are added to `archive`, if given (html_archive.py).
+    """
+    url: str = BASE_URL.format(page_num)
+
+    def attempt() -> Any:
+        # Fetch threads (iter_pages_pipeline) follow the adaptive limit; the backoff sleeps outside the slot
+        with controller.slot() if controller is not None else nullcontext():
+            if scheduler:
+                scheduler.acquire(url)
+            start = time.perf_counter()
+            if cache is not None:  # conditional GET; unchanged pages come back as 304s from the cache
+                response = cache.fetch(url, httpx.get, timeout=10)
+            else:
+                response = httpx.get(url, timeout=10)
+            METRICS.record_response(SCRAPER, response, time.perf_counter() - start)
+        check_response(response)
+        response.raise_for_status()
+        return response
+
+    try:
+        response = attempt() if controller is None else call_with_retries(attempt, controller)
+    except Exception as e:
+        if not isinstance(e, (httpx.HTTPStatusError, Throttled)):
+            METRICS.record_error(SCRAPER)
+        if controller is not None and (signal := classify(e)) is not None:  # retried and still throttled
+            raise Throttled(signal.reason, signal.retry_after) from e
+        print(f"[!] Failed to fetch page {page_num}: {e}")
+        return None
+
+    if archive is not None:
+        archive.add(url, response.text, SCRAPER, response.status_code)
+    return response.text
+
+def parse_page_metered(html: str, backend: str = DEFAULT_BACKEND) -> list[Any]:
+    """parse_page, recording parse time and rows per page"""
+    start = time.perf_counter()
+    rows = parse_page(html, backend)
+    METRICS.record_page(SCRAPER, len(rows), time.perf_counter() - start)
+    return rows
+
+def scrape_page(page_num: int, backend: str = DEFAULT_BACKEND, cache: Optional[HttpCache] = None,
+                controller: Optional[AimdController] = None, archive: Optional[HtmlArchive] = None,
+                scheduler: Optional[RateScheduler] = None) -> Optional[list[Any]]:
+    html = fetch_html(page_num, cache, scheduler, controller, archive)  # every attempt, retries too, waits for the scheduler
+    if html is None:
+        return []  # Continue even if page fails; Throttled is raised, see fetch_html
+
+    return parse_page_metered(html, backend)
+
+def iter_pages_pipeline(fetch_workers: int = MAX_CONCURRENCY, parse_workers: Optional[int] = None, scheduler: Optional[RateScheduler] = None,
+                        cache: Optional[HttpCache] = None, backend: str = DEFAULT_BACKEND,
+                        controller: Optional[AimdController] = None, archive: Optional[HtmlArchive] = None) -> Iterator[list[Any]]:
+    """Pages 1, 2, ... fetched on `fetch_workers` threads and parsed on `parse_workers` processes (see pipeline.py),
+    yielded in page order until the first empty page; a page still throttled after every retry raises Throttled"""
+    fetch = partial(fetch_html, cache=cache, scheduler=scheduler, controller=controller, archive=archive)
+    return run_pipeline(itertools.count(1), fetch, partial(parse_page, backend=backend), fetch_workers, parse_workers)
+
+class HostLimiter:
+    """Caps in-flight requests per host, on top of the client's overall pool limits"""
+
+    def __init__(self, per_host: int = MAX_PER_HOST) -> None:
+        self.per_host = per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def __call__(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self._semaphores[host]
+
+def make_async_client(concurrency: int = MAX_CONCURRENCY) -> httpx.AsyncClient:
+    """Shared keep-alive client sized for `concurrency` pages in flight"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency, keepalive_expiry=30)
+    return httpx.AsyncClient(limits=limits, timeout=10)
+
+async def scrape_page_async(client: httpx.AsyncClient, page_num: int, host_limiter: Optional[HostLimiter] = None, scheduler: Optional[RateScheduler] = None, backend: str = DEFAULT_BACKEND,
+                            controller: Optional[AimdController] = None, archive: Optional[HtmlArchive] = None,
+                            cache: Optional[HttpCache] = None) -> list[Any]:
+    """Async twin of scrape_page; returns the same rows, [] on failure, and raises Throttled as fetch_html does"""
+    url: str = BASE_URL.format(page_num)
+    host_limiter = host_limiter or HostLimiter()
+
+    async def attempt() -> httpx.Response:
+        if scheduler:
+            await scheduler.acquire_async(url)
+        async with host_limiter(url):
+            start = time.perf_counter()
+            if cache is not None:  # conditional GET, as in fetch_html
+                response = await cache.fetch_async(url, client.get)
+            else:
+                response = await client.get(url)
+            METRICS.record_response(SCRAPER, response, time.perf_counter() - start)
+        check_response(response)
+        response.raise_for_status()
+        return response
+
+    try:
+        response = await call_with_retries_async(attempt, controller) if controller else await attempt()
+    except Exception as e:
+        if not isinstance(e, (httpx.HTTPStatusError, Throttled)):
+            METRICS.record_error(SCRAPER)
+        if controller is not None and (signal := classify(e)) is not None:  # retried and still throttled
+            raise Throttled(signal.reason, signal.retry_after) from e
+        print(f"[!] Failed to fetch page {page_num}: {e}")
+        return []
+
+    if archive is not None:
+        archive.add(url, response.text, SCRAPER, response.status_code)
+    return parse_page_metered(response.text, backend)
+
+async def iter_pages_async(concurrency: int = MAX_CONCURRENCY, per_host: int = MAX_PER_HOST, client: Optional[httpx.AsyncClient] = None, scheduler: Optional[RateScheduler] = None, backend: str = DEFAULT_BACKEND,
+                           controller: Optional[AimdController] = None, archive: Optional[HtmlArchive] = None,
+                           cache: Optional[HttpCache] = None) -> AsyncIterator[list[Any]]:
+    """Scrape pages 1, 2, ... concurrently until the first empty page, yielding each page's rows in page order.
+
+    Keeps up to `concurrency` pages in flight. Finished pages wait only until the
+    pages before them are done, and at most 2 x `concurrency` pages are held at once,
+    so memory stays flat however long the catalog is. A `scheduler` caps the request
+    rate on top of the concurrency limit. With a `controller` (adaptive.py) the number
+    of pages in flight follows its AIMD limit, never above `concurrency`, and pages
+    that hit a 429, timeout or CAPTCHA are retried instead of ending the crawl. A page
+    still throttled after the last retry is skipped; past MAX_THROTTLED_PAGES of those
+    the crawl raises Throttled.
+    Fetched pages are added to `archive`, if given, and go through `cache` (http_cache.py), if given.
+    """
+    host_limiter = HostLimiter(per_host)
+    owns_client = client is None
+    client = client or make_async_client(concurrency)
+
+    results: dict[int, list[Any]] = {}  # finished pages waiting for earlier ones
+    in_flight: dict[asyncio.Task, int] = {}
+    stop_at: Optional[int] = None  # first page that came back empty
+    throttled: list[int] = []  # pages skipped as still throttled after every retry
+    next_page = 1
+    next_to_yield = 1
+    window = 2 * concurrency
+
+    async def fetch(page_num: int) -> list[Any]:
+        return await scrape_page_async(client, page_num, host_limiter, scheduler, backend, controller, archive, cache)
+
+    def limit() -> int:
+        return min(concurrency, controller.limit) if controller else concurrency
+
+    try:
+        while True:
+            while (len(in_flight) < limit() and next_page < next_to_yield + window
+                   and (stop_at is None or next_page < stop_at)):
+                print(f"- Scraping page {next_page}")
+                in_flight[asyncio.create_task(fetch(next_page))] = next_page
+                next_page += 1
+            if not in_flight:
+                break
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page_num = in_flight.pop(task)
+                try:
+                    rows = task.result()
+                except Throttled as e:
+                    throttled.append(page_num)
+                    if len(throttled) > MAX_THROTTLED_PAGES:
+                        raise
+                    print(f"[!] Skipping page {page_num}, still throttled after retries: {e}")
+                    results[page_num] = []  # a failed page, not the end of the catalog
+                    continue
+                if rows:
+                    results[page_num] = rows
+                elif stop_at is None or page_num < stop_at:
+                    stop_at = page_num
+
+            # Pages past the end of the catalog don't need to finish
+            if stop_at is not None:
+                for task, page_num in list(in_flight.items()):
+                    if page_num > stop_at:
+                        task.cancel()
+                        del in_flight[task]
+
+            while next_to_yield in results:
+                rows = results.pop(next_to_yield)
+                if rows:
+                    yield rows
+                next_to_yield += 1
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if owns_client:
+            await client.aclose()
+
+async def crawl_async(concurrency: int = MAX_CONCURRENCY, per_host: int = MAX_PER_HOST, client: Optional[httpx.AsyncClient] = None, scheduler: Optional[RateScheduler] = None, backend: str = DEFAULT_BACKEND,
+                      controller: Optional[AimdController] = None, archive: Optional[HtmlArchive] = None,
+                      cache: Optional[HttpCache] = None) -> list[Any]:
+    """All rows from iter_pages_async, i.e. exactly what the sequential loop in main() collects"""
+    pages = iter_pages_async(concurrency, per_host, client, scheduler, backend, controller, archive, cache)
+    return [row async for rows in pages for row in rows]
+
+async def write_pages_async(sink: Any, concurrency: int = MAX_CONCURRENCY, scheduler: Optional[RateScheduler] = None,
+                            controller: Optional[AimdController] = None, archive: Optional[HtmlArchive] = None,
+                            backend: str = DEFAULT_BACKEND, cache: Optional[HttpCache] = None) -> int:
+    """Stream the async crawl into `sink` page by page; returns the number of rows written"""
+    written = 0
+    async for rows in iter_pages_async(concurrency=concurrency, scheduler=scheduler, backend=backend, controller=controller, archive=archive,
+                                       cache=cache):
+        written += sink.write_rows(rows)
+    return written
+
+def main(concurrency: Optional[int] = None, scheduler: Optional[RateScheduler] = None, cache: Optional[HttpCache] = None,
+         parse_workers: Optional[int] = None, metrics_file: Optional[pathlib.Path] = None, controller: Optional[AimdController] = None,
+         archive: Optional[HtmlArchive] = None, backend: str = DEFAULT_BACKEND) -> None:
+    """Scrape every laptops page into OUTPUT; `metrics_file` (.prom or .json) receives the run's metrics (see metrics.py).
+
+    Throttled pages are retried and concurrency adapts to them (adaptive.py); `concurrency` is the upper bound.
+    A page still throttled after the last retry is skipped and reported rather than taken for the last page.
+    Pass an `archive` (html_archive.HtmlArchive) to keep every fetched page for offline re-parsing.
+    `backend` picks the HTML parser in every mode (see parsers.py); "lxml" is the fastest.
+    """
+    controller = controller or AimdController(maximum=concurrency or MAX_CONCURRENCY)
+    throttled: list[int] = []  # sequential mode: pages skipped as still throttled after every retry
+    # Rows are appended and flushed page by page; a crash keeps every finished page
+    with MeteredSink(CsvSink(OUTPUT, HEADERS), SCRAPER) as sink:
+        if parse_workers:
+            for rows in iter_pages_pipeline(concurrency or MAX_CONCURRENCY, parse_workers, scheduler, cache, backend,
+                                            controller=controller, archive=archive):
+                METRICS.record_page(SCRAPER, len(rows))  # parsed in another process; no parse time here
+                sink.write_rows(rows)
+        elif concurrency:
+            asyncio.run(write_pages_async(sink, concurrency=concurrency, scheduler=scheduler, controller=controller,
+                                          archive=archive, backend=backend, cache=cache))
+        else:
+            fetch_page = partial(scrape_page, backend=backend, cache=cache, controller=controller, archive=archive, scheduler=scheduler)
+            page = 1
+            while True:
+                print(f"- Scraping page {page}")
+                try:
+                    data = fetch_page(page)
+                except Throttled as e:
+                    throttled.append(page)
+                    if len(throttled) > MAX_THROTTLED_PAGES:
+                        raise
+                    print(f"[!] Skipping page {page}, still throttled after retries: {e}")
+                else:
+                    if not data:
+                        break
+                    sink.write_rows(data)
+                page += 1
+                if not scheduler:
+                    time.sleep(1)
+
+    print(f"✅ Scraped {sink.rows_written} items into {OUTPUT}")
+    if throttled:
+        print(f"[!] Pages still throttled after retries, not scraped: {throttled}")
+    if metrics_file:
+        print(f"📊 Metrics written to {METRICS.write(metrics_file)}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,90 @@
+import pathlib
+from datetime import datetime
+from typing import Any, Optional
+
+import polars as pl
+
+from normalize import money
+from parquet_store import PARQUET_DIR
+
+# -- Lazy analytics over the scraped books: https://docs.pola.rs/user-guide/lazy/
+# The notebook reads every category CSV into pandas, drops Title / URL / Availability,
+# strips 'Â' from Price and then computes the statistics cell by cell. Here the same
+# numbers come from one lazy query plan. polars only reads the Price and Star Rating
+# columns (projection pushdown), applies filters while scanning (predicate pushdown),
+# and aggregates with the streaming engine, which keeps memory flat however many
+# categories and runs are on disk.
+#
+#   books = scan_history()                  # or scan_csvs(OUTPUT_DIR)
+#   category_stats(books)                   # Total Books / Average Price / Average Rating per category
+#   overall_stats(books)                    # the notebook's "Overall Basic Statistics"
+#   rating_counts(books)                    # the Category x Star Rating heatmap
+#   plot_frame(books)                       # Category / Price / Star Rating for the box plots and histograms
+
+CSV_DIR: pathlib.Path = pathlib.Path(__file__).parent / "output"
+
+def _category_label(column: pl.Expr) -> pl.Expr:
+    """"historical_fiction" -> "Historical Fiction", as the notebook labels its plots"""
+    return column.str.replace_all("_", " ").str.to_titlecase()
+
+def scan_history(folder: pathlib.Path = PARQUET_DIR, latest_only: bool = True, since: Optional[datetime] = None) -> pl.LazyFrame:
+    """Books from the Parquet dataset (parquet_store.py).
+
+    `latest_only` keeps each category's most recent run, so the history doesn't double count;
+    `since` drops runs scraped before it (pushed down into the scan).
+    """
+    lf = pl.scan_parquet(pathlib.Path(folder) / "**" / "*.parquet", hive_partitioning=True)
+    if since is not None:
+        lf = lf.filter(pl.col("scraped_at") >= since)
+    if latest_only:
+        lf = lf.filter(pl.col("scraped_at") == pl.col("scraped_at").max().over("category"))
+    return lf.select(
+        _category_label(pl.col("category")).alias("Category"),
+        pl.col("Price"),
+        pl.col("Star Rating"),
+        pl.col("scraped_at"),
+    )
+
+def scan_csvs(folder: pathlib.Path = CSV_DIR) -> pl.LazyFrame:
+    """Books from the per-category CSVs written by books_scraper.save_to_csv"""
+    lf = pl.scan_csv(
+        pathlib.Path(folder) / "*.csv",
+        schema_overrides={"Price": pl.String, "Star Rating": pl.Int8},
+        include_file_paths="path",
+    )
+    return lf.select(
+        _category_label(pl.col("path").str.extract(r"([^/\\]+)\.csv$")).alias("Category"),
+        money(pl.col("Price")).alias("Price"),
+        pl.col("Star Rating"),
+    )
+
+def category_stats(books: pl.LazyFrame) -> pl.DataFrame:
+    """Total books, average price and average rating per category"""
+    return (
+        books.group_by("Category")
+        .agg(
+            pl.len().alias("Total Books"),
+            pl.col("Price").mean().alias("Average Price"),
+            pl.col("Star Rating").cast(pl.Float64).mean().alias("Average Rating"),
+        )
+        .sort("Category")
+        .collect(engine="streaming")
+    )
+
+def overall_stats(books: pl.LazyFrame) -> dict[str, Any]:
+    """Totals and averages across every category"""
+    return books.select(
+        pl.len().alias("Total Books"),
+        pl.col("Price").mean().alias("Average Price"),
+        pl.col("Star Rating").cast(pl.Float64).mean().alias("Average Rating"),
+    ).collect(engine="streaming").row(0, named=True)
+
+def rating_counts(books: pl.LazyFrame) -> pl.DataFrame:
+    """Books per Category x Star Rating, one column per rating (0 where none)"""
+    counts = books.group_by("Category", "Star Rating").agg(pl.len()).collect(engine="streaming")
+    table = counts.pivot(on="Star Rating", index="Category", values="len", sort_columns=True).fill_null(0)
+    return table.sort("Category")
+
+def plot_frame(books: pl.LazyFrame) -> pl.DataFrame:
+    """Category, Price and Star Rating columns only, ready for seaborn (`.to_pandas()`)"""
+    return books.select("Category", "Price", "Star Rating").collect(engine="streaming")
@@ -0,0 +1,265 @@
+import csv # for csv file operations
+import pathlib
+import time
+from typing import Any, Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+from crawl_journal import CrawlJournal
+from page_memo import PageMemo
+from parquet_store import PARQUET_DIR, category_slug, write_category
+
+# -- Capstone scraping logic for http://books.toscrape.com/, lifted out of
+# Capstone_Project_Group_7_FINAL.ipynb so it can be imported, tested and reused.
+# The notebook cells document each function step by step; see also the README.
+
+BASE_URL = "http://books.toscrape.com/" # one base to request multiple URLs/pages without repeating too many times
+HEADERS = {"User-Agent": "ScraperBotbyLisaDennisandWayne"} # a request header; carries info about the request; for scraping rules
+SLEEP_TIME = 1  # seconds between requests; some delays for respecting sites
+FIELDNAMES: list[str] = ["Title", "Price", "Availability", "Star Rating", "URL"]
+SCRAPER = "books"  # label of this scraper's series in the metrics
+
+OUTPUT_DIR: pathlib.Path = pathlib.Path(__file__).parent / "output"
+OUTPUT_DIR.mkdir(exist_ok=True)  # Ensure output directory exists
+
+# -- A soup is a site's html as a string
+def get_soup(url: str, scheduler: Any = None, cache: Any = None, memo: Optional[PageMemo] = None, metrics: Any = None,
+             archive: Any = None) -> Optional[BeautifulSoup]:
+    """Fetch `url` and parse it; None on any error.
+
+    `scheduler` is anything with an `acquire(url)` method, e.g. the
+    assignment-2 `rate_limiter.RateScheduler`; it is asked for a request slot first.
+    `cache` is e.g. an assignment-2 `http_cache.HttpCache`; unchanged pages then cost a 304
+    (or nothing, within its ttl) instead of a full download.
+    `memo` (page_memo.PageMemo) returns pages parsed earlier in the crawl without a request.
+    `metrics` (e.g. an assignment-2 `metrics.Metrics`) records fetch latency, size, status and parse time.
+    `archive` (e.g. an assignment-2 `html_archive.HtmlArchive`) keeps the raw HTML, to re-parse offline later.
+    """
+    if memo is not None and (soup := memo.get(url)) is not None:
+        return soup
+    try:
+        if cache is not None:
+            start = time.perf_counter()  # the cache asks the scheduler itself, so its wait is included here
+            response = cache.fetch(url, requests.get, scheduler=scheduler, headers=HEADERS) # conditional GET
+        else:
+            if scheduler is not None:
+                scheduler.acquire(url) # waits for the rate budget before hitting the site
+            start = time.perf_counter()
+            response = requests.get(url, headers=HEADERS) # gets the HTML as raw html using the headers
+        if metrics is not None:
+            metrics.record_response(SCRAPER, response, time.perf_counter() - start)
+        response.raise_for_status() # raises error if any with http error code
+        if archive is not None:
+            archive.add(url, response.text, SCRAPER, response.status_code)
+        start = time.perf_counter()
+        soup = BeautifulSoup(response.text, "html.parser") # the soup and the parser to use
+        if metrics is not None:
+            metrics.record_parse(SCRAPER, time.perf_counter() - start)
+        if memo is not None:
+            memo.put(url, soup)
+        return soup
+
+        # This except block handles any error with the requests function for example invalid urls
+    except requests.exceptions.RequestException as e:
+        if metrics is not None and not isinstance(e, requests.exceptions.HTTPError):
+            metrics.record_error(SCRAPER)
+        print(f"[ERROR] Failed to fetch {url} - {e}")
+        return None
+    except Exception as ex:
+        print(f"[ERROR] Encountered ambiguous error: - {ex}")
+        return None
+
+# Not essential
+def convert_star_rating(star_str: str) -> int:
+    """Map the star-rating class word ("One" ... "Five") to an int, 0 if unknown"""
+    stars = {
+        "One": 1, "Two": 2, "Three": 3,
+        "Four": 4, "Five": 5
+    }
+    return stars.get(star_str, 0)
+
+# -- This function is tailored the books to scrape site
+def extract_product_info(product) -> Optional[dict[str, Any]]:
+    """Title, price, availability, star rating and URL of one `article.product_pod` card"""
+    try:
+        title = product.h3.a['title'].strip()
+        relative_url = product.h3.a['href']
+        product_url = BASE_URL + 'catalogue/' + relative_url.replace('../../../', '')
+        price = product.select_one('.price_color').text.strip().replace('£', '')
+        availability = product.select_one('.availability').text.strip()
+        star_class = product.select_one('.star-rating')['class']
+        star_rating = convert_star_rating(star_class[1]) # converts html star elements into a rating
+
+        return {
+            "Title": title,
+            "Price": price,
+            "Availability": availability,
+            "Star Rating": star_rating,
+            "URL": product_url
+        }
+    except Exception as e: # uses Python's base Exception which handles all exceptions
+        print(f"[ERROR] Failed to parse product info - {e}")
+        return None
+
+# Getting categories in the first place from homepage
+def get_categories(scheduler: Any = None, cache: Any = None, memo: Optional[PageMemo] = None, metrics: Any = None,
+                   archive: Any = None) -> dict[str, str]:
+    """Category name -> category URL, from the homepage sidebar"""
+    soup = get_soup(BASE_URL, scheduler, cache, memo, metrics, archive) # get the soup of the homepage
+    if not soup:
+        return {}
+
+    category_links = soup.select('.side_categories ul li ul li a') # from the soup get the list and urls of categories
+    categories = {} # dictionary for category name and url
+    for a in category_links:
+        name = a.text.strip()
+        rel_url = a['href'] # e.g '/catalogue/category/books_1/index.html'
+        full_url = BASE_URL + rel_url # add base url to relative url
+        categories[name] = full_url
+    return categories
+
+# Pagination function; made possible by inspection
+def category_page_urls(category_url: str, soup: BeautifulSoup) -> list[str]:
+    """All paginated URLs of a category, read from the `.current` pager of its first page"""
+    pages = [category_url]
+    pager = soup.select_one('.current') # select current page
+    if pager:
+        total_pages = int(pager.text.strip().split()[-1]) # get no. of pages
+        for page_num in range(2, total_pages + 1):
+            paginated_url = category_url.replace('index.html', f'page-{page_num}.html') # replace current page with page no.s
+            pages.append(paginated_url)
+    return pages
+
+def get_category_pages(category_url: str, scheduler: Any = None, cache: Any = None, memo: Optional[PageMemo] = None,
+                       metrics: Any = None, archive: Any = None) -> list[str]:
+    """All paginated URLs of a category, read from the `.current` pager"""
+    soup = get_soup(category_url, scheduler, cache, memo, metrics, archive)
+    if not soup:
+        return []
+    return category_page_urls(category_url, soup)
+
+def extract_products(soup: BeautifulSoup) -> list[dict[str, Any]]:
+    """Rows for every product card on a category page"""
+    rows = []
+    products = soup.select('article.product_pod') # find a product card
+    for product in products:
+        info = extract_product_info(product) # from product extract info e.g title and price
+        if info:
+            rows.append(info)
+    return rows
+
+def parse_category_page(html: str) -> list[dict[str, Any]]:
+    """extract_products from raw HTML, e.g. a page re-read from an HTML archive"""
+    return extract_products(BeautifulSoup(html, "html.parser"))
+
+def save_to_csv(category: str, data: list[dict[str, Any]], folder: pathlib.Path = OUTPUT_DIR) -> None:
+    """Write one category's books to `<folder>/<category>.csv`"""
+    filename = f"{folder}/{category_slug(category)}.csv"
+    with open(filename, "w", newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        for row in data:
+            writer.writerow(row)
+    print(f"[SUCCESS] Saved {len(data)} items to {filename}")
+
+def save_to_parquet(category: str, data: list[dict[str, Any]], folder: pathlib.Path = PARQUET_DIR) -> None:
+    """Append one scrape of a category to the Parquet dataset (see parquet_store.py)"""
+    path = write_category(category, data, folder)
+    print(f"[SUCCESS] Saved {len(data)} items to {path}")
+
+# Scrape category...
+def scrape_category(category_name: str, category_url: str, scheduler: Any = None, cache: Any = None, journal: Any = None,
+                    formats: tuple[str, ...] = ("csv",), memo: Optional[PageMemo] = None, metrics: Any = None,
+                    archive: Any = None) -> list[dict[str, Any]]:
+    """Scrape every page of a category and save it in each of `formats` ("csv", "parquet").
+
+    Without a `scheduler` it sleeps SLEEP_TIME after each page, as the notebook does.
+    With a `journal` (crawl_journal.CrawlJournal) each finished page is checkpointed, and
+    pages finished by an earlier, interrupted run are replayed instead of fetched again.
+    The first page, fetched to read the pager, is kept in `memo` until it is scraped, so it isn't downloaded twice;
+    the other pages are read once and never memoized.
+    `metrics` also receives rows per page and the time spent saving; `archive` gets every fetched page.
+    """
+    if memo is None:
+        memo = PageMemo()
+    print(f"\n[INFO] Scraping category: {category_name}")
+    all_data = []
+    pages = journal.pages_of(category_name) if journal else None
+    if pages is None:
+        pages = get_category_pages(category_url, scheduler, cache, memo, metrics, archive) # all pages in category to be scraped
+        if journal and pages:
+            journal.record_pages(category_name, pages)
+
+    failed = False
+    for page_url in pages:
+        done_rows = journal.page_rows(page_url) if journal else None
+        if done_rows is not None:
+            print(f"[INFO] Already scraped page: {page_url}")
+            all_data.extend(done_rows)
+            continue
+
+        print(f"[INFO] Scraping page: {page_url}")
+        # the first page is kept from the pager lookup and not needed in the memo after this; the others were never memoized
+        soup = memo.pop(page_url) if page_url == pages[0] else None
+        if soup is None:
+            soup = get_soup(page_url, scheduler, cache, None, metrics, archive) # get the soup
+        if not soup:
+            failed = True
+            continue
+
+        page_data = extract_products(soup)
+        if metrics is not None:
+            metrics.record_page(SCRAPER, len(page_data))
+        all_data.extend(page_data)
+        if journal:
+            journal.page_done(page_url, page_data)
+        if scheduler is None:
+            time.sleep(SLEEP_TIME)
+
+    start = time.perf_counter()
+    if "csv" in formats:
+        save_to_csv(category_name, all_data)
+    if "parquet" in formats:
+        save_to_parquet(category_name, all_data)
+    if metrics is not None:
+        metrics.record_write(SCRAPER, time.perf_counter() - start)
+    if journal and pages and not failed:  # failed pages are retried on the next run
+        journal.category_done(category_name)
+    return all_data
+
+def main(limit: Optional[int] = 10, scheduler: Any = None, cache: Any = None, journal: Any = None,
+         formats: tuple[str, ...] = ("csv",), memo: Optional[PageMemo] = None, metrics: Any = None, store: Any = None,
+         archive: Any = None) -> None:
+    """Scrape the first `limit` categories (all of them when `limit` is None).
+
+    Pass a `journal` (crawl_journal.CrawlJournal) to resume where an interrupted run stopped.
+    One `memo` (page_memo.PageMemo) is shared by the whole crawl; its `stats` count the saved requests.
+    Pass `metrics` (an assignment-2 `metrics.Metrics`) to see where the crawl time goes.
+    A `store` (an assignment-2 `price_store.PriceStore`) records every book's price as one run,
+    keyed by URL; categories skipped via the journal are not part of that run.
+    An `archive` (an assignment-2 `html_archive.HtmlArchive`) keeps every fetched page; re-run
+    `parse_category_page` over it after a selector change instead of crawling again.
+    """
+    if memo is None:
+        memo = PageMemo()
+    categories = get_categories(scheduler, cache, memo, metrics, archive) # get all categories
+    if not categories:
+        print("[ERROR] No categories found.")
+        return
+
+    run_id = store.start_run(SCRAPER) if store is not None else None
+    selected_categories = list(categories.items())[:limit]
+    for category_name, category_url in selected_categories: # name is key, url is value
+        if journal and journal.is_category_done(category_name):
+            print(f"[INFO] Skipping finished category: {category_name}")
+            continue
+        rows = scrape_category(category_name, category_url, scheduler, cache, journal, formats, memo, metrics, archive) # scrape and write to csv
+        if store is not None:
+            store.add(run_id, [(row["URL"], row["Title"], row["Price"], row["URL"]) for row in rows]) # (key, title, price, url)
+    if store is not None:
+        store.finish_run(run_id)
+
+if __name__ == "__main__":
+    with CrawlJournal() as journal:
+        main(journal=journal)
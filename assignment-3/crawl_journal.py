@@ -0,0 +1,107 @@
+import json
+import os
+import pathlib
+from typing import Any, Optional
+
+# -- Checkpoint / resume for the category crawl
+# The journal is a JSON Lines file (one JSON object per line) that is only ever appended to:
+#   {"category": "Travel", "pages": [url, ...]}     the category's page list, once known
+#   {"page": url, "rows": [{...}, ...]}              a page was scraped; its rows
+#   {"category": "Travel", "done": true}             the category's CSV was written
+# Checkpointing a page costs one short write + flush, not a rewrite of anything. A restarted
+# run reads the journal back, skips finished categories, and replays finished pages
+# from their stored rows instead of downloading them again. A line cut off by a crash is ignored.
+# On open, entries for pages of finished categories are dropped (compaction), so the
+# file only grows with the work still in progress.
+
+JOURNAL_FILE: pathlib.Path = pathlib.Path(__file__).parent / "output" / "crawl_journal.jsonl"
+
+class CrawlJournal:
+    """Persistent record of finished categories and pages"""
+
+    def __init__(self, path: pathlib.Path | str = JOURNAL_FILE, fsync: bool = False) -> None:
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self.done_categories: set[str] = set()
+        self.category_pages: dict[str, list[str]] = {}
+        self.pages: dict[str, list[dict[str, Any]]] = {}  # page URL -> rows, for unfinished categories
+        self._load()
+        self._file = open(self.path, mode="a", encoding="utf-8")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        entries = 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # half-written last line
+                entries += 1
+                if "page" in entry:
+                    self.pages[entry["page"]] = entry["rows"]
+                elif entry.get("done"):
+                    self.done_categories.add(entry["category"])
+                elif "pages" in entry:
+                    self.category_pages[entry["category"]] = entry["pages"]
+
+        for category in self.done_categories:  # their rows are in the CSVs now
+            for url in self.category_pages.pop(category, []):
+                self.pages.pop(url, None)
+        if entries > len(self.done_categories) + len(self.category_pages) + len(self.pages):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the journal with only the entries a resume still needs"""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for category in sorted(self.done_categories):
+                f.write(json.dumps({"category": category, "done": True}) + "\n")
+            for category, pages in self.category_pages.items():
+                f.write(json.dumps({"category": category, "pages": pages}) + "\n")
+            for url, rows in self.pages.items():
+                f.write(json.dumps({"page": url, "rows": rows}, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        if self.fsync:  # survive a machine crash too, at the cost of a disk sync per page
+            os.fsync(self._file.fileno())
+
+    def is_category_done(self, category: str) -> bool:
+        return category in self.done_categories
+
+    def pages_of(self, category: str) -> Optional[list[str]]:
+        """The category's page list from an earlier run, if any"""
+        return self.category_pages.get(category)
+
+    def record_pages(self, category: str, pages: list[str]) -> None:
+        self.category_pages[category] = pages
+        self._append({"category": category, "pages": pages})
+
+    def page_rows(self, url: str) -> Optional[list[dict[str, Any]]]:
+        """Rows of a page finished in an earlier run, or None"""
+        return self.pages.get(url)
+
+    def page_done(self, url: str, rows: list[dict[str, Any]]) -> None:
+        self.pages[url] = rows
+        self._append({"page": url, "rows": rows})
+
+    def category_done(self, category: str) -> None:
+        self.done_categories.add(category)
+        for url in self.category_pages.pop(category, []):
+            self.pages.pop(url, None)
+        self._append({"category": category, "done": True})
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "CrawlJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,250 @@
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from books_scraper import (
+    SCRAPER,
+    SLEEP_TIME,
+    category_page_urls,
+    extract_products,
+    get_categories,
+    get_soup,
+    save_to_csv,
+    save_to_parquet,
+)
+from crawl_journal import CrawlJournal
+
+# -- Crawl frontier: the queue of URLs still to visit, drained by several workers at once.
+# Instead of category -> its pages -> next category, one after the other, every known URL
+# goes into a priority queue:
+#   INDEX (0): a category's first page; it lists the other pages, so it fans out the work
+#   PAGE  (1): the remaining pagination pages
+# A URL enters the queue only once, however often it is discovered. Bounded worker threads
+# pop the most urgent URL and fetch it, so many slow responses overlap instead of queueing.
+# Politeness stays as it was: requests start at most once per SLEEP_TIME across all workers
+# (or as the `scheduler` allows), and the pager is no longer fetched twice per category.
+# A category is saved as soon as its last page is in, with rows in page order.
+
+INDEX, PAGE = 0, 1
+DEFAULT_WORKERS = 8
+
+@dataclass(order=True)
+class Task:
+    priority: int
+    seq: int
+    url: str = field(compare=False)
+    category: str = field(compare=False)
+    page_num: int = field(compare=False)
+
+class Frontier:
+    """Thread-safe priority queue of URLs with dedupe; pop() returns None once all work is done"""
+
+    def __init__(self) -> None:
+        self._heap: list[Task] = []
+        self._seen: set[str] = set()
+        self._seq = itertools.count()
+        self._active = 0  # tasks popped but not yet finished; they may still push more
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def push(self, priority: int, url: str, category: str, page_num: int) -> bool:
+        """Queue `url`; False if it was queued before"""
+        url = url.split("#")[0]
+        with self._cond:
+            if url in self._seen:
+                return False
+            self._seen.add(url)
+            heapq.heappush(self._heap, Task(priority, next(self._seq), url, category, page_num))
+            self._cond.notify()
+            return True
+
+    def pop(self) -> Optional[Task]:
+        with self._cond:
+            while not self._heap:
+                if self._active == 0 or self._closed:
+                    return None
+                self._cond.wait()
+            self._active += 1
+            return heapq.heappop(self._heap)
+
+    def task_done(self) -> None:
+        with self._cond:
+            self._active -= 1
+            if self._active == 0 and not self._heap:
+                self._cond.notify_all()  # wake idle workers so they can exit
+
+    def close(self) -> None:
+        """Stop handing out work, e.g. after Ctrl+C"""
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+class MinInterval:
+    """Lets requests start at most once every `interval` seconds, across threads"""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str = "") -> float:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        wait = start - now
+        if wait > 0:
+            time.sleep(wait)  # outside the lock, so other threads can book their slots
+        return wait
+
+class CategoryCrawl:
+    """Scrape many categories concurrently through a Frontier.
+
+    `scheduler` (anything with `acquire(url)`) sets the request budget; by default requests
+    start once per SLEEP_TIME, the notebook's pace. `cache`, `journal`, `metrics` and `archive` work as in books_scraper.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, scheduler: Any = None, cache: Any = None, journal: Any = None,
+                 formats: tuple[str, ...] = ("csv",), metrics: Any = None, archive: Any = None) -> None:
+        self.workers = workers
+        self.scheduler = scheduler or MinInterval(SLEEP_TIME)
+        self.cache = cache
+        self.journal = journal
+        self.formats = formats
+        self.metrics = metrics
+        self.archive = archive
+        self.frontier = Frontier()
+        self.results: dict[str, list[dict[str, Any]]] = {}
+        self._pages: dict[str, dict[int, list[dict[str, Any]]]] = {}  # category -> page number -> rows
+        self._remaining: dict[str, int] = {}  # category -> pages not finished yet
+        self._failed: set[str] = set()
+        self._lock = threading.Lock()  # guards the dicts above and the journal
+
+    def _seed(self, category: str, url: str) -> None:
+        self._pages[category] = {}
+        pages = self.journal.pages_of(category) if self.journal else None
+        if pages:  # page list known from an interrupted run
+            self._remaining[category] = len(pages)
+            for page_num, page_url in enumerate(pages, start=1):
+                if not self.frontier.push(PAGE, page_url, category, page_num):
+                    self._remaining[category] -= 1  # already queued elsewhere
+        else:
+            self._remaining[category] = 1
+            self.frontier.push(INDEX, url, category, 1)
+
+    def _handle(self, task: Task) -> None:
+        rows = self.journal.page_rows(task.url) if self.journal else None
+        if rows is None:
+            print(f"[INFO] Scraping page: {task.url}")
+            soup = get_soup(task.url, self.scheduler, self.cache, metrics=self.metrics, archive=self.archive)
+            if soup is None:
+                self._fail(task)
+                return
+            rows = extract_products(soup)
+            if self.metrics is not None:
+                self.metrics.record_page(SCRAPER, len(rows))
+            if task.priority == INDEX:
+                pages = category_page_urls(task.url, soup)
+                with self._lock:
+                    self._remaining[task.category] += len(pages) - 1
+                    if self.journal:
+                        self.journal.record_pages(task.category, pages)
+                for page_num, page_url in enumerate(pages[1:], start=2):
+                    if not self.frontier.push(PAGE, page_url, task.category, page_num):
+                        with self._lock:
+                            self._remaining[task.category] -= 1  # already queued elsewhere
+            self._page_finished(task, rows, record=True)
+        else:
+            self._page_finished(task, rows, record=False)
+
+    def _page_finished(self, task: Task, rows: list[dict[str, Any]], record: bool) -> None:
+        with self._lock:
+            if record and self.journal:
+                self.journal.page_done(task.url, rows)
+            self._pages[task.category][task.page_num] = rows
+            self._remaining[task.category] -= 1
+            if self._remaining[task.category]:
+                return
+            pages = self._pages.pop(task.category)
+            if task.category in self._failed:  # keep the last good output; the journal retries it next run
+                print(f"[!] {task.category} had pages that failed; not saved")
+                return
+            data = [row for page_num in sorted(pages) for row in pages[page_num]]
+            self.results[task.category] = data
+        self._save(task.category, data)
+
+    def _fail(self, task: Task) -> None:
+        """Mark `task`'s category failed and, unless it was already counted, count the page as finished"""
+        with self._lock:
+            self._failed.add(task.category)
+            pages = self._pages.get(task.category)
+            if pages is None or task.page_num in pages:
+                return
+        self._page_finished(task, [], record=False)
+
+    def _save(self, category: str, data: list[dict[str, Any]]) -> None:
+        start = time.perf_counter()
+        if "csv" in self.formats:
+            save_to_csv(category, data)
+        if "parquet" in self.formats:
+            save_to_parquet(category, data)
+        if self.metrics is not None:
+            self.metrics.record_write(SCRAPER, time.perf_counter() - start)
+        with self._lock:
+            if self.journal:
+                self.journal.category_done(category)
+
+    def _worker(self) -> None:
+        while (task := self.frontier.pop()) is not None:
+            try:
+                self._handle(task)
+            except Exception as e:
+                print(f"[ERROR] Failed to process {task.url} - {e}")
+                self._fail(task)
+            finally:
+                self.frontier.task_done()
+
+    def run(self, categories: dict[str, str]) -> dict[str, list[dict[str, Any]]]:
+        """Scrape `categories` (name -> URL); returns name -> rows"""
+        for category, url in categories.items():
+            if self.journal and self.journal.is_category_done(category):
+                print(f"[INFO] Skipping finished category: {category}")
+                continue
+            self._seed(category, url)
+
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)  # wakes up for Ctrl+C
+        except KeyboardInterrupt:
+            self.frontier.close()
+            raise
+        return self.results
+
+def crawl_all(limit: Optional[int] = None, workers: int = DEFAULT_WORKERS, scheduler: Any = None, cache: Any = None,
+              journal: Any = None, formats: tuple[str, ...] = ("csv",), metrics: Any = None,
+              archive: Any = None) -> dict[str, list[dict[str, Any]]]:
+    """Concurrent books_scraper.main: every category (or the first `limit`) through one frontier"""
+    crawl = CategoryCrawl(workers, scheduler, cache, journal, formats, metrics, archive)
+    categories = get_categories(crawl.scheduler, cache, metrics=metrics, archive=archive)
+    if not categories:
+        print("[ERROR] No categories found.")
+        return {}
+    selected = dict(list(categories.items())[:limit])
+    return crawl.run(selected)
+
+if __name__ == "__main__":
+    with CrawlJournal() as journal:
+        results = crawl_all(journal=journal)
+    print(f"[SUCCESS] Scraped {sum(len(rows) for rows in results.values())} books in {len(results)} categories")
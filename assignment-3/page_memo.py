@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# -- Fetch-once memo: https://docs.python.org/3/library/collections.html#collections.OrderedDict
+# The crawl asks for some URLs more than once: a category's first page is fetched to read
+# its pager and then again to scrape its books, and the homepage is fetched for every
+# get_categories() call. PageMemo keeps the most recently used parsed pages in memory,
+# keyed by URL, so the second request for a page is answered without touching the network.
+# Only pages that are read again go in: the scraper stores the homepage and each category's
+# first page, and pop()s the first page once its books are scraped, so a crawl holds two or
+# three soups at a time. `max_entries` is a safety bound beyond that; the least recently used
+# page is evicted. Failed fetches aren't kept.
+#
+#   memo = PageMemo()
+#   books_scraper.main(memo=memo)
+#   memo.stats                          # MemoStats(hits=11, misses=..., evictions=0)
+
+DEFAULT_ENTRIES = 8
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class PageMemo:
+    """Bounded LRU of parsed pages keyed by URL; safe to share between threads"""
+
+    def __init__(self, max_entries: int = DEFAULT_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.stats = MemoStats()
+        self._pages: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return url.split("#")[0]
+
+    def get(self, url: str) -> Optional[Any]:
+        """The page stored for `url` (now the most recently used), or None"""
+        key = self._key(url)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                self.stats.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.stats.hits += 1
+            return page
+
+    def pop(self, url: str) -> Optional[Any]:
+        """The page stored for `url`, removed from the memo (for a page that won't be read again), or None"""
+        with self._lock:
+            page = self._pages.pop(self._key(url), None)
+            if page is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+            return page
+
+    def put(self, url: str, page: Any) -> None:
+        """Store `page` for `url`, evicting the least recently used pages beyond max_entries"""
+        key = self._key(url)
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._key(url) in self._pages
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pages)
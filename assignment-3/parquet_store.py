@@ -0,0 +1,73 @@
+import pathlib
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import polars as pl
+
+from normalize import money, stars
+
+# -- Columnar output: https://docs.pola.rs/user-guide/io/parquet/
+# Each scrape of a category becomes one typed, zstd-compressed Parquet file in a
+# Hive-style partition directory:
+#   output/parquet/category=travel/20250701T120000Z-1f3a9c2e.parquet
+#   output/parquet/category=travel/20250708T120000Z-8b41d07a.parquet
+#   output/parquet/category=mystery/...
+# Price is stored as a float (no '£' or stray 'Â' left over from mis-decoded pages),
+# Star Rating as a small int, and every row carries the `scraped_at` time of its run.
+# `scan()` reads the whole history lazily with the category column taken from the
+# directory names, so one query covers every category and every run.
+
+PARQUET_DIR: pathlib.Path = pathlib.Path(__file__).parent / "output" / "parquet"
+
+SCHEMA: dict[str, Any] = {
+    "Title": pl.String,
+    "Price": pl.Float64,
+    "Availability": pl.String,
+    "Star Rating": pl.Int8,
+    "URL": pl.String,
+    "scraped_at": pl.Datetime("us", "UTC"),
+}
+
+def category_slug(category: str) -> str:
+    """File-system name of a category, e.g. "Historical Fiction" -> "historical_fiction" """
+    return category.replace(' ', '_').lower()
+
+def to_frame(rows: list[dict[str, Any]], scraped_at: datetime) -> pl.DataFrame:
+    """Typed DataFrame of extract_product_info rows"""
+    fields = [name for name in SCHEMA if name != "scraped_at"]
+    frame = pl.DataFrame(
+        {name: [row.get(name) for row in rows] for name in fields},
+        schema={name: pl.String for name in fields},
+        strict=False,  # Star Rating arrives as int from the scraper, as str from a CSV
+    )
+    return frame.with_columns(
+        money(pl.col("Price")),
+        stars(pl.col("Star Rating")).cast(pl.Int8, strict=False),  # "Three" from older CSVs, too
+        pl.lit(scraped_at, dtype=SCHEMA["scraped_at"]).alias("scraped_at"),
+    )
+
+def write_category(category: str, rows: list[dict[str, Any]], folder: pathlib.Path = PARQUET_DIR, scraped_at: Optional[datetime] = None) -> pathlib.Path:
+    """Write one scrape of a category to `<folder>/category=<slug>/<scraped_at>-<id>.parquet`"""
+    scraped_at = scraped_at or datetime.now(timezone.utc)
+    partition = pathlib.Path(folder) / f"category={category_slug(category)}"
+    partition.mkdir(parents=True, exist_ok=True)
+    # Unique per write, so two runs in the same second don't overwrite each other
+    path = partition / f"{scraped_at.astimezone(timezone.utc):%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp = path.with_suffix(".parquet.tmp")  # not matched by scan() until complete
+    to_frame(rows, scraped_at).write_parquet(tmp, compression="zstd", statistics=True)
+    tmp.replace(path)
+    return path
+
+def scan(folder: pathlib.Path = PARQUET_DIR) -> pl.LazyFrame:
+    """Lazy view of every run of every category, with a `category` column from the partitions"""
+    return pl.scan_parquet(pathlib.Path(folder) / "**" / "*.parquet", hive_partitioning=True)
+
+def import_csvs(csv_folder: pathlib.Path, folder: pathlib.Path = PARQUET_DIR, scraped_at: Optional[datetime] = None) -> list[pathlib.Path]:
+    """Convert existing per-category CSVs (from save_to_csv) into partitions; their mtime is used as scraped_at"""
+    written = []
+    for csv_path in sorted(pathlib.Path(csv_folder).glob("*.csv")):
+        rows = pl.read_csv(csv_path, infer_schema=False).to_dicts()
+        when = scraped_at or datetime.fromtimestamp(csv_path.stat().st_mtime, timezone.utc)
+        written.append(write_category(csv_path.stem, rows, folder, when))
+    return written
@@ -0,0 +1,82 @@
+# test_analytics.py
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from analytics import category_stats, overall_stats, plot_frame, rating_counts, scan_csvs, scan_history
+from books_scraper import save_to_csv
+from parquet_store import write_category
+
+RUN_1 = datetime(2025, 7, 1, tzinfo=timezone.utc)
+RUN_2 = datetime(2025, 7, 8, tzinfo=timezone.utc)
+
+def book(price: str, rating: int) -> dict:
+    return {"Title": "T", "Price": price, "Availability": "In stock", "Star Rating": rating, "URL": "u"}
+
+@pytest.fixture
+def folder():
+    """Fixture providing an empty output directory"""
+    with tempfile.TemporaryDirectory() as name:
+        yield Path(name)
+
+@pytest.fixture
+def history(folder: Path) -> Path:
+    """Two runs of Travel, one of Historical Fiction"""
+    write_category("Travel", [book("10.00", 1), book("20.00", 3)], folder, RUN_1)
+    write_category("Travel", [book("30.00", 5), book("50.00", 5)], folder, RUN_2)
+    write_category("Historical Fiction", [book("Â12.00", 2)], folder, RUN_1)
+    return folder
+
+class TestScanHistory:
+    """Test the Parquet scans"""
+
+    def test_latest_run_per_category(self, history: Path) -> None:
+        """Test that only each category's newest run is counted by default"""
+        stats = category_stats(scan_history(history))
+
+        assert stats.to_dicts() == [
+            {"Category": "Historical Fiction", "Total Books": 1, "Average Price": 12.0, "Average Rating": 2.0},
+            {"Category": "Travel", "Total Books": 2, "Average Price": 40.0, "Average Rating": 5.0},
+        ]
+
+    def test_full_history_and_since(self, history: Path) -> None:
+        """Test that latest_only=False keeps every run and `since` drops older ones"""
+        assert overall_stats(scan_history(history, latest_only=False))["Total Books"] == 5
+        assert overall_stats(scan_history(history, latest_only=False, since=RUN_2))["Total Books"] == 2
+
+    def test_unused_columns_are_not_read(self, history: Path) -> None:
+        """Test that the plan projects only the columns the aggregates need"""
+        plan = scan_history(history).select("Category", "Price").explain()
+
+        assert "Title" not in plan and "URL" not in plan and "Availability" not in plan
+
+class TestAggregates:
+    """Test the notebook's statistics on CSV input"""
+
+    def test_scan_csvs(self, folder: Path) -> None:
+        """Test that per-category CSVs give the same numbers, with 'Â' stripped from Price"""
+        save_to_csv("Travel", [book("Â10.00", 1), book("20.00", 3)], folder=folder)
+        save_to_csv("Poetry", [book("5.00", 4)], folder=folder)
+
+        books = scan_csvs(folder)
+
+        assert category_stats(books)["Category"].to_list() == ["Poetry", "Travel"]
+        assert overall_stats(books) == {"Total Books": 3, "Average Price": pytest.approx(35 / 3), "Average Rating": pytest.approx(8 / 3)}
+
+    def test_rating_counts(self, history: Path) -> None:
+        """Test the Category x Star Rating table behind the heatmap"""
+        table = rating_counts(scan_history(history))
+
+        assert table.columns == ["Category", "2", "5"]
+        assert table.rows() == [("Historical Fiction", 1, 0), ("Travel", 0, 2)]
+
+    def test_plot_frame(self, history: Path) -> None:
+        """Test that the plotting frame has just the three columns the plots use"""
+        frame = plot_frame(scan_history(history))
+
+        assert frame.columns == ["Category", "Price", "Star Rating"]
+        assert frame.schema["Price"] == pl.Float64
+        assert frame.height == 3
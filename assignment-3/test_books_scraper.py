@@ -0,0 +1,283 @@
+# test_books_scraper.py
+import csv
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+from books_scraper import (
+    BASE_URL,
+    HEADERS,
+    convert_star_rating,
+    extract_product_info,
+    get_categories,
+    get_category_pages,
+    get_soup,
+    main,
+    parse_category_page,
+    save_to_csv,
+    scrape_category,
+)
+
+def product_pod_html(title: str = "A Light in the Attic", price: str = "£51.77", rating: str = "Three") -> str:
+    """One books.toscrape product card, as found on category pages"""
+    return f"""
+    <article class="product_pod">
+        <p class="star-rating {rating}"></p>
+        <h3><a href="../../../a-light-in-the-attic_1000/index.html" title="{title}">{title[:10]}...</a></h3>
+        <div class="product_price">
+            <p class="price_color">{price}</p>
+            <p class="instock availability">
+                <i class="icon-ok"></i>
+                In stock
+            </p>
+        </div>
+    </article>
+    """
+
+def category_page_html(products: int = 2, pager: str = "") -> str:
+    """Category page with `products` cards and an optional `.current` pager text"""
+    cards = "".join(product_pod_html(title=f"Book {i}") for i in range(products))
+    current = f'<li class="current">{pager}</li>' if pager else ""
+    return f"<html><body><ol>{cards}</ol><ul class='pager'>{current}</ul></body></html>"
+
+def mock_response(text: str) -> Mock:
+    response = Mock(spec=requests.Response)
+    response.text = text
+    response.raise_for_status = Mock()
+    return response
+
+class TestGetSoup:
+    """Test the get_soup function"""
+
+    @patch('books_scraper.requests.get')
+    def test_get_soup_success(self, mock_get) -> None:
+        """Test that get_soup parses the response with the scraper's headers"""
+        mock_get.return_value = mock_response("<html><body><p>hi</p></body></html>")
+
+        soup = get_soup(BASE_URL)
+
+        assert isinstance(soup, BeautifulSoup)
+        assert soup.p.text == "hi" # type: ignore
+        mock_get.assert_called_once_with(BASE_URL, headers=HEADERS)
+
+    @patch('books_scraper.requests.get')
+    def test_get_soup_request_error(self, mock_get) -> None:
+        """Test that request errors return None"""
+        mock_get.side_effect = requests.exceptions.ConnectionError("boom")
+
+        assert get_soup(BASE_URL) is None
+
+    @patch('books_scraper.requests.get')
+    def test_get_soup_waits_for_scheduler(self, mock_get) -> None:
+        """Test that a scheduler is asked for a slot before each request"""
+        mock_get.return_value = mock_response("<html></html>")
+        scheduler = Mock()
+        scheduler.acquire.side_effect = lambda url: mock_get.assert_not_called()
+
+        get_soup(BASE_URL, scheduler=scheduler)
+
+        scheduler.acquire.assert_called_once_with(BASE_URL)
+        mock_get.assert_called_once()
+
+    @patch('books_scraper.requests.get')
+    def test_get_soup_through_cache(self, mock_get) -> None:
+        """Test that a cache fetches with requests.get, the scraper's headers and the scheduler"""
+        cache = Mock()
+        cache.fetch.return_value = mock_response("<html><body><p>cached</p></body></html>")
+        scheduler = Mock()
+
+        soup = get_soup(BASE_URL, scheduler=scheduler, cache=cache)
+
+        assert soup.p.text == "cached" # type: ignore
+        cache.fetch.assert_called_once_with(BASE_URL, mock_get, scheduler=scheduler, headers=HEADERS)
+        scheduler.acquire.assert_not_called()  # left to the cache, which skips it for fresh entries
+
+    @patch('books_scraper.requests.get')
+    def test_get_soup_records_metrics(self, mock_get) -> None:
+        """Test that a metrics registry gets each response and parse, and errors without a response"""
+        response = mock_response("<html></html>")
+        mock_get.side_effect = [response, requests.exceptions.ConnectionError("boom")]
+        metrics = Mock()
+
+        get_soup(BASE_URL, metrics=metrics)
+        get_soup(BASE_URL, metrics=metrics)
+
+        assert metrics.record_response.call_args[0][:2] == ("books", response)
+        metrics.record_parse.assert_called_once()
+        metrics.record_error.assert_called_once_with("books")
+
+    @patch('books_scraper.requests.get')
+    def test_get_soup_archives_pages(self, mock_get) -> None:
+        """Test that an archive gets the raw HTML, which re-parses to the same products offline"""
+        response = mock_response(category_page_html(products=2))
+        response.status_code = 200
+        mock_get.return_value = response
+        archive = Mock()
+
+        soup = get_soup(BASE_URL, archive=archive)
+
+        archive.add.assert_called_once_with(BASE_URL, response.text, "books", 200)
+        assert len(parse_category_page(archive.add.call_args[0][1])) == len(soup.select("article.product_pod")) == 2 # type: ignore
+
+class TestExtractProductInfo:
+    """Test the extract_product_info and convert_star_rating functions"""
+
+    @pytest.mark.parametrize("word,stars", [("One", 1), ("Three", 3), ("Five", 5), ("Zero", 0)])
+    def test_convert_star_rating(self, word: str, stars: int) -> None:
+        """Test that star words map to ints"""
+        assert convert_star_rating(word) == stars
+
+    def test_extract_product_info(self) -> None:
+        """Test that a product card becomes a row dict"""
+        article = BeautifulSoup(product_pod_html(), "html.parser").select_one("article.product_pod")
+
+        info = extract_product_info(article)
+
+        assert info == {
+            "Title": "A Light in the Attic",
+            "Price": "51.77",
+            "Availability": "In stock",
+            "Star Rating": 3,
+            "URL": BASE_URL + "catalogue/a-light-in-the-attic_1000/index.html",
+        }
+
+    def test_extract_product_info_malformed(self) -> None:
+        """Test that broken cards return None"""
+        article = BeautifulSoup("<article class='product_pod'></article>", "html.parser").select_one("article")
+
+        assert extract_product_info(article) is None
+
+class TestCategories:
+    """Test get_categories and get_category_pages"""
+
+    @patch('books_scraper.get_soup')
+    def test_get_categories(self, mock_soup) -> None:
+        """Test that sidebar links become full category URLs"""
+        mock_soup.return_value = BeautifulSoup("""
+        <div class="side_categories"><ul><li><a href="catalogue/category/books_1/index.html">Books</a>
+            <ul>
+                <li><a href="catalogue/category/books/travel_2/index.html"> Travel </a></li>
+                <li><a href="catalogue/category/books/mystery_3/index.html">Mystery</a></li>
+            </ul>
+        </li></ul></div>
+        """, "html.parser")
+
+        categories = get_categories()
+
+        assert categories == {
+            "Travel": BASE_URL + "catalogue/category/books/travel_2/index.html",
+            "Mystery": BASE_URL + "catalogue/category/books/mystery_3/index.html",
+        }
+
+    @patch('books_scraper.get_soup')
+    def test_get_categories_fetch_failed(self, mock_soup) -> None:
+        """Test that a failed homepage fetch returns no categories"""
+        mock_soup.return_value = None
+
+        assert get_categories() == {}
+
+    @patch('books_scraper.get_soup')
+    def test_get_category_pages_paginated(self, mock_soup) -> None:
+        """Test that the pager count expands into page URLs"""
+        mock_soup.return_value = BeautifulSoup(category_page_html(pager="Page 1 of 3"), "html.parser")
+        url = BASE_URL + "catalogue/category/books/mystery_3/index.html"
+
+        pages = get_category_pages(url)
+
+        assert pages == [
+            url,
+            BASE_URL + "catalogue/category/books/mystery_3/page-2.html",
+            BASE_URL + "catalogue/category/books/mystery_3/page-3.html",
+        ]
+
+    @patch('books_scraper.get_soup')
+    def test_get_category_pages_single_page(self, mock_soup) -> None:
+        """Test that categories without a pager have one page"""
+        mock_soup.return_value = BeautifulSoup(category_page_html(), "html.parser")
+        url = BASE_URL + "catalogue/category/books/travel_2/index.html"
+
+        assert get_category_pages(url) == [url]
+
+class TestScrapeCategory:
+    """Test scrape_category, save_to_csv and main"""
+
+    def test_save_to_csv(self) -> None:
+        """Test that rows are written under the category's file name"""
+        rows = [{"Title": "Book", "Price": "10.00", "Availability": "In stock", "Star Rating": 2, "URL": "u"}]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_to_csv("Historical Fiction", rows, folder=Path(temp_dir))
+
+            with open(Path(temp_dir) / "historical_fiction.csv", encoding="utf-8") as f:
+                written = list(csv.reader(f))
+
+        assert written == [["Title", "Price", "Availability", "Star Rating", "URL"], ["Book", "10.00", "In stock", "2", "u"]]
+
+    @patch('books_scraper.save_to_csv')
+    @patch('books_scraper.time.sleep')
+    @patch('books_scraper.requests.get')
+    def test_scrape_category(self, mock_get, mock_sleep, mock_save) -> None:
+        """Test that every page's products are collected and saved"""
+        mock_get.side_effect = [
+            mock_response(category_page_html(products=2, pager="Page 1 of 2")),  # page 1, also read for the pager
+            mock_response(category_page_html(products=1, pager="Page 2 of 2")),  # page 2
+        ]
+
+        rows = scrape_category("Mystery", BASE_URL + "catalogue/category/books/mystery_3/index.html")
+
+        assert len(rows) == 3
+        mock_save.assert_called_once_with("Mystery", rows)
+        assert mock_sleep.call_count == 2
+
+    @patch('books_scraper.save_to_csv')
+    @patch('books_scraper.time.sleep')
+    @patch('books_scraper.requests.get')
+    def test_scrape_category_with_scheduler(self, mock_get, mock_sleep, mock_save) -> None:
+        """Test that a scheduler replaces the fixed sleeps"""
+        mock_get.return_value = mock_response(category_page_html(products=1))
+        scheduler = Mock()
+
+        scrape_category("Travel", BASE_URL + "catalogue/category/books/travel_2/index.html", scheduler=scheduler)
+
+        assert scheduler.acquire.call_count == 1  # the first page is fetched once
+        mock_sleep.assert_not_called()
+
+    @patch('books_scraper.scrape_category')
+    @patch('books_scraper.get_categories')
+    def test_main_limits_categories(self, mock_categories, mock_scrape) -> None:
+        """Test that main scrapes only the first `limit` categories"""
+        mock_categories.return_value = {f"Category {i}": f"url-{i}" for i in range(12)}
+
+        main()
+
+        assert mock_scrape.call_count == 10
+        assert mock_scrape.call_args_list[0][0][:2] == ("Category 0", "url-0")
+
+    @patch('books_scraper.scrape_category')
+    @patch('books_scraper.get_categories')
+    def test_main_no_categories(self, mock_categories, mock_scrape) -> None:
+        """Test that main stops when the homepage yields nothing"""
+        mock_categories.return_value = {}
+
+        main()
+
+        mock_scrape.assert_not_called()
+
+    @patch('books_scraper.scrape_category')
+    @patch('books_scraper.get_categories')
+    def test_main_records_price_history(self, mock_categories, mock_scrape) -> None:
+        """Test that a store gets one run with every scraped book, keyed by URL"""
+        mock_categories.return_value = {"Travel": "url-0"}
+        mock_scrape.return_value = [{"Title": "Book", "Price": "10.00", "Availability": "In stock", "Star Rating": 2, "URL": "u"}]
+        store = Mock()
+        store.start_run.return_value = 7
+
+        main(store=store)
+
+        store.start_run.assert_called_once_with("books")
+        store.add.assert_called_once_with(7, [("u", "Book", "10.00", "u")])
+        store.finish_run.assert_called_once_with(7)
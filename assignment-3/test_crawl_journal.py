@@ -0,0 +1,110 @@
+# test_crawl_journal.py
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from books_scraper import BASE_URL, main, scrape_category
+from crawl_journal import CrawlJournal
+from test_books_scraper import category_page_html, mock_response
+
+CATEGORY_URL = BASE_URL + "catalogue/category/books/mystery_3/index.html"
+ROW = {"Title": "Book", "Price": "10.00", "Availability": "In stock", "Star Rating": 2, "URL": "u"}
+
+@pytest.fixture
+def journal_path():
+    """Fixture providing a path for the journal file"""
+    with tempfile.TemporaryDirectory() as name:
+        yield Path(name) / "crawl_journal.jsonl"
+
+class TestCrawlJournal:
+    """Test the CrawlJournal class"""
+
+    def test_state_survives_reopen(self, journal_path: Path) -> None:
+        """Test that pages and categories recorded in one run are known in the next"""
+        with CrawlJournal(journal_path) as journal:
+            journal.record_pages("Travel", ["p1", "p2"])
+            journal.page_done("p1", [ROW])
+            journal.category_done("Poetry")
+
+        with CrawlJournal(journal_path) as journal:
+            assert journal.is_category_done("Poetry")
+            assert not journal.is_category_done("Travel")
+            assert journal.pages_of("Travel") == ["p1", "p2"]
+            assert journal.page_rows("p1") == [ROW]
+            assert journal.page_rows("p2") is None
+
+    def test_truncated_last_line_is_ignored(self, journal_path: Path) -> None:
+        """Test that a line cut off by a crash doesn't stop the resume"""
+        with CrawlJournal(journal_path) as journal:
+            journal.page_done("p1", [ROW])
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write('{"page": "p2", "ro')
+
+        with CrawlJournal(journal_path) as journal:
+            assert journal.page_rows("p1") == [ROW]
+            assert journal.page_rows("p2") is None
+
+    def test_finished_categories_are_compacted(self, journal_path: Path) -> None:
+        """Test that page entries of finished categories are dropped on reopen"""
+        with CrawlJournal(journal_path) as journal:
+            journal.record_pages("Travel", ["p1", "p2"])
+            journal.page_done("p1", [ROW])
+            journal.page_done("p2", [ROW])
+            journal.category_done("Travel")
+
+        with CrawlJournal(journal_path) as journal:
+            assert journal.is_category_done("Travel")
+            assert journal.page_rows("p1") is None
+
+        assert journal_path.read_text(encoding="utf-8").splitlines() == ['{"category": "Travel", "done": true}']
+
+class TestResume:
+    """Test scrape_category and main with a journal"""
+
+    @patch('books_scraper.save_to_csv')
+    @patch('books_scraper.time.sleep')
+    @patch('books_scraper.requests.get')
+    def test_interrupted_category_resumes_at_next_page(self, mock_get, mock_sleep, mock_save, journal_path: Path) -> None:
+        """Test that a rerun replays finished pages from the journal and fetches only the rest"""
+        page_1 = mock_response(category_page_html(products=2, pager="Page 1 of 2"))
+        page_2 = mock_response(category_page_html(products=1, pager="Page 2 of 2"))
+        mock_get.side_effect = [page_1, KeyboardInterrupt()]  # page 1 (pager read from it), then killed
+
+        with CrawlJournal(journal_path) as journal, pytest.raises(KeyboardInterrupt):
+            scrape_category("Mystery", CATEGORY_URL, journal=journal)
+
+        mock_get.reset_mock(side_effect=True)
+        mock_get.side_effect = [page_2]
+        with CrawlJournal(journal_path) as journal:
+            rows = scrape_category("Mystery", CATEGORY_URL, journal=journal)
+            assert journal.is_category_done("Mystery")
+
+        assert len(rows) == 3
+        mock_get.assert_called_once()  # only page 2; no pager lookup either
+        assert mock_get.call_args[0][0] == CATEGORY_URL.replace("index.html", "page-2.html")
+        mock_save.assert_called_with("Mystery", rows)
+
+    @patch('books_scraper.save_to_csv')
+    @patch('books_scraper.time.sleep')
+    @patch('books_scraper.requests.get')
+    def test_failed_page_keeps_category_open(self, mock_get, mock_sleep, mock_save, journal_path: Path) -> None:
+        """Test that a category with a failed page is retried on the next run"""
+        mock_get.side_effect = [mock_response(category_page_html(products=1, pager="Page 1 of 2")), Exception("boom")]
+
+        with CrawlJournal(journal_path) as journal:
+            scrape_category("Mystery", CATEGORY_URL, journal=journal)
+            assert not journal.is_category_done("Mystery")
+
+    @patch('books_scraper.scrape_category')
+    @patch('books_scraper.get_categories')
+    def test_main_skips_finished_categories(self, mock_categories, mock_scrape, journal_path: Path) -> None:
+        """Test that categories finished by an earlier run are not scraped again"""
+        mock_categories.return_value = {"Travel": "url-travel", "Poetry": "url-poetry"}
+
+        with CrawlJournal(journal_path) as journal:
+            journal.category_done("Travel")
+            main(journal=journal)
+
+        assert [call[0][0] for call in mock_scrape.call_args_list] == ["Poetry"]
@@ -0,0 +1,161 @@
+# test_frontier.py
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from books_scraper import BASE_URL
+from crawl_journal import CrawlJournal
+from frontier import INDEX, PAGE, CategoryCrawl, Frontier, MinInterval
+from test_books_scraper import category_page_html, mock_response
+
+def category_url(name: str) -> str:
+    return f"{BASE_URL}catalogue/category/books/{name}/index.html"
+
+def fake_site(categories: dict[str, int], delay: float = 0.0):
+    """requests.get stand-in serving `categories` (name -> page count) with 2 books per page"""
+    fetched: list[str] = []
+    lock = threading.Lock()
+
+    def get(url: str, headers=None):
+        time.sleep(delay)
+        with lock:
+            fetched.append(url)
+        for name, pages in categories.items():
+            for page_num in range(1, pages + 1):
+                page_url = category_url(name).replace("index.html", f"page-{page_num}.html") if page_num > 1 else category_url(name)
+                if url == page_url:
+                    html = category_page_html(products=2, pager=f"Page {page_num} of {pages}" if pages > 1 else "")
+                    return mock_response(html.replace("Book ", f"{name} p{page_num} #"))
+        raise AssertionError(f"unexpected URL {url}")
+    return get, fetched
+
+class TestFrontier:
+    """Test the Frontier queue"""
+
+    def test_dedupe_and_priority(self) -> None:
+        """Test that URLs are queued once and index pages come out before pagination pages"""
+        frontier = Frontier()
+
+        assert frontier.push(PAGE, "https://x/a/page-2.html", "a", 2)
+        assert frontier.push(INDEX, "https://x/b/index.html", "b", 1)
+        assert not frontier.push(PAGE, "https://x/a/page-2.html#top", "a", 2)
+
+        assert [frontier.pop().url, frontier.pop().url] == ["https://x/b/index.html", "https://x/a/page-2.html"]  # type: ignore
+
+    def test_pop_ends_when_all_work_is_done(self) -> None:
+        """Test that pop waits while tasks are active and returns None once they finish"""
+        frontier = Frontier()
+        frontier.push(INDEX, "https://x/a", "a", 1)
+        frontier.pop()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(frontier.pop()))
+        waiter.start()
+        time.sleep(0.05)
+        assert waiter.is_alive()  # the active task may still push more
+
+        frontier.task_done()
+        waiter.join(timeout=1)
+
+        assert results == [None]
+
+class TestMinInterval:
+    """Test the MinInterval gate"""
+
+    def test_spaces_requests_across_threads(self) -> None:
+        """Test that requests from several threads start at least `interval` apart"""
+        gate = MinInterval(0.05)
+        starts: list[float] = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            gate.acquire()
+            with lock:
+                starts.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        starts.sort()
+        assert all(b - a >= 0.04 for a, b in zip(starts, starts[1:]))
+
+class TestCategoryCrawl:
+    """Test CategoryCrawl end to end on a fake site"""
+
+    @patch('frontier.save_to_csv')
+    def test_every_page_once_rows_in_page_order(self, mock_save) -> None:
+        """Test that each URL is fetched once and each category's rows keep page order"""
+        get, fetched = fake_site({"travel_2": 3, "poetry_23": 1, "mystery_3": 2})
+
+        with patch('books_scraper.requests.get', side_effect=get):
+            results = CategoryCrawl(workers=4, scheduler=MinInterval(0)).run(
+                {"Travel": category_url("travel_2"), "Poetry": category_url("poetry_23"), "Mystery": category_url("mystery_3")})
+
+        assert sorted(fetched) == sorted(set(fetched)) and len(fetched) == 6  # no second pager lookup
+        assert [row["Title"] for row in results["Travel"]] == [f"travel_2 p{p} #{i}" for p in (1, 2, 3) for i in (0, 1)]
+        assert len(results["Poetry"]) == 2
+        assert sorted(call.args[0] for call in mock_save.call_args_list) == ["Mystery", "Poetry", "Travel"]
+
+    @patch('frontier.save_to_csv')
+    def test_workers_overlap_slow_responses(self, mock_save) -> None:
+        """Test that 12 pages with 50 ms latency take far less than 12 x 50 ms on 8 workers"""
+        get, _ = fake_site({f"c{n}_1": 3 for n in range(4)}, delay=0.05)
+
+        with patch('books_scraper.requests.get', side_effect=get):
+            start = time.monotonic()
+            CategoryCrawl(workers=8, scheduler=MinInterval(0)).run({f"C{n}": category_url(f"c{n}_1") for n in range(4)})
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.4
+
+    @patch('frontier.save_to_csv')
+    def test_resumes_from_journal(self, mock_save) -> None:
+        """Test that finished categories are skipped and finished pages replayed"""
+        get, fetched = fake_site({"travel_2": 2, "poetry_23": 1})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with CrawlJournal(Path(temp_dir) / "journal.jsonl") as journal:
+                journal.category_done("Poetry")
+                journal.record_pages("Travel", [category_url("travel_2"), category_url("travel_2").replace("index.html", "page-2.html")])
+                journal.page_done(category_url("travel_2"), [{"Title": "from journal"}])
+
+                with patch('books_scraper.requests.get', side_effect=get):
+                    results = CategoryCrawl(workers=2, scheduler=MinInterval(0), journal=journal).run(
+                        {"Travel": category_url("travel_2"), "Poetry": category_url("poetry_23")})
+
+                assert journal.is_category_done("Travel")
+
+        assert fetched == [category_url("travel_2").replace("index.html", "page-2.html")]
+        assert [row["Title"] for row in results["Travel"]][0] == "from journal"
+        assert "Poetry" not in results
+
+    @patch('frontier.save_to_csv')
+    def test_failed_index_is_not_saved(self, mock_save) -> None:
+        """Test that a category whose first page can't be fetched keeps its old output and stays unfinished"""
+        get, _ = fake_site({"travel_2": 1})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with CrawlJournal(Path(temp_dir) / "journal.jsonl") as journal:
+                with patch('books_scraper.requests.get', side_effect=get):
+                    results = CategoryCrawl(workers=2, scheduler=MinInterval(0), journal=journal).run(
+                        {"Travel": category_url("travel_2"), "Gone": category_url("gone_9")})
+
+                assert journal.is_category_done("Travel") and not journal.is_category_done("Gone")
+
+        assert [call.args[0] for call in mock_save.call_args_list] == ["Travel"]
+        assert "Gone" not in results
+
+    @patch('frontier.save_to_csv')
+    @patch('frontier.extract_products')
+    def test_crashing_page_fails_its_category(self, mock_extract, mock_save) -> None:
+        """Test that an exception on one page ends the crawl and leaves that category unsaved, not hanging"""
+        get, _ = fake_site({"travel_2": 3})
+        mock_extract.side_effect = lambda soup: [{"Title": "ok"}] if "p2 #" not in str(soup) else 1 / 0
+
+        with patch('books_scraper.requests.get', side_effect=get):
+            results = CategoryCrawl(workers=2, scheduler=MinInterval(0)).run({"Travel": category_url("travel_2")})
+
+        assert results == {}
+        mock_save.assert_not_called()
@@ -0,0 +1,50 @@
+# test_normalize.py
+import polars as pl
+
+from normalize import COLUMNS, normalize
+
+JUMIA = {
+    "Title": ["Fridge", "Kettle", "Blender"],
+    "Price": ["KSh 30000", "KSh 1,500 - KSh 2,000", ""],
+    "Old Price": ["KSh 35,000", "", None],
+    "Discount": ["-14%", "", "-5%"],
+    "Rating": ["4.5", "", "3"],
+    "Number of Reviews": ["12", "(1,204)", ""],
+}
+
+class TestNormalize:
+    """Test the normalize function"""
+
+    def test_jumia_columns(self) -> None:
+        """Test that currency, separators, percentages and counts become typed values or null"""
+        frame = normalize(pl.DataFrame(JUMIA))
+
+        assert frame["Price"].to_list() == [30000.0, 1500.0, None]
+        assert frame["Old Price"].to_list() == [35000.0, None, None]
+        assert frame["Discount"].to_list() == [14, None, 5]
+        assert frame["Rating"].to_list() == [4.5, None, 3.0]
+        assert frame["Number of Reviews"].to_list() == [12, 1204, None]
+        assert frame["Title"].to_list() == JUMIA["Title"]
+
+    def test_books_and_laptops(self) -> None:
+        """Test mojibake, other currencies, star words and already-numeric ratings"""
+        books = normalize(pl.DataFrame({"Price": ["Â£51.77", "12.00", "$295.99"], "Star Rating": ["Three", "FIVE", "2"]}))
+        typed = normalize(pl.DataFrame({"Star Rating": [3, 0]}))
+
+        assert books["Price"].to_list() == [51.77, 12.0, 295.99]
+        assert books["Star Rating"].to_list() == [3.0, 5.0, 2.0]
+        assert typed["Star Rating"].to_list() == [3.0, 0.0]
+
+    def test_lazy(self) -> None:
+        """Test that a LazyFrame stays lazy and gives the same result"""
+        lazy = normalize(pl.LazyFrame(JUMIA))
+
+        assert isinstance(lazy, pl.LazyFrame)
+        assert lazy.collect().equals(normalize(pl.DataFrame(JUMIA)))
+
+    def test_selected_columns(self) -> None:
+        """Test that only the given columns are cleaned"""
+        frame = normalize(pl.DataFrame(JUMIA), {"Price": COLUMNS["Price"]})
+
+        assert frame["Price"].dtype == pl.Float64
+        assert frame["Discount"].to_list() == JUMIA["Discount"]
@@ -0,0 +1,102 @@
+# test_page_memo.py
+from unittest.mock import patch
+
+import pytest
+
+from books_scraper import BASE_URL, get_categories, get_soup, main
+from page_memo import PageMemo
+from test_books_scraper import category_page_html, mock_response
+
+HOMEPAGE_HTML = """
+<html><body><div class="side_categories"><ul><li><ul>
+  <li><a href="catalogue/category/books/travel_2/index.html">Travel</a></li>
+  <li><a href="catalogue/category/books/poetry_23/index.html">Poetry</a></li>
+</ul></li></ul></div></body></html>
+"""
+
+class TestPageMemo:
+    """Test the PageMemo LRU"""
+
+    def test_hits_and_misses_are_counted(self) -> None:
+        """Test that lookups count as hits or misses, ignoring URL fragments"""
+        memo = PageMemo()
+
+        assert memo.get("https://x/a") is None
+        memo.put("https://x/a", "page a")
+
+        assert memo.get("https://x/a#top") == "page a"
+        assert (memo.stats.hits, memo.stats.misses) == (1, 1)
+        assert memo.stats.hit_rate == 0.5
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test that the memo holds at most max_entries and drops the oldest unused page"""
+        memo = PageMemo(max_entries=2)
+        memo.put("a", 1)
+        memo.put("b", 2)
+        memo.get("a")  # "b" is now the least recently used
+
+        memo.put("c", 3)
+
+        assert "a" in memo and "c" in memo and "b" not in memo
+        assert len(memo) == 2
+        assert memo.stats.evictions == 1
+
+    def test_pop_removes_the_page(self) -> None:
+        """Test that pop hands a page out once and forgets it"""
+        memo = PageMemo()
+        memo.put("a", 1)
+
+        assert memo.pop("a#top") == 1
+        assert memo.pop("a") is None and "a" not in memo
+        assert (memo.stats.hits, memo.stats.misses) == (1, 1)
+
+    def test_rejects_empty_memo(self) -> None:
+        """Test that a memo must hold at least one page"""
+        with pytest.raises(ValueError):
+            PageMemo(max_entries=0)
+
+class TestMemoizedCrawl:
+    """Test that the scraper fetches each URL once with a memo"""
+
+    @patch('books_scraper.requests.get')
+    def test_get_soup_reuses_page(self, mock_get) -> None:
+        """Test that a memoized page is parsed once and not fetched again"""
+        mock_get.return_value = mock_response(HOMEPAGE_HTML)
+        memo = PageMemo()
+
+        first = get_categories(memo=memo)
+        second = get_categories(memo=memo)
+
+        assert first == second and len(first) == 2
+        mock_get.assert_called_once()
+
+    @patch('books_scraper.requests.get')
+    def test_failed_fetch_is_not_memoized(self, mock_get) -> None:
+        """Test that a failure is retried on the next call"""
+        mock_get.side_effect = [Exception("boom"), mock_response(HOMEPAGE_HTML)]
+        memo = PageMemo()
+
+        assert get_soup(BASE_URL, memo=memo) is None
+        assert get_soup(BASE_URL, memo=memo) is not None
+        assert mock_get.call_count == 2
+
+    @patch('books_scraper.save_to_csv')
+    @patch('books_scraper.time.sleep')
+    @patch('books_scraper.requests.get')
+    def test_main_downloads_each_url_once(self, mock_get, mock_sleep, mock_save) -> None:
+        """Test that a crawl requests the homepage and each category page exactly once"""
+        pages = {
+            BASE_URL: HOMEPAGE_HTML,
+            BASE_URL + "catalogue/category/books/travel_2/index.html": category_page_html(products=2, pager="Page 1 of 2"),
+            BASE_URL + "catalogue/category/books/travel_2/page-2.html": category_page_html(products=1, pager="Page 2 of 2"),
+            BASE_URL + "catalogue/category/books/poetry_23/index.html": category_page_html(products=1),
+        }
+        mock_get.side_effect = lambda url, headers=None: mock_response(pages[url])
+        memo = PageMemo()
+
+        main(memo=memo)
+
+        assert sorted(call.args[0] for call in mock_get.call_args_list) == sorted(pages)
+        assert memo.stats.hits == 2  # each category's first page, reused after the pager lookup
+        assert memo.stats.misses == 3  # the first fetch of the homepage and both index pages; page 2 never asks
+        assert len(memo) == 1 and BASE_URL in memo  # only the homepage is still held; scraped pages were let go
@@ -0,0 +1,98 @@
+# test_parquet_store.py
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+
+from books_scraper import BASE_URL, save_to_csv, save_to_parquet, scrape_category
+from parquet_store import SCHEMA, import_csvs, scan, write_category
+from test_books_scraper import category_page_html, mock_response
+
+RUN_1 = datetime(2025, 7, 1, 12, 0, tzinfo=timezone.utc)
+RUN_2 = datetime(2025, 7, 8, 12, 0, tzinfo=timezone.utc)
+
+def book(title: str, price: str, rating: int) -> dict:
+    return {"Title": title, "Price": price, "Availability": "In stock", "Star Rating": rating, "URL": f"u/{title}"}
+
+@pytest.fixture
+def folder():
+    """Fixture providing an empty dataset directory"""
+    with tempfile.TemporaryDirectory() as name:
+        yield Path(name)
+
+class TestWriteCategory:
+    """Test write_category and scan"""
+
+    def test_partition_layout(self, folder: Path) -> None:
+        """Test that each run lands in its category's Hive partition"""
+        path = write_category("Historical Fiction", [book("A", "10.00", 3)], folder, RUN_1)
+
+        assert path.parent == folder / "category=historical_fiction"
+        assert path.name.startswith("20250701T120000Z-") and path.suffix == ".parquet"
+
+    def test_typed_columns(self, folder: Path) -> None:
+        """Test that Price is a float without currency junk and Star Rating an int"""
+        path = write_category("Travel", [book("A", "Â£51.77", 3), book("B", "12.00", 5)], folder, RUN_1)
+
+        frame = pl.read_parquet(path)
+
+        assert dict(frame.schema) == SCHEMA
+        assert frame["Price"].to_list() == [51.77, 12.0]
+        assert frame["Star Rating"].to_list() == [3, 5]
+
+    def test_scan_covers_categories_and_runs(self, folder: Path) -> None:
+        """Test that one lazy scan reads every partition and run, with the category from the path"""
+        write_category("Travel", [book("A", "10.00", 3)], folder, RUN_1)
+        write_category("Travel", [book("A", "12.00", 3)], folder, RUN_2)
+        write_category("Mystery", [book("B", "20.00", 4)], folder, RUN_1)
+
+        summary = (
+            scan(folder)
+            .group_by("category")
+            .agg(pl.len().alias("rows"), pl.col("Price").max())
+            .sort("category")
+            .collect()
+        )
+
+        assert summary.to_dicts() == [
+            {"category": "mystery", "rows": 1, "Price": 20.0},
+            {"category": "travel", "rows": 2, "Price": 12.0},
+        ]
+
+    def test_import_csvs(self, folder: Path) -> None:
+        """Test that per-category CSVs from save_to_csv convert into partitions"""
+        csv_folder = folder / "csv"
+        csv_folder.mkdir()
+        save_to_csv("Travel", [book("A", "10.00", 3)], folder=csv_folder)
+
+        import_csvs(csv_folder, folder / "parquet", RUN_1)
+
+        frame = scan(folder / "parquet").collect()
+        assert frame["category"].to_list() == ["travel"]
+        assert frame["Star Rating"].to_list() == [3]
+
+class TestScrapeCategoryParquet:
+    """Test the parquet output mode of scrape_category"""
+
+    @patch('books_scraper.save_to_parquet')
+    @patch('books_scraper.save_to_csv')
+    @patch('books_scraper.time.sleep')
+    @patch('books_scraper.requests.get')
+    def test_formats(self, mock_get, mock_sleep, mock_save_csv, mock_save_parquet) -> None:
+        """Test that formats=("parquet",) saves Parquet instead of CSV"""
+        mock_get.return_value = mock_response(category_page_html(products=2))
+
+        rows = scrape_category("Travel", BASE_URL + "catalogue/category/books/travel_2/index.html", formats=("parquet",))
+
+        mock_save_csv.assert_not_called()
+        mock_save_parquet.assert_called_once_with("Travel", rows)
+
+    def test_save_to_parquet(self, folder: Path) -> None:
+        """Test that save_to_parquet appends a run to the dataset"""
+        save_to_parquet("Travel", [book("A", "10.00", 3)], folder=folder)
+        save_to_parquet("Travel", [book("A", "11.00", 3)], folder=folder)
+
+        assert scan(folder).select(pl.len()).collect().item() == 2
@@ -0,0 +1,65 @@
+"""Benchmark: compiled robots.txt matcher vs checking every rule in turn.
+
+Run from the repo root: `python benchmarks/bench_robots.py [--urls N]`
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "assignment-2"))
+
+from robots import RobotsRules  # noqa: E402
+
+JUMIA = "https://www.jumia.co.ke"
+
+def synthetic_urls(count: int, seed: int = 42) -> list[str]:
+    """Discovered-URL mix: listings, products, facets, paths and brand selectors"""
+    rng = random.Random(seed)
+    categories = ["home-office-appliances", "phones-tablets", "televisions", "computing", "fashion", "health-beauty"]
+    facets = ["page", "color", "price", "sort", "size", "brand", "rating", "q", "shipped_from", "tag"]
+    urls = []
+    for i in range(count):
+        kind = rng.random()
+        category = rng.choice(categories)
+        if kind < 0.4:
+            urls.append(f"{JUMIA}/{category}/?page={rng.randint(1, 50)}")
+        elif kind < 0.7:
+            urls.append(f"{JUMIA}/product-name-{i}-{rng.randint(10**6, 10**7)}.html")
+        elif kind < 0.85:
+            urls.append(f"{JUMIA}/{category}/?{rng.choice(facets)}={rng.randint(1, 9)}&page=2")
+        elif kind < 0.95:
+            urls.append(f"{JUMIA}/{category}/{rng.choice(['samsung', 'lg'])}--{rng.choice(['hisense', 'tcl'])}/")
+        else:
+            urls.append(f"{JUMIA}/{rng.choice(['cart', 'customer', 'catalog', 'mobapi', 'en'])}/{category}/")
+    return urls
+
+def bench(check, urls: list[str]) -> tuple[float, int]:
+    """Seconds taken and number of allowed URLs"""
+    start = time.perf_counter()
+    allowed = sum(1 for url in urls if check(url))
+    return time.perf_counter() - start, allowed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--urls", type=int, default=200_000, help="number of synthetic URLs to check")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rules = RobotsRules.from_file()
+    print(f"Parsed and compiled {len(rules._disallow.patterns)} Disallow / {len(rules._allow.patterns)} Allow rules "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    urls = synthetic_urls(args.urls)
+    compiled_s, compiled_allowed = bench(rules.allowed, urls)
+    naive_s, naive_allowed = bench(rules.allowed_naive, urls)
+    assert compiled_allowed == naive_allowed, "compiled and naive matchers disagree"
+
+    print(f"{len(urls):,} URLs, {compiled_allowed:,} allowed")
+    print(f"  compiled: {len(urls) / compiled_s:>12,.0f} URLs/s  ({compiled_s:.2f} s)")
+    print(f"  naive:    {len(urls) / naive_s:>12,.0f} URLs/s  ({naive_s:.2f} s)")
+    print(f"  speedup:  {naive_s / compiled_s:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Benchmark: parsing and end-to-end scrape throughput of the three scrapers, fully offline.
+
+Pages come from benchmarks/fixtures.py; "end-to-end" cases fetch them over HTTP from a
+local server, so the numbers include the client, the socket and the parse. Results are
+saved as JSON per commit (benchmarks/results/<commit>.json) and can be compared:
+
+    python benchmarks/bench_scrapers.py
+    python benchmarks/bench_scrapers.py --compare benchmarks/results/<older commit>.json
+
+Run from the repo root.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "assignment-2"))
+sys.path.insert(0, str(ROOT / "assignment-3"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import books_scraper  # noqa: E402
+import webscraper_io  # noqa: E402
+from fixtures import books_page, jumia_listing, webscraper_grid  # noqa: E402
+from jumia_scraper import parse_appliance_page, save_to_csv, save_to_json  # noqa: E402
+from parsers import available_backends  # noqa: E402
+from pipeline import default_workers, parse_ordered  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+@contextlib.contextmanager
+def quiet() -> Iterator[None]:
+    """Swallow the scrapers' progress prints while timing"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def parse_quietly(html: str) -> list[Any]:
+    """parse_appliance_page without its progress print; module level so worker processes can unpickle it"""
+    with quiet():
+        return parse_appliance_page(html)
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds; the minimum is the least noisy estimate"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+@contextlib.contextmanager
+def serve(pages: dict[str, str]) -> Iterator[str]:
+    """Serve `pages` (path -> HTML) on localhost; yields the base URL"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body = pages.get(self.path.split("?")[0], "<html></html>").encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+
+def run(repeat: int, jumia_cards: int, rows: int, parse_workers: int) -> dict[str, dict[str, Any]]:
+    results: dict[str, dict[str, Any]] = {}
+
+    def record(name: str, items: int, seconds: float, unit: str) -> None:
+        results[name] = {"value": items / seconds, "unit": unit}
+        print(f"  {name:<44} {items / seconds:>12,.0f} {unit}")
+
+    # -- Jumia: parse_appliance_page on every installed backend
+    html = jumia_listing(jumia_cards)
+    with quiet():
+        assert len(parse_appliance_page(html)) == jumia_cards, "fixture and parser disagree"
+    print(f"Jumia listing: {jumia_cards} cards, {len(html) / 1024:.0f} KiB")
+    for backend in available_backends():
+        with quiet():
+            seconds = best_of(lambda: parse_appliance_page(html, backend=backend), repeat)
+        record(f"jumia.parse_appliance_page[{backend}]", jumia_cards, seconds, "cards/s")
+    pages = [jumia_listing(jumia_cards, seed=n) for n in range(16 * parse_workers)]  # enough to amortise process start-up
+    seconds = best_of(lambda: list(parse_ordered(pages, parse_quietly, parse_workers)), max(1, repeat // 2))
+    record(f"jumia.parse_ordered[{parse_workers} processes]", jumia_cards * len(pages), seconds, "cards/s")
+
+    # -- webscraper.io: parse_page, and scrape_page over HTTP
+    grid = webscraper_grid(6)
+    print(f"webscraper.io grid: 6 cards, {len(grid) / 1024:.0f} KiB")
+    for backend in available_backends():
+        seconds = best_of(lambda: webscraper_io.parse_page(grid, backend=backend), repeat * 20)
+        record(f"webscraper_io.parse_page[{backend}]", 6, seconds, "cards/s")
+    with serve({"/laptops": grid}) as base_url:
+        original, webscraper_io.BASE_URL = webscraper_io.BASE_URL, base_url + "/laptops?page={}"
+        try:
+            with quiet():
+                assert len(webscraper_io.scrape_page(1)) == 6  # type: ignore
+                seconds = best_of(lambda: [webscraper_io.scrape_page(n) for n in range(1, 21)], repeat)
+        finally:
+            webscraper_io.BASE_URL = original
+    record("webscraper_io.scrape_page (HTTP, 20 pages)", 6 * 20, seconds, "cards/s")
+
+    # -- books.toscrape: extract_product_info, and get_soup + extract over HTTP
+    page = books_page(20)
+    print(f"books.toscrape page: 20 cards, {len(page) / 1024:.0f} KiB")
+    pods = BeautifulSoup(page, "html.parser").select("article.product_pod")
+    seconds = best_of(lambda: [books_scraper.extract_product_info(pod) for pod in pods], repeat * 20)
+    record("books.extract_product_info", len(pods), seconds, "cards/s")
+
+    def scrape_books(base_url: str) -> int:
+        soup = books_scraper.get_soup(base_url + "/catalogue/category/books_1/index.html")
+        return len([books_scraper.extract_product_info(pod) for pod in soup.select("article.product_pod")])  # type: ignore
+    with serve({"/catalogue/category/books_1/index.html": page}) as base_url:
+        assert scrape_books(base_url) == 20
+        seconds = best_of(lambda: [scrape_books(base_url) for _ in range(20)], repeat)
+    record("books.get_soup+extract (HTTP, 20 pages)", 20 * 20, seconds, "cards/s")
+
+    # -- Writers: save_to_csv / save_to_json
+    with quiet():
+        products = parse_appliance_page(jumia_listing(rows, seed=1), backend=available_backends()[-1])
+    print(f"Writers: {len(products):,} Jumia rows")
+    with tempfile.TemporaryDirectory() as temp_dir, quiet():
+        seconds_csv = best_of(lambda: save_to_csv(products, Path(temp_dir) / "out.csv"), repeat)
+        seconds_json = best_of(lambda: save_to_json(products, Path(temp_dir) / "out.json"), repeat)
+    record("jumia.save_to_csv", len(products), seconds_csv, "rows/s")
+    record("jumia.save_to_json", len(products), seconds_json, "rows/s")
+    return results
+
+def current_commit() -> str:
+    """Short hash of HEAD, with -dirty when the tree has uncommitted changes"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=ROOT).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+def compare(results: dict[str, dict[str, Any]], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nvs {baseline['commit']} ({baseline['timestamp']}):")
+    for name, result in results.items():
+        old = baseline["results"].get(name)
+        if old:
+            print(f"  {name:<44} {result['value'] / old['value']:>6.2f}x")
+        else:
+            print(f"  {name:<44}    new")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case; the fastest is reported")
+    parser.add_argument("--jumia-cards", type=int, default=48, help="cards on the Jumia listing fixture")
+    parser.add_argument("--rows", type=int, default=20_000, help="rows for the CSV/JSON writer cases")
+    parser.add_argument("--parse-workers", type=int, default=default_workers(), help="processes for the pipeline case")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.jumia_cards, args.rows, args.parse_workers)
+
+    commit = current_commit()
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": {"repeat": args.repeat, "jumia_cards": args.jumia_cards, "rows": args.rows, "parse_workers": args.parse_workers},
+        "results": results,
+    }, indent=2))
+    print(f"\nSaved results to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Synthetic HTML fixtures shaped like the three sites the scrapers target.
+
+Card markup follows the live pages (class names, nesting, optional fields); each page is
+wrapped in navigation, scripts and footer boilerplate so documents are realistically sized.
+Everything is seeded, so a given (cards, seed) always yields the same page.
+"""
+import random
+
+BRANDS = ["Samsung", "LG", "Hisense", "Ramtons", "Mika", "Von", "Nunix", "Sayona", "TCL", "Bruhm"]
+ITEMS = ["Fridge", "Microwave", "Blender", "Kettle", "Cooker", "Iron", "Fan", "Air Fryer", "Toaster", "Vacuum"]
+LAPTOPS = ["Asus VivoBook", "Lenovo ThinkPad", "Acer Aspire", "HP 250 G6", "Dell Inspiron", "Apple MacBook Air"]
+RATINGS = ["One", "Two", "Three", "Four", "Five"]
+
+def _chrome(body: str, rng: random.Random, links: int = 150) -> str:
+    """Header navigation, scripts and footer around `body`"""
+    nav = "".join(f'<li class="itm"><a href="/category-{i}/" class="tit">Category {i}</a></li>' for i in range(links))
+    scripts = "".join(f'<script>window.dataLayer=window.dataLayer||[];dataLayer.push({{"k{i}":{rng.random()}}});</script>' for i in range(20))
+    footer = "".join(f'<a href="/help/{i}/" class="-db">Help topic {i}</a>' for i in range(60))
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Listing</title>'
+        f'<link rel="stylesheet" href="/assets/app.css">{scripts}</head><body>'
+        f'<header><nav><ul class="menu">{nav}</ul></nav></header>'
+        f'<main class="has-b2top">{body}</main>'
+        f'<footer class="ftr">{footer}</footer></body></html>'
+    )
+
+def jumia_card(rng: random.Random, n: int) -> str:
+    title = f"{rng.choice(BRANDS)} {rng.choice(ITEMS)} {rng.randint(10, 900)}L &quot;Model {n}&quot;"
+    price = rng.randint(999, 150_000)
+    extras = ""
+    if rng.random() < 0.6:
+        extras += f'<div class="s-prc-w"><div class="old">KSh {int(price * 1.2):,}</div><div class="bdg _dsct _sm">-17%</div></div>'
+    if rng.random() < 0.3:
+        extras += '<div class="bdg _mall _xs">Official Store</div>'
+    if rng.random() < 0.7:
+        stars = round(rng.uniform(1, 5), 1)
+        extras += f'<div class="rev"><div class="stars _s">{stars} out of 5<div class="in" style="width:{stars * 20:.0f}%"></div></div>({rng.randint(1, 900)})</div>'
+    if rng.random() < 0.5:
+        extras += '<svg class="ic xprss" viewBox="0 0 114 12"><use xlink:href="/assets/i/sprite.svg#express"></use></svg>'
+    return (
+        f'<article class="prd _fb col c-prd"><a class="core" href="/product-{n}-{rng.randint(10**6, 10**7)}.html" '
+        f'data-gtm-id="{n}" data-gtm-name="{title}" data-gtm-brand="{rng.choice(BRANDS)}">'
+        f'<div class="img-c"><img data-src="/unsafe/fit-in/300x300/{n}.jpg" class="img" width="208" height="208" alt="{title}"></div>'
+        f'<div class="info"><h3 class="name">{title}</h3><div class="prc">KSh {price:,}</div>{extras}</div></a>'
+        '<footer class="ft"><form method="POST" action="/cart/"><button class="add btn _prim _md">Add To Cart</button></form></footer>'
+        '</article>'
+    )
+
+def jumia_listing(cards: int = 48, seed: int = 0) -> str:
+    """Jumia home-office-appliances listing page with `cards` `article.prd` cards"""
+    rng = random.Random(seed)
+    grid = "".join(jumia_card(rng, n) for n in range(cards))
+    return _chrome(f'<section class="card -fh"><div class="-paxs row _no-g _4cl-3cm-shs">{grid}</div></section>', rng)
+
+def webscraper_card(rng: random.Random, n: int) -> str:
+    name = f"{rng.choice(LAPTOPS)} {rng.randint(100, 999)}"
+    return (
+        '<div class="col-md-4 col-xl-4 col-lg-4"><div class="card thumbnail"><div class="product-wrapper card-body">'
+        f'<img class="img-fluid card-img-top image img-responsive" alt="item" src="/images/test-sites/e-commerce/items/cart2.png">'
+        f'<div class="caption"><h4 class="price float-end card-title pull-right">${rng.randint(200, 2000)}.99</h4>'
+        f'<h4><a href="/test-sites/e-commerce/static/product/{n}" class="title" title="{name}">{name[:15]}...</a></h4>'
+        f'<p class="description card-text">{name}, 15.6&quot;, Core i{rng.choice([3, 5, 7])}, {rng.choice([4, 8, 16])}GB, 256GB SSD, Windows 10 Home</p></div>'
+        f'<div class="ratings"><p class="review-count float-end">{rng.randint(1, 15)} reviews</p>'
+        f'<p data-rating="{rng.randint(1, 5)}"><span class="ws-icon ws-icon-star"></span></p></div>'
+        '</div></div></div>'
+    )
+
+def webscraper_grid(cards: int = 6, seed: int = 0) -> str:
+    """webscraper.io laptops page with `cards` `.thumbnail` cards"""
+    rng = random.Random(seed)
+    grid = "".join(webscraper_card(rng, n) for n in range(cards))
+    return _chrome(f'<div class="container test-site"><div class="row">{grid}</div></div>', rng, links=20)
+
+def books_card(rng: random.Random, n: int) -> str:
+    title = f"The {rng.choice(['Silent', 'Last', 'Hidden', 'Broken', 'Golden'])} {rng.choice(['Garden', 'River', 'Letter', 'Crown'])} Vol. {n}"
+    return (
+        '<li class="col-xs-6 col-sm-4 col-md-3 col-lg-3"><article class="product_pod">'
+        f'<div class="image_container"><a href="../../../book-{n}_{n + 100}/index.html"><img src="../../../../media/cache/{n}.jpg" alt="{title}" class="thumbnail"></a></div>'
+        f'<p class="star-rating {rng.choice(RATINGS)}"><i class="icon-star"></i><i class="icon-star"></i></p>'
+        f'<h3><a href="../../../book-{n}_{n + 100}/index.html" title="{title}">{title[:20]}...</a></h3>'
+        f'<div class="product_price"><p class="price_color">£{rng.uniform(10, 60):.2f}</p>'
+        '<p class="instock availability"><i class="icon-ok"></i>\n        In stock\n    </p>'
+        '<form><button type="submit" class="btn btn-primary btn-block" data-loading-text="Adding...">Add to basket</button></form></div>'
+        '</article></li>'
+    )
+
+def books_page(cards: int = 20, seed: int = 0) -> str:
+    """books.toscrape category page with `cards` `article.product_pod` cards"""
+    rng = random.Random(seed)
+    grid = "".join(books_card(rng, n) for n in range(cards))
+    pager = '<ul class="pager"><li class="current">Page 1 of 50</li><li class="next"><a href="page-2.html">next</a></li></ul>'
+    return _chrome(f'<div class="col-sm-8 col-md-9"><section><ol class="row">{grid}</ol>{pager}</section></div>', rng, links=50)